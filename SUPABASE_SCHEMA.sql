@@ -43,6 +43,23 @@ CREATE TABLE IF NOT EXISTS interviews (
   updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Interview turns and results written by the AI service (TURN_STORE_URL)
+CREATE TABLE IF NOT EXISTS interview_turns (
+  interview_id TEXT NOT NULL,
+  seq INTEGER NOT NULL,
+  role VARCHAR(20) NOT NULL,
+  text TEXT NOT NULL,
+  spoken_at TIMESTAMPTZ NOT NULL,
+  PRIMARY KEY (interview_id, seq)
+);
+
+CREATE TABLE IF NOT EXISTS interview_results (
+  interview_id TEXT PRIMARY KEY,
+  data JSONB NOT NULL,
+  score JSONB NOT NULL,
+  ended_at TIMESTAMPTZ NOT NULL
+);
+
 -- 4. Create indexes for better query performance
 CREATE INDEX idx_admins_email ON admins(email);
 CREATE INDEX idx_questions_category ON questions(category);
@@ -0,0 +1,197 @@
+"""
+Admission control for the interview pipeline
+Each expensive stage (ffmpeg, speech recognition, model, synthesis) admits
+a bounded number of concurrent calls and a bounded queue behind them, and
+callers are rate limited per tenant and per interview with token buckets.
+Work that cannot be admitted in time fails fast with a Retry-After estimate
+instead of piling up until everything times out.
+"""
+
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class Overloaded(Exception):
+    """
+    Raised when work is not admitted
+
+    Args:
+        reason (str): Stage or limiter that refused, for logs and metrics
+        retry_after (float): Seconds after which a retry is likely to succeed
+        status (int): 429 for rate limits, 503 for saturated stages
+    """
+
+    def __init__(self, reason, retry_after, status=503):
+        super().__init__(f"{reason}: retry in {retry_after:.1f}s")
+        self.reason = reason
+        self.retry_after = retry_after
+        self.status = status
+
+
+class StageLimiter:
+    """
+    Bounded concurrency with a bounded, deadline-aware wait queue
+
+    Args:
+        name (str): Stage name
+        limit (int): Calls running at once
+        max_queue (int): Calls allowed to wait; further calls are refused at once
+        queue_timeout (float): Longest wait for a slot
+    """
+
+    def __init__(self, name, limit, max_queue=None, queue_timeout=10):
+        self.name = name
+        self.limit = max(1, limit)
+        self.max_queue = self.limit * 4 if max_queue is None else max_queue
+        self.queue_timeout = queue_timeout
+        self._active = 0
+        self._waiting = 0
+        self._avg_hold = 1.0  # seconds a slot is held, moving average
+        self._cond = threading.Condition()
+        self.rejected = 0
+
+    def _retry_after_locked(self):
+        """Estimated seconds until a newly queued call would get a slot"""
+        return max(1.0, self._avg_hold * (self._waiting + 1) / self.limit)
+
+    def acquire(self, deadline=None, wait=True):
+        """
+        Takes a slot; pair with release(), or use slot() instead
+
+        Args:
+            deadline (float): time.monotonic() by which the caller needs an
+                              answer; waiting stops there at the latest
+            wait (bool): False to return at once instead of queueing
+
+        Returns:
+            float: time.monotonic() when the slot was taken, for release();
+                   None if wait is False and no slot is free
+
+        Raises:
+            Overloaded: If the queue is full or no slot frees up in time
+        """
+        now = time.monotonic()
+        wait_until = now + self.queue_timeout
+        if deadline is not None:
+            wait_until = min(wait_until, deadline)
+        with self._cond:
+            if self._active >= self.limit:
+                if not wait:
+                    return None
+                if self._waiting >= self.max_queue or wait_until <= now:
+                    self.rejected += 1
+                    raise Overloaded(f"{self.name} saturated", self._retry_after_locked())
+                self._waiting += 1
+                try:
+                    while self._active >= self.limit:
+                        remaining = wait_until - time.monotonic()
+                        if remaining <= 0:
+                            self.rejected += 1
+                            raise Overloaded(f"{self.name} queue timeout", self._retry_after_locked())
+                        self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+            self._active += 1
+        return time.monotonic()
+
+    def release(self, started, sample=True):
+        """
+        Returns a slot taken by acquire()
+
+        Args:
+            started (float): Value returned by acquire()
+            sample (bool): False to keep an unusually long hold (e.g. a whole
+                           streamed answer) out of the Retry-After estimate
+        """
+        held = time.monotonic() - started
+        with self._cond:
+            self._active -= 1
+            if sample:
+                self._avg_hold = 0.8 * self._avg_hold + 0.2 * held
+            self._cond.notify()
+
+    @contextmanager
+    def slot(self, deadline=None):
+        """
+        Holds a slot for the duration of the block
+
+        Args:
+            deadline (float): As for acquire()
+
+        Raises:
+            Overloaded: If the queue is full or no slot frees up in time
+        """
+        started = self.acquire(deadline)
+        try:
+            yield
+        finally:
+            self.release(started)
+
+    def stats(self):
+        with self._cond:
+            return {
+                "active": self._active,
+                "waiting": self._waiting,
+                "limit": self.limit,
+                "max_queue": self.max_queue,
+                "avg_hold_seconds": round(self._avg_hold, 3),
+                "rejected": self.rejected,
+            }
+
+
+class RateLimiter:
+    """
+    Token buckets keyed by tenant or interview
+
+    Args:
+        name (str): Limiter name
+        rate (float): Tokens added per second; 0 disables the limiter
+        burst (float): Bucket capacity
+        max_keys (int): Buckets kept; the least recently used are dropped
+    """
+
+    def __init__(self, name, rate, burst, max_keys=10000):
+        self.name = name
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()  # key -> (tokens, last refill)
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    def check(self, key, cost=1.0):
+        """
+        Takes tokens for one call
+
+        Raises:
+            Overloaded: With status 429 if the bucket is empty
+        """
+        if self.rate <= 0 or key is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.pop(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - last) * self.rate)
+            if tokens < cost:
+                self._buckets[key] = (tokens, now)
+                self.rejected += 1
+                retry_after = math.ceil((cost - tokens) / self.rate * 10) / 10
+                raise Overloaded(f"{self.name} rate limit", retry_after, status=429)
+            self._buckets[key] = (tokens - cost, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "rate": self.rate,
+                "burst": self.burst,
+                "keys": len(self._buckets),
+                "rejected": self.rejected,
+            }
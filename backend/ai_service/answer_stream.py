@@ -0,0 +1,433 @@
+"""
+Incremental decoding and transcription of answers uploaded while recorded
+The browser posts MediaRecorder chunks as they are produced. Each upload
+owns one long-lived ffmpeg process decoding the chunks to PCM; whenever the
+candidate pauses, the speech before the pause is sent to the recognizer, so
+only the last phrase is left to transcribe when the answer is finished.
+"""
+
+import logging
+import subprocess
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+import vad
+
+logger = logging.getLogger(__name__)
+
+
+class UploadError(Exception):
+    """Raised for chunks that cannot be accepted (finished upload, dead decoder)"""
+
+
+class AnswerStream:
+    """
+    One answer being uploaded
+
+    Args:
+        interview_id (str): Interview the answer belongs to
+        start_decoder (callable): Returns a started ffmpeg process (stdin, stdout and
+                                  stderr piped) decoding to 16-bit mono PCM, or
+                                  None if no decoder is free
+        sample_rate (int): Sample rate produced by the decoder
+        transcribe (callable): PCM bytes -> (text, status) like transcribe_audio
+        executor (Executor): Runs segment transcriptions
+        min_segment_seconds (float): Shortest audio considered for an early cut
+        min_pause_ms (int): Silence needed before audio is cut into a segment
+        question_id (str): Question being answered, if the client named it
+        max_chunk_bytes (int): Largest chunk accepted
+        stop_decoder (callable): Called once with the decoder process when the
+                                 upload no longer needs it, e.g. DecoderPool.checkin
+    """
+
+    def __init__(self, interview_id, start_decoder, sample_rate, transcribe, executor,
+                 min_segment_seconds=3.0, min_pause_ms=500, question_id=None,
+                 max_chunk_bytes=1024 * 1024, stop_decoder=None):
+        self.upload_id = uuid.uuid4().hex
+        self.interview_id = interview_id
+        self.question_id = question_id
+        self.sample_rate = sample_rate
+        self.transcribe = transcribe
+        self.executor = executor
+        self.min_segment_bytes = int(min_segment_seconds * sample_rate) * 2
+        self.min_pause_ms = min_pause_ms
+        self.max_chunk_bytes = max_chunk_bytes
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+        self.received_bytes = 0
+        self._next_seq = 0
+        self._early = {}  # seq -> chunk that arrived ahead of its predecessors
+        self._pcm = bytearray()
+        self._cut = 0  # bytes of _pcm already handed to the recognizer
+        self._segments = []  # futures of (text, status), in audio order
+        self._finished = False
+        self._lock = threading.Lock()
+        # Held while writing to the decoder. Taken under _lock so chunks are
+        # written in order, but writes happen after _lock is released: the
+        # reader needs _lock to drain stdout, and ffmpeg stops reading stdin
+        # while its stdout pipe is full.
+        self._write_lock = threading.Lock()
+        self._proc = start_decoder()
+        if self._proc is None:
+            raise UploadError("No audio decoder free")
+        self._stop_decoder = stop_decoder
+        self._reader = threading.Thread(target=self._read_pcm, name=f"answer-{self.upload_id[:8]}", daemon=True)
+        self._reader.start()
+
+    def feed(self, data, seq=None):
+        """
+        Passes an encoded chunk to the decoder
+
+        Chunks are written in seq order; a chunk arriving early is held until
+        its predecessors are in, and a repeated seq is ignored.
+
+        Args:
+            data (bytes): Encoded audio as produced by MediaRecorder
+            seq (int): Position of the chunk, or None to append
+
+        Raises:
+            UploadError: If the chunk is too large, the upload is finished or
+                         the decoder has exited
+        """
+        if len(data) > self.max_chunk_bytes:
+            raise UploadError(f"Chunk larger than {self.max_chunk_bytes} bytes")
+        with self._lock:
+            if self._finished:
+                raise UploadError("Upload already finished")
+            if seq is None:
+                seq = self._next_seq
+            if seq < self._next_seq or seq in self._early:
+                return
+            self._early[seq] = data
+            self.received_bytes += len(data)
+            self.updated_at = time.time()
+            ready = []
+            while self._next_seq in self._early:
+                ready.append(self._early.pop(self._next_seq))
+                self._next_seq += 1
+            if not ready:
+                return
+            self._write_lock.acquire()
+        try:
+            for chunk in ready:
+                self._proc.stdin.write(chunk)
+            self._proc.stdin.flush()
+        except (BrokenPipeError, ValueError) as e:
+            raise UploadError(f"Audio decoder exited: {self._decoder_error()}") from e
+        finally:
+            self._write_lock.release()
+
+    def _read_pcm(self):
+        while True:
+            block = self._proc.stdout.read1(65536) if hasattr(self._proc.stdout, "read1") else self._proc.stdout.read(65536)
+            if not block:
+                return
+            with self._lock:
+                self._pcm += block
+                cut = self._cut
+                pending = bytes(self._pcm[cut:]) if len(self._pcm) - cut >= self.min_segment_bytes else None
+            if pending is not None:
+                self._maybe_cut(cut, pending)
+
+    def _maybe_cut(self, cut, pending):
+        """Sends speech up to the last pause to the recognizer. Runs VAD without the lock."""
+        if not vad.available():
+            return
+        offset = vad.find_pause(pending, self.sample_rate, min_pause_ms=self.min_pause_ms)
+        if offset is None or offset < self.min_segment_bytes // 2:
+            return
+        with self._lock:
+            # Only the reader moves _cut before finish(), so this holds unless
+            # the upload was finished meanwhile
+            if self._cut == cut and not self._finished:
+                self._submit_locked(cut + offset)
+
+    def _submit_locked(self, end):
+        segment = bytes(self._pcm[self._cut:end])
+        self._cut = end
+        self._segments.append(self.executor.submit(self.transcribe, segment))
+        logger.info(f"Answer {self.upload_id[:8]}: segment {len(self._segments)} sent, {len(segment) / 2 / self.sample_rate:.1f}s")
+
+    def _decoder_error(self):
+        try:
+            return self._proc.stderr.read().decode(errors="replace").strip() or f"exit code {self._proc.poll()}"
+        except Exception:
+            return "unknown error"
+
+    def finish(self, timeout=15):
+        """
+        Closes the upload and waits for the remaining transcription
+
+        Args:
+            timeout (float): Seconds to wait for decoding and recognition
+
+        Returns:
+            tuple: (text, status) merged over all segments; status is "ok" if
+                   any segment was recognized, else "error" or "no_speech"
+
+        Raises:
+            UploadError: If chunks are missing or the decoder failed
+        """
+        with self._lock:
+            if self._finished:
+                raise UploadError("Upload already finished")
+            self._finished = True
+            missing = sorted(self._early)
+        if missing:
+            self.abort()
+            raise UploadError(f"Chunks missing before seq {missing[0]}")
+
+        with self._write_lock:
+            try:
+                self._proc.stdin.close()
+            except OSError:
+                pass
+        try:
+            self._proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            self.abort()
+            raise UploadError("Audio decoding timed out")
+        self._reader.join(timeout=timeout)
+        self._release_decoder()
+        if self._proc.returncode != 0 and not self._pcm:
+            raise UploadError(f"Audio decoding failed: {self._decoder_error()}")
+
+        with self._lock:
+            if len(self._pcm) > self._cut:
+                self._submit_locked(len(self._pcm))
+            segments = list(self._segments)
+
+        results = [future.result(timeout=timeout) for future in segments]
+        recognized = [text for text, status in results if status == "ok"]
+        if recognized:
+            return " ".join(recognized), "ok"
+        errors = [(text, status) for text, status in results if status == "error"]
+        if errors:
+            return errors[0]
+        return "", "no_speech"
+
+    def alive(self):
+        """True while the decoder is running and the upload is not finished"""
+        return self._proc.poll() is None and not self._finished
+
+    def partial_text(self):
+        """
+        Text of the segments transcribed so far, without waiting
+
+        Returns:
+            str: Recognized text up to the first segment still in progress
+        """
+        with self._lock:
+            segments = list(self._segments)
+        recognized = []
+        for future in segments:
+            if not future.done() or future.cancelled():
+                break
+            try:
+                text, status = future.result()
+            except Exception:
+                continue
+            if status == "ok":
+                recognized.append(text)
+        return " ".join(recognized)
+
+    def _release_decoder(self):
+        with self._lock:
+            stop, self._stop_decoder = self._stop_decoder, None
+        if stop is not None:
+            stop(self._proc)
+
+    def abort(self):
+        """Stops decoding and discards the upload"""
+        with self._lock:
+            self._finished = True
+        if self._proc.poll() is None:
+            self._proc.kill()
+        self._release_decoder()
+        for future in self._segments:
+            future.cancel()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "upload_id": self.upload_id,
+                "received_bytes": self.received_bytes,
+                "decoded_seconds": len(self._pcm) / 2 / self.sample_rate,
+                "segments": len(self._segments),
+            }
+
+
+class AnswerStreamRegistry:
+    """
+    Open uploads by id; uploads idle for longer than idle_ttl are aborted
+
+    An upload can also be prepared ahead for an interview, so its decoder is
+    already running when the candidate starts the next answer. Only
+    interviews that have opened a streamed upload here get one; clients
+    posting whole recordings never use it.
+
+    Args:
+        idle_ttl (float): Seconds without a chunk before an upload is dropped
+        max_open (int): Uploads allowed at once, prepared ones included
+        max_tracked (int): Streaming interviews remembered for prepare()
+    """
+
+    def __init__(self, idle_ttl=120, max_open=500, max_tracked=10000):
+        self.idle_ttl = idle_ttl
+        self.max_open = max_open
+        self.max_tracked = max_tracked
+        self._streams = {}
+        self._prepared = {}  # interview_id -> AnswerStream not yet opened
+        self._streaming = OrderedDict()  # interview ids that opened an upload, oldest first
+        self._opening = 0  # uploads being created outside the lock
+        self._lock = threading.Lock()
+        self._sweeper = None
+        self._stop = threading.Event()
+
+    def _purge_locked(self, now):
+        expired = [k for k, v in self._streams.items() if now - v.updated_at > self.idle_ttl]
+        for upload_id in expired:
+            self._streams.pop(upload_id).abort()
+            logger.info(f"Answer upload {upload_id[:8]} expired")
+        stale = [k for k, v in self._prepared.items() if now - v.updated_at > self.idle_ttl]
+        for interview_id in stale:
+            self._prepared.pop(interview_id).abort()
+        return len(expired) + len(stale)
+
+    def expire(self):
+        """
+        Aborts uploads idle for longer than idle_ttl, freeing their decoders
+
+        Returns:
+            int: Uploads aborted
+        """
+        with self._lock:
+            return self._purge_locked(time.time())
+
+    def start_sweeper(self, interval=30):
+        """Runs expire() every interval seconds on a daemon thread, so
+        abandoned uploads are dropped even when no new ones arrive"""
+        if self._sweeper is not None and self._sweeper.is_alive():
+            return
+
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    self.expire()
+                except Exception as e:
+                    logger.error(f"Answer upload sweep failed: {e}")
+
+        self._sweeper = threading.Thread(target=run, name="answer-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _count_locked(self):
+        return len(self._streams) + len(self._prepared) + self._opening
+
+    def prepare(self, interview_id, factory):
+        """
+        Starts an upload ahead of time for an interview's next answer
+
+        Args:
+            interview_id (str): Interview the next answer belongs to
+            factory (callable): () -> AnswerStream; must not wait for a decoder
+
+        Returns:
+            bool: True if a prepared upload is waiting afterwards
+        """
+        with self._lock:
+            self._purge_locked(time.time())
+            if interview_id in self._prepared:
+                return True
+            if interview_id not in self._streaming:
+                return False
+            # Never let spares take the last slots from real uploads
+            if self._count_locked() >= self.max_open // 2:
+                return False
+            try:
+                self._prepared[interview_id] = factory()
+            except UploadError:
+                return False
+        return True
+
+    def open(self, factory, interview_id=None):
+        """
+        Registers a new upload, using the one prepared for the interview if any
+
+        Args:
+            factory (callable): () -> AnswerStream
+            interview_id (str): Interview whose prepared upload may be used
+
+        Returns:
+            AnswerStream: The new upload
+
+        Raises:
+            UploadError: If max_open uploads are already in progress
+            Overloaded: If the factory found no free decoder slot in time
+        """
+        with self._lock:
+            now = time.time()
+            self._purge_locked(now)
+            if interview_id:
+                self._streaming.pop(interview_id, None)
+                self._streaming[interview_id] = True
+                while len(self._streaming) > self.max_tracked:
+                    self._streaming.popitem(last=False)
+            stream = self._prepared.pop(interview_id, None) if interview_id else None
+            if stream is not None and stream.alive():
+                stream.updated_at = now
+                self._streams[stream.upload_id] = stream
+                return stream
+            if self._count_locked() >= self.max_open:
+                if stream is not None:
+                    stream.abort()
+                raise UploadError(f"Too many open answer uploads ({self.max_open})")
+            self._opening += 1
+        if stream is not None:
+            stream.abort()
+        # The factory may wait for a decoder slot, so it runs without the lock
+        try:
+            stream = factory()
+        finally:
+            with self._lock:
+                self._opening -= 1
+        with self._lock:
+            self._streams[stream.upload_id] = stream
+        return stream
+
+    def discard_prepared(self, interview_id):
+        """Stops the upload prepared for an interview, e.g. when it ends"""
+        with self._lock:
+            stream = self._prepared.pop(interview_id, None)
+            self._streaming.pop(interview_id, None)
+        if stream is not None:
+            stream.abort()
+
+    def get(self, upload_id):
+        with self._lock:
+            return self._streams.get(upload_id)
+
+    def pop(self, upload_id):
+        with self._lock:
+            return self._streams.pop(upload_id, None)
+
+    def abort(self, upload_id):
+        """
+        Drops an upload the client gave up on
+
+        Returns:
+            bool: False if the upload was unknown or had expired
+        """
+        stream = self.pop(upload_id)
+        if stream is None:
+            return False
+        stream.abort()
+        return True
+
+    def stats(self):
+        with self._lock:
+            return {"open": len(self._streams), "prepared": len(self._prepared), "max_open": self.max_open}
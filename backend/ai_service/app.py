@@ -4,19 +4,45 @@ Integrates with Hugging Face AI interviewer model
 Handles speech recognition, text-to-speech, and interview conversations
 """
 
+import atexit
+import contextvars
 import flask
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request, jsonify, Response, stream_with_context, g
 from flask_cors import CORS
-from gradio_client import Client
-from gtts import gTTS
+import requests
 import os
-import datetime
-import speech_recognition as sr
-from pydub import AudioSegment
-import sys
 import logging
+import functools
+import io
 import json
-from pathlib import Path
+import math
+import re
+import tempfile
+import threading
+import time
+import urllib.parse
+import uuid
+from tts_cache import TTSCache, make_cache_key
+from audio_codec import create_speech_encoder, pcm_passthrough
+from stt_backends import GoogleSTTBackend, NoSpeechError, TranscriptionError, create_stt_backend
+from session_store import create_session_store, make_turn
+from turn_writer import BatchingTurnWriter, create_turn_sink, result_record, turn_record
+from client_pool import ModelClientPool, PoolExhausted
+from circuit_breaker import OPEN as CIRCUIT_OPEN, CircuitBreaker, CircuitOpenError, hedged_call
+from resume_cache import ResumeCache
+from text_features import derive_features
+from keyword_index import IndexRefresher, KeywordIndex, SupabaseQuestionSource
+import scoring
+from audio_store import AudioStore
+import vad
+from answer_stream import AnswerStream, AnswerStreamRegistry, UploadError
+import metrics
+from metrics import Counter, Gauge, Histogram
+from tts_jobs import AudioJobQueue, QueueFull
+from admission import Overloaded, RateLimiter, StageLimiter
+from decoder_pool import DecodeError, DecoderPool
+from conversation import TranscriptTracker, question_of, reply_of
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 
 # Configure logging
 logging.basicConfig(
@@ -25,9 +51,14 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Heavy libraries (gradio_client, gTTS, speech_recognition) are imported where
+# they are first used, so importing this module stays fast.
+
 # ==============================================================================
 # FFMPEG CONFIGURATION
 # ==============================================================================
+FFMPEG_BINARY = "ffmpeg"
+
 def setup_ffmpeg():
     """Setup FFmpeg paths for audio processing"""
     try:
@@ -48,8 +79,8 @@ def setup_ffmpeg():
         
         for ffmpeg, ffprobe in windows_paths:
             if os.path.exists(ffmpeg) and os.path.exists(ffprobe):
-                AudioSegment.converter = ffmpeg
-                AudioSegment.ffprobe = ffprobe
+                global FFMPEG_BINARY
+                FFMPEG_BINARY = ffmpeg
                 logger.info(f"✅ FFmpeg paths successfully set: {ffmpeg}")
                 return True
         
@@ -69,137 +100,1179 @@ CORS(app, resources={r"/*": {"origins": "*"}})
 # Setup FFmpeg
 setup_ffmpeg()
 
+# ==============================================================================
+# METRICS
+# ==============================================================================
+STAGE_LATENCY = Histogram(
+    "ai_service_stage_seconds", "Latency of pipeline stages", ["stage"]
+)
+STAGE_ERRORS = Counter(
+    "ai_service_stage_errors_total", "Pipeline stage failures", ["stage"]
+)
+FALLBACKS = Counter(
+    "ai_service_fallbacks_total", "Degraded responses served instead of model output", ["kind"]
+)
+REQUEST_LATENCY = Histogram(
+    "ai_service_request_seconds", "End-to-end request latency", ["endpoint"]
+)
+REQUESTS = Counter(
+    "ai_service_requests_total", "Completed requests", ["endpoint", "status"]
+)
+IN_FLIGHT = Gauge(
+    "ai_service_in_flight_requests", "Requests currently being handled", ["endpoint"]
+)
+TTS_QUEUE_DEPTH = Gauge(
+    "ai_service_tts_queue_depth", "Speech synthesis jobs waiting for a worker"
+)
+ADMISSION_REJECTED = Counter(
+    "ai_service_admission_rejected_total", "Requests refused by admission control", ["reason"]
+)
+
+def timed_stage(stage):
+    """Decorator recording a function's latency, and raised exceptions, under a stage name"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            except Exception:
+                STAGE_ERRORS.inc(stage=stage)
+                raise
+            finally:
+                STAGE_LATENCY.observe(time.perf_counter() - started, stage=stage)
+        return wrapper
+    return decorator
+
+# ==============================================================================
+# ADMISSION CONTROL
+# ==============================================================================
+# Each expensive stage runs a bounded number of calls with a bounded queue
+# behind it; a call that cannot start before its request's deadline is
+# refused with 503 and a Retry-After estimate instead of piling up.
+ADMISSION_QUEUE_TIMEOUT = float(os.environ.get("ADMISSION_QUEUE_TIMEOUT", 10))
+ADMISSION_QUEUE_FACTOR = int(os.environ.get("ADMISSION_QUEUE_FACTOR", 4))
+
+def _stage_limiter(stage, default_limit):
+    limit = int(os.environ.get(f"ADMISSION_{stage.upper()}_LIMIT", default_limit))
+    return StageLimiter(stage, limit, max_queue=limit * ADMISSION_QUEUE_FACTOR, queue_timeout=ADMISSION_QUEUE_TIMEOUT)
+
+# "ffmpeg" is added by the decoder pool, which owns that stage
+stage_limits = {
+    "stt": _stage_limiter("stt", int(os.environ.get("STT_WORKERS", 8))),
+    "model": _stage_limiter("model", int(os.environ.get("HF_POOL_SIZE", 8))),
+    "tts": _stage_limiter("tts", int(os.environ.get("TTS_INLINE_WORKERS", 8))),
+}
+
+# Token buckets: requests per second and burst, per tenant (X-Tenant-ID, else
+# client address) and per interview. A rate of 0 disables a limiter.
+# X-Tenant-ID is only believed from these addresses (the Node backend);
+# anyone else could pick a fresh tenant per request to dodge the limit.
+TRUSTED_PROXY_ADDRS = frozenset(
+    addr.strip() for addr in os.environ.get("TRUSTED_PROXY_ADDRS", "127.0.0.1,::1").split(",") if addr.strip()
+)
+tenant_limiter = RateLimiter(
+    "tenant",
+    rate=float(os.environ.get("TENANT_RATE", 5)),
+    burst=float(os.environ.get("TENANT_BURST", 20)),
+)
+interview_limiter = RateLimiter(
+    "interview",
+    rate=float(os.environ.get("INTERVIEW_RATE", 0.5)),
+    burst=float(os.environ.get("INTERVIEW_BURST", 3)),
+)
+
+# Time a request may spend queued for stages; clients can ask for less
+# with an X-Request-Timeout header (seconds)
+REQUEST_BUDGET_SECONDS = float(os.environ.get("REQUEST_BUDGET_SECONDS", 30))
+
+# Deadline of a stage the async app runs on a worker thread (asgi.run_stage),
+# so a stage that has timed out stops waiting for slots
+stage_deadline = contextvars.ContextVar("stage_deadline", default=None)
+
+def request_deadline():
+    """time.monotonic() deadline of the current request or async stage, or None outside one"""
+    if flask.has_request_context():
+        return g.get("deadline")
+    return stage_deadline.get()
+
+def admit(stage):
+    """Context manager holding a slot of a pipeline stage"""
+    return stage_limits[stage].slot(deadline=request_deadline())
+
+def check_rate_limits(tenant, interview_id=None):
+    """
+    Charges a turn-starting request to its tenant and interview
+    
+    Raises:
+        Overloaded: With status 429 when a bucket is empty
+    """
+    tenant_limiter.check(tenant)
+    if interview_id:
+        interview_limiter.check(interview_id)
+
+# Error responses shared with asgi.py are plain dicts, which Flask and Quart
+# both turn into JSON
+def overloaded_response(e):
+    """429 or 503 with a Retry-After estimate for refused work"""
+    retry_after = max(1, math.ceil(e.retry_after))
+    ADMISSION_REJECTED.inc(reason=e.reason)
+    logger.warning(f"⚠️ Refused: {e}")
+    return {
+        "error": "Too many requests. Please slow down." if e.status == 429
+                 else "The interview service is busy. Please try again shortly.",
+        "reason": e.reason,
+        "retry_after": retry_after
+    }, e.status, {"Retry-After": str(retry_after)}
+
 # ==============================================================================
 # INITIALIZE HUGGING FACE CLIENT
 # ==============================================================================
-client = None
+HF_SPACE = os.environ.get("HF_SPACE", "ahmedatk/ai_interviewer")
+
+def create_hf_client():
+    """
+    Connects a new client to the Hugging Face AI model
+    
+    Connects go through the circuit breaker like predictions, so a space
+    that is down is not dialled again by every request.
+    
+    Raises:
+        CircuitOpenError: If the upstream circuit is open
+    """
+    from gradio_client import Client
+    
+    logger.info("Attempting to connect to Hugging Face AI model...")
+    return hf_breaker.call(Client, HF_SPACE)
+
+def check_hf_client(hf_client):
+    """Raises if the space behind a client no longer answers"""
+    response = requests.get(f"{hf_client.src.rstrip('/')}/config", timeout=5)
+    response.raise_for_status()
+
+model_pool = ModelClientPool(
+    create_hf_client,
+    max_size=int(os.environ.get("HF_POOL_SIZE", 8)),
+    client_ttl=float(os.environ.get("HF_POOL_IDLE_TTL", 600)),
+    health_check=check_hf_client,
+    acquire_timeout=float(os.environ.get("HF_POOL_ACQUIRE_TIMEOUT", 10)),
+)
+
+hf_breaker = CircuitBreaker(
+    "huggingface",
+    failure_rate_threshold=float(os.environ.get("HF_BREAKER_FAILURE_RATE", 0.5)),
+    window_size=int(os.environ.get("HF_BREAKER_WINDOW", 20)),
+    min_calls=int(os.environ.get("HF_BREAKER_MIN_CALLS", 5)),
+    open_seconds=float(os.environ.get("HF_BREAKER_OPEN_SECONDS", 30)),
+)
+
+# Seconds a request waits for a background warm-up still connecting
+HF_CONNECT_WAIT = float(os.environ.get("HF_CONNECT_WAIT", 10))
+
+# Seconds before a slow interview start is hedged on a second client (0 disables)
+HF_HEDGE_AFTER = float(os.environ.get("HF_HEDGE_AFTER", 0))
+hedge_executor = ThreadPoolExecutor(max_workers=int(os.environ.get("HF_POOL_SIZE", 8)), thread_name_prefix="hedge")
+
+# Seconds allowed for uploading a resume to the upstream space
+HF_UPLOAD_TIMEOUT = float(os.environ.get("HF_UPLOAD_TIMEOUT", 30))
+
+# How much of each interview's upstream transcript has been read, so replies
+# are parsed from the appended text only
+transcripts = TranscriptTracker(max_sessions=int(os.environ.get("TRANSCRIPT_TRACKER_SIZE", 10000)))
 
 def initialize_hf_client():
     """Initialize connection to Hugging Face AI model"""
-    global client
+    if model_pool.warm_up(int(os.environ.get("HF_POOL_WARM", 1))):
+        logger.info("✅ Connection to Hugging Face successful!")
+        return True
+    logger.error("❌ Could not initialize Hugging Face client")
+    logger.error("   The application will try to reconnect on first interview request")
+    return False
+
+# ==============================================================================
+# TEXT-TO-SPEECH CACHE
+# ==============================================================================
+TTS_LANG = os.environ.get("TTS_LANG", "en")
+TTS_TLD = os.environ.get("TTS_TLD", "com")
+TTS_CACHE_ENABLED = os.environ.get("TTS_CACHE_ENABLED", "true").lower() == "true"
+
+# gtts, or http to POST {"text", "lang"} to TTS_HTTP_URL and receive MP3 bytes
+TTS_BACKEND = os.environ.get("TTS_BACKEND", "gtts")
+TTS_HTTP_URL = os.environ.get("TTS_HTTP_URL", "http://127.0.0.1:8765/tts")
+
+# Format of the audio served to clients: mp3 (as synthesized), mp3-low, opus
+# (WebM) or ogg-opus. Anything but mp3 is re-encoded once, before caching.
+speech_encoder = create_speech_encoder(
+    FFMPEG_BINARY,
+    os.environ.get("TTS_OUTPUT_FORMAT", "mp3"),
+    bitrate=os.environ.get("TTS_OUTPUT_BITRATE") or None,
+)
+logger.info(f"✅ Speech output format: {speech_encoder.format.name}")
+
+tts_cache = None
+if TTS_CACHE_ENABLED:
     try:
-        logger.info("Attempting to connect to Hugging Face AI model...")
-        # Try to connect with timeout
-        client = Client("ahmedatk/ai_interviewer")
-        
-        # Test the connection with a simple call
-        try:
-            # Check if the space is available
-            logger.info("Testing Hugging Face connection...")
-            logger.info("✅ Connection to Hugging Face successful!")
-            return True
-        except Exception as test_error:
-            logger.warning(f"⚠️ Connection test failed: {test_error}")
-            logger.info("Will retry on first request")
-            return True  # Return True anyway, will retry on actual request
-            
+        tts_cache = TTSCache(
+            os.path.join(app.static_folder, 'audio', 'tts_cache'),
+            max_bytes=int(os.environ.get("TTS_CACHE_MAX_BYTES", 256 * 1024 * 1024)),
+            max_entries=int(os.environ.get("TTS_CACHE_MAX_ENTRIES", 5000)),
+            extension=speech_encoder.extension,
+        )
     except Exception as e:
-        logger.error(f"❌ Could not initialize Hugging Face client")
-        logger.error(f"   Error details: {e}")
-        logger.error("   The application will try to reconnect on first interview request")
-        return False
+        logger.warning(f"⚠️ TTS cache disabled: {e}")
+
+# ==============================================================================
+# GENERATED AUDIO STORE
+# ==============================================================================
+# Uncached speech is owned by its interview and deleted once the interview
+# ends or its TTL passes; the TTS cache directory manages itself
+audio_store = AudioStore(
+    os.path.join(app.static_folder, 'audio'),
+    max_bytes=int(os.environ.get("AUDIO_STORE_MAX_BYTES", 1024 * 1024 * 1024)),
+    ttl=float(os.environ.get("AUDIO_TTL_SECONDS", 15 * 60)),
+    owned_ttl=float(os.environ.get("AUDIO_OWNED_TTL_SECONDS", 4 * 60 * 60)),
+    release_grace=float(os.environ.get("AUDIO_RELEASE_GRACE_SECONDS", 60)),
+    skip_dirs=('tts_cache',),
+)
+AUDIO_SWEEP_INTERVAL = float(os.environ.get("AUDIO_SWEEP_INTERVAL", 60))
+
+# Every audio URL names immutable content, so clients may cache it for good
+AUDIO_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# ==============================================================================
+# SPEECH-TO-TEXT BACKEND
+# ==============================================================================
+STT_BACKEND = os.environ.get("STT_BACKEND", "google")
+
+def _stt_options(name):
+    """Reads constructor options for an STT backend from the environment"""
+    if name == "vosk":
+        return {"model_path": os.environ.get("VOSK_MODEL_PATH", "models/vosk-model-small-en-us-0.15")}
+    if name == "http":
+        return {
+            "url": os.environ.get("STT_HTTP_URL", "http://127.0.0.1:8765/stt"),
+            "audio_format": os.environ.get("STT_HTTP_FORMAT", "wav"),
+        }
+    if name == "google":
+        return {
+            "language": os.environ.get("STT_LANGUAGE", "en-US"),
+            "key": os.environ.get("GOOGLE_SPEECH_KEY") or None,
+        }
+    return {}
+
+try:
+    # Models are loaded by warm_up_stt(), not at import
+    stt_backend = create_stt_backend(STT_BACKEND, warm_up=False, **_stt_options(STT_BACKEND))
+    logger.info(f"✅ Speech-to-text backend: {stt_backend.name}")
+except Exception as e:
+    logger.warning(f"⚠️ Could not create STT backend '{STT_BACKEND}': {e}. Falling back to Google.")
+    FALLBACKS.inc(kind="stt_backend")
+    stt_backend = GoogleSTTBackend(**_stt_options("google"))
+
+def warm_up_stt():
+    """Loads the STT backend's model, falling back to Google if that fails"""
+    global stt_backend
+    try:
+        stt_backend.warm_up()
+    except Exception as e:
+        logger.warning(f"⚠️ Could not load STT backend '{stt_backend.name}': {e}. Falling back to Google.")
+        FALLBACKS.inc(kind="stt_backend")
+        stt_backend = GoogleSTTBackend(**_stt_options("google"))
 
-# Try to initialize on startup
-initialize_hf_client()
+# ==============================================================================
+# RESUME CACHE
+# ==============================================================================
+resume_cache = ResumeCache(
+    os.environ.get("RESUME_CACHE_DIR", os.path.join(tempfile.gettempdir(), "jobsupi_resume_cache")),
+    max_entries=int(os.environ.get("RESUME_CACHE_MAX_ENTRIES", 2000)),
+    max_bytes=int(os.environ.get("RESUME_CACHE_MAX_BYTES", 512 * 1024 * 1024)),
+)
+
+# ==============================================================================
+# EXPECTED KEYWORD INDEX
+# ==============================================================================
+# Expected keywords of all active questions compiled into one automaton, for
+# live feedback while an answer is given. Loaded from Supabase when configured
+# and kept current by polling plus pushes from the Node service.
+keyword_index = KeywordIndex()
+SUPABASE_URL = os.environ.get("SUPABASE_URL")
+SUPABASE_KEY = os.environ.get("SUPABASE_KEY")
+keyword_refresher = None
+if SUPABASE_URL and SUPABASE_KEY:
+    keyword_refresher = IndexRefresher(
+        keyword_index, SupabaseQuestionSource(SUPABASE_URL, SUPABASE_KEY),
+        interval=float(os.environ.get("KEYWORD_INDEX_REFRESH_SECONDS", 60)),
+        full_every=int(os.environ.get("KEYWORD_INDEX_FULL_RELOAD_EVERY", 30)),
+    )
+
+@timed_stage("keyword_match")
+def keyword_feedback(text, question_id):
+    """
+    Expected keywords of a question covered by an answer so far
+    
+    Returns:
+        dict: question_id, matched, missing and coverage; None when the
+              question is unknown or has no keywords
+    """
+    if not question_id:
+        return None
+    result = keyword_index.match(text, question_id)
+    total = len(result["matched"]) + len(result["missing"])
+    if not total:
+        return None
+    return {
+        "question_id": str(question_id),
+        **result,
+        "coverage": round(len(result["matched"]) / total, 3)
+    }
+
+# ==============================================================================
+# INTERVIEW SESSION STORE
+# ==============================================================================
+session_store = create_session_store(os.environ.get("SESSION_STORE_URL", "memory://"))
+
+# ==============================================================================
+# INTERVIEW TURN PERSISTENCE
+# ==============================================================================
+# Turns and final results are kept beyond the session through a batching
+# writer (sqlite:///path or postgresql://...); unset to keep nothing.
+# The writer is created per process in start_worker().
+TURN_STORE_URL = os.environ.get("TURN_STORE_URL", "")
+TURN_WAL_DIR = os.environ.get("TURN_WAL_DIR", os.path.join(tempfile.gettempdir(), "jobsupi_turn_wal"))
+turn_writer = None
+
+def persist(records):
+    """Queues interview records for the database, if persistence is enabled"""
+    if turn_writer is not None:
+        turn_writer.submit(records)
 
 # ==============================================================================
 # HELPER FUNCTIONS
 # ==============================================================================
 
-def text_to_speech(text, filename_prefix="response"):
+def synthesize_speech(text, path):
     """
-    Converts text to MP3 file and returns its URL
+    Writes speech for text using the configured TTS backend and output format
+    
+    Args:
+        text (str): Cleaned text to speak
+        path (str): Destination file
+    """
+    if TTS_BACKEND == "http":
+        response = requests.post(TTS_HTTP_URL, json={"text": text, "lang": TTS_LANG}, timeout=15)
+        response.raise_for_status()
+        mp3 = response.content
+    else:
+        from gtts import gTTS
+        
+        buffer = io.BytesIO()
+        gTTS(text=text, lang=TTS_LANG, tld=TTS_TLD, slow=False).write_to_fp(buffer)
+        mp3 = buffer.getvalue()
+    with open(path, "wb") as f:
+        f.write(speech_encoder.encode(mp3))
+
+def speech_cache_key(cleaned_text):
+    """TTS cache key for text in the current voice and output format"""
+    return make_cache_key(
+        cleaned_text, TTS_LANG, slow=False, tld=TTS_TLD, engine=TTS_BACKEND,
+        audio_format=speech_encoder.format.name
+    )
+
+@timed_stage("text_to_speech")
+def text_to_speech(text, filename_prefix="response", owner=None):
+    """
+    Converts text to speech in the output format and returns its URL
+    
+    Identical text with the same voice settings is served from the TTS cache
+    instead of being synthesized again. Without the cache the file goes to
+    the audio store, tied to the interview that requested it.
     
     Args:
         text (str): Text to convert to speech
-        filename_prefix (str): Prefix for the audio filename
+        filename_prefix (str): Prefix for the audio filename (uncached mode)
+        owner (str): Interview the audio belongs to (uncached mode)
         
     Returns:
         str: URL to the generated audio file
     """
     try:
-        audio_folder = os.path.join(app.static_folder, 'audio')
-        os.makedirs(audio_folder, exist_ok=True)
-        
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-        filename = f"{filename_prefix}_{timestamp}.mp3"
-        filepath = os.path.join(audio_folder, filename)
-        
         # Clean text
         cleaned_text = text.replace('**', '').strip()
         if not cleaned_text:
             cleaned_text = "I did not get a response. Please try again."
         
+        if tts_cache is not None:
+            key = speech_cache_key(cleaned_text)
+            filename = tts_cache.get(key)
+            if filename:
+                logger.info(f"✅ TTS cache hit: {cleaned_text[:50]}...")
+                return f"/static/audio/tts_cache/{filename}"
+            
+            logger.info(f"Generating speech for: {cleaned_text[:50]}...")
+            temp_path = tts_cache.temp_path(key)
+            try:
+                with admit("tts"):
+                    synthesize_speech(cleaned_text, temp_path)
+                filename = tts_cache.put(key, temp_path)
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+            
+            logger.info(f"✅ Audio cached: {filename}")
+            return f"/static/audio/tts_cache/{filename}"
+        
+        filename = audio_store.allocate(filename_prefix, extension=speech_encoder.extension)
+        filepath = audio_store.path(filename)
+        
         # Generate speech
         logger.info(f"Generating speech for: {cleaned_text[:50]}...")
-        tts = gTTS(text=cleaned_text, lang='en', slow=False)
-        tts.save(filepath)
+        try:
+            with admit("tts"):
+                synthesize_speech(cleaned_text, filepath)
+        except Exception:
+            if os.path.exists(filepath):
+                os.remove(filepath)
+            raise
+        audio_store.add(filename, owner=owner)
         
         logger.info(f"✅ Audio saved: {filename}")
-        return f"/static/audio/{filename}?v={timestamp}"
+        return f"/static/audio/{filename}"
+        
+    except Overloaded as e:
+        # Degrade to a text-only reply rather than queueing behind synthesis
+        logger.warning(f"⚠️ Speech skipped: {e}")
+        FALLBACKS.inc(kind="tts_overloaded")
+        return None
         
     except Exception as e:
         logger.error(f"Error generating speech: {e}")
+        STAGE_ERRORS.inc(stage="text_to_speech")
         return None
 
-def transcribe_audio(audio_file_path):
+def cached_speech_url(text):
     """
-    Transcribes audio file to text using Google Speech Recognition
+    Looks up already synthesized audio without generating anything
+    
+    Returns:
+        str: URL of the cached audio, or None
+    """
+    cleaned_text = text.replace('**', '').strip()
+    if tts_cache is None or not cleaned_text:
+        return None
+    filename = tts_cache.get(speech_cache_key(cleaned_text))
+    return f"/static/audio/tts_cache/{filename}" if filename else None
+
+# ==============================================================================
+# BACKGROUND TEXT-TO-SPEECH JOBS
+# ==============================================================================
+tts_jobs = AudioJobQueue(
+    text_to_speech,
+    workers=int(os.environ.get("TTS_WORKERS", 4)),
+    max_backlog=int(os.environ.get("TTS_QUEUE_SIZE", 256)),
+    on_depth_change=TTS_QUEUE_DEPTH.set,
+    start=False,
+)
+
+# Inline synthesis runs here so the rest of a reply is assembled meanwhile
+reply_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("TTS_INLINE_WORKERS", 8)), thread_name_prefix="reply"
+)
+# Longest wait for a reply's audio once the turn is recorded; the reply is
+# then sent without audio_url rather than failing a turn the model has taken
+TTS_REPLY_TIMEOUT = float(os.environ.get("TTS_REPLY_TIMEOUT", 15))
+
+# Jobs live in this process: /api/audio-jobs/<id> must reach the same worker
+AUDIO_JOBS_ENABLED = os.environ.get("AUDIO_JOBS_ENABLED", "true").lower() == "true"
+
+def wants_background_audio():
+    """True if the client asked for audio to be delivered as a job"""
+    return AUDIO_JOBS_ENABLED and request.values.get('async_audio', '').lower() == 'true'
+
+# ==============================================================================
+# STREAMING TEXT-TO-SPEECH
+# ==============================================================================
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
+# Pending segments live in this process: /api/tts-stream/<id> must reach the same worker
+TTS_STREAMING_ENABLED = os.environ.get("TTS_STREAMING_ENABLED", "true").lower() == "true"
+MIN_SEGMENT_CHARS = 40
+STREAM_TTL_SECONDS = 600
+
+# stream_id -> (created_at, filename_prefix, owner, remaining sentences)
+_pending_streams = {}
+_pending_streams_lock = threading.Lock()
+
+def split_sentences(text):
+    """
+    Splits text into speakable segments
+    
+    Very short sentences are merged with the following one so the client
+    does not have to fetch a separate clip for "Great." or "Thanks!".
+    
+    Args:
+        text (str): Text to split
+        
+    Returns:
+        list: Non-empty text segments in order
+    """
+    segments = []
+    current = ""
+    for sentence in SENTENCE_BOUNDARY.split(text.replace('**', '').strip()):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        current = f"{current} {sentence}" if current else sentence
+        if len(current) >= MIN_SEGMENT_CHARS:
+            segments.append(current)
+            current = ""
+    if current:
+        segments.append(current)
+    return segments
+
+def register_audio_stream(segments, filename_prefix, owner=None):
+    """
+    Stores segments still to be synthesized and returns a stream id for them
+    """
+    now = time.time()
+    stream_id = uuid.uuid4().hex
+    with _pending_streams_lock:
+        for expired in [k for k, v in _pending_streams.items() if now - v[0] > STREAM_TTL_SECONDS]:
+            del _pending_streams[expired]
+        _pending_streams[stream_id] = (now, filename_prefix, owner, segments)
+    return stream_id
+
+def audio_segment_events(segments, filename_prefix, start_index=0, owner=None):
+    """
+    Synthesizes segments one by one, yielding a server-sent event per segment
+    """
+    for index, segment in enumerate(segments, start=start_index):
+        audio_url = text_to_speech(segment, f"{filename_prefix}_{index}", owner=owner)
+        payload = {"index": index, "text": segment, "audio_url": audio_url}
+        yield f"event: segment\ndata: {json.dumps(payload)}\n\n"
+    yield f"event: done\ndata: {json.dumps({'count': start_index + len(segments)})}\n\n"
+
+def event_stream_response(events):
+    """Wraps an event generator in an unbuffered text/event-stream response"""
+    return Response(
+        stream_with_context(events),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+def synthesize_reply(text, filename_prefix, owner=None, stream=False, background=False):
+    """
+    Produces the audio fields for an AI reply
+    
+    In streaming mode only the first segment is synthesized before returning;
+    the rest is available from /api/tts-stream/<stream_id>. In background mode
+    nothing is synthesized inline: the reply is queued and its job returned,
+    unless the audio is already cached or the queue is full.
     
     Args:
-        audio_file_path (str): Path to audio file
+        text (str): Reply text
+        filename_prefix (str): Prefix for audio filenames
+        owner (str): Interview the audio belongs to
+        stream (bool): Return the first segment immediately
+        background (bool): Queue synthesis and return a job instead of audio
         
     Returns:
-        str: Transcribed text
+        dict: audio_url, plus audio_stream_url when segments remain, or
+              audio_job_id/audio_job_url for background synthesis
     """
+    if background:
+        cached_url = cached_speech_url(text)
+        if cached_url:
+            return {"audio_url": cached_url}
+        try:
+            job_id = tts_jobs.submit(text, filename_prefix, owner=owner)
+            return {
+                "audio_url": None,
+                "audio_job_id": job_id,
+                "audio_job_url": f"/api/audio-jobs/{job_id}"
+            }
+        except QueueFull as e:
+            logger.warning(f"⚠️ {e}. Synthesizing inline.")
+            FALLBACKS.inc(kind="tts_queue_full")
+    
+    if not stream:
+        return {"audio_url": text_to_speech(text, filename_prefix, owner=owner)}
+    
+    segments = split_sentences(text) or [text]
+    fields = {"audio_url": text_to_speech(segments[0], f"{filename_prefix}_0", owner=owner)}
+    if len(segments) > 1:
+        stream_id = register_audio_stream(segments[1:], filename_prefix, owner=owner)
+        fields["audio_stream_url"] = f"/api/tts-stream/{stream_id}"
+    return fields
+
+def wants_audio_stream():
+    """True if the client asked for streamed audio on this request"""
+    return TTS_STREAMING_ENABLED and request.values.get('stream_audio', '').lower() == 'true'
+
+@timed_stage("transcribe_audio")
+def transcribe_audio(audio_data):
+    """
+    Transcribes audio to text using the configured STT backend
+    
+    Args:
+        audio_data (sr.AudioData): Decoded audio from convert_audio_to_wav
+        
+    Returns:
+        tuple: (text, status) where status is "ok", "no_speech" or "error"
+    """
+    with admit("stt"):
+        return _transcribe(audio_data)
+
+def _transcribe(audio_data):
+    started = time.perf_counter()
     try:
-        recognizer = sr.Recognizer()
-        with sr.AudioFile(audio_file_path) as source:
-            audio_data = recognizer.record(source)
-            text = recognizer.recognize_google(audio_data)
-            logger.info(f"✅ Transcribed: {text[:50]}...")
-            return text
-    except sr.UnknownValueError:
-        logger.warning("Could not understand audio")
-        return "(Could not understand - please speak clearly)"
-    except sr.RequestError as e:
-        logger.error(f"Google Speech Recognition error: {e}")
-        return f"(Error: {e})"
+        text = stt_backend.transcribe(audio_data)
+        logger.info(f"✅ Transcribed ({stt_backend.name}, {time.perf_counter() - started:.2f}s): {text[:50]}...")
+        return text, "ok"
+    except NoSpeechError:
+        logger.warning(f"Could not understand audio ({stt_backend.name})")
+        return "(Could not understand - please speak clearly)", "no_speech"
+    except TranscriptionError as e:
+        logger.error(f"STT backend {stt_backend.name} failed after {time.perf_counter() - started:.2f}s: {e}")
+        STAGE_ERRORS.inc(stage="transcribe_audio")
+        return f"(Error: {e})", "error"
     except Exception as e:
         logger.error(f"Transcription error: {e}")
-        return "(Error during transcription)"
+        STAGE_ERRORS.inc(stage="transcribe_audio")
+        return "(Error during transcription)", "error"
 
-def convert_audio_to_wav(input_file_path):
+# Rate of the PCM handed to VAD and the recognizers; 16 kHz suits all backends
+AUDIO_SAMPLE_RATE = int(os.environ.get("INGEST_SAMPLE_RATE", 16000))
+FFMPEG_TIMEOUT = float(os.environ.get("FFMPEG_TIMEOUT", 15))
+
+def ffmpeg_decode_command():
     """
-    Converts audio file to WAV format
+    Builds the ffmpeg command that decodes stdin to 16-bit mono PCM on stdout
+    
+    Returns:
+        list: Command arguments
+    """
+    return [
+        FFMPEG_BINARY, "-hide_banner", "-loglevel", "error",
+        "-i", "pipe:0",
+        "-f", "s16le", "-acodec", "pcm_s16le",
+        "-ac", "1", "-ar", str(AUDIO_SAMPLE_RATE),
+        "pipe:1",
+    ]
+
+# Long-lived decoders: FFMPEG_WORKERS ffmpeg processes at work at once, with
+# FFMPEG_SPARES started ahead of demand (0 = spawn one per upload). Streamed
+# answers hold theirs while the candidate speaks, mostly idle, hence the
+# headroom over the core count.
+FFMPEG_WORKERS = int(os.environ.get("FFMPEG_WORKERS", 4 * (os.cpu_count() or 2)))
+decoder_pool = DecoderPool(
+    ffmpeg_decode_command(),
+    FFMPEG_WORKERS,
+    spares=int(os.environ.get("FFMPEG_SPARES", 2)),
+    max_queue=FFMPEG_WORKERS * ADMISSION_QUEUE_FACTOR,
+    queue_timeout=ADMISSION_QUEUE_TIMEOUT,
+    timeout=FFMPEG_TIMEOUT,
+)
+stage_limits["ffmpeg"] = decoder_pool.limiter
+
+def make_audio_data(pcm):
+    """Wraps mono 16-bit PCM at AUDIO_SAMPLE_RATE for the STT backends"""
+    import speech_recognition as sr
+    
+    return sr.AudioData(pcm, AUDIO_SAMPLE_RATE, 2)
+
+@timed_stage("convert_audio_to_wav")
+def convert_audio_to_wav(audio_bytes, content_type=None):
+    """
+    Decodes uploaded audio (WebM, WAV, ...) to PCM entirely in memory
+    
+    Uploads that already are mono 16-bit PCM at AUDIO_SAMPLE_RATE (WAV, or
+    audio/L16 with a matching rate) are used as they are. Everything else is
+    piped through a pooled ffmpeg decoder, so no temporary files are created.
     
     Args:
-        input_file_path (str): Path to input audio file
+        audio_bytes (bytes): Encoded audio as uploaded
+        content_type (str): MIME type declared by the client
         
     Returns:
-        str: Path to converted WAV file
+        sr.AudioData: Mono PCM ready for recognition, or None on failure
     """
+    pcm = pcm_passthrough(audio_bytes, content_type, AUDIO_SAMPLE_RATE)
+    if pcm is not None:
+        logger.info(f"✅ Audio already PCM, no transcode: {len(pcm)} bytes")
+        return make_audio_data(pcm)
     try:
-        output_file_path = input_file_path.replace(os.path.splitext(input_file_path)[1], ".wav")
-        audio = AudioSegment.from_file(input_file_path)
-        audio.export(output_file_path, format="wav")
-        logger.info(f"✅ Audio converted to WAV: {output_file_path}")
-        return output_file_path
-    except Exception as e:
+        pcm = decoder_pool.decode(audio_bytes, deadline=request_deadline())
+    except (DecodeError, OSError) as e:
         logger.error(f"Audio conversion error: {e}")
+        STAGE_ERRORS.inc(stage="convert_audio_to_wav")
         return None
+    logger.info(f"✅ Audio decoded in memory: {len(pcm)} bytes PCM")
+    return make_audio_data(pcm)
+
+VAD_ENABLED = os.environ.get("VAD_ENABLED", "true").lower() == "true"
+VAD_THRESHOLD_DB = float(os.environ.get("VAD_THRESHOLD_DB", -45))
+VAD_MAX_PAUSE_MS = int(os.environ.get("VAD_MAX_PAUSE_MS", 600))
+NO_SPEECH_MESSAGE = "No speech detected in the recording. Please try again."
+
+@timed_stage("trim_silence")
+def trim_silence(audio_data):
+    """
+    Cuts leading/trailing silence and long pauses from decoded audio
+    
+    The audio is normalized to 16 kHz mono 16-bit first, which is a no-op
+    for output of convert_audio_to_wav.
+    
+    Args:
+        audio_data (sr.AudioData): Decoded audio
+        
+    Returns:
+        sr.AudioData: Trimmed audio, or None if the clip contains no speech
+    """
+    if not VAD_ENABLED or not vad.available():
+        return audio_data
+    pcm = audio_data.get_raw_data(convert_rate=AUDIO_SAMPLE_RATE, convert_width=2)
+    result = vad.trim_silence(
+        pcm, AUDIO_SAMPLE_RATE,
+        threshold_db=VAD_THRESHOLD_DB, max_pause_ms=VAD_MAX_PAUSE_MS
+    )
+    if not result.has_speech:
+        logger.warning(f"No speech in {result.input_seconds:.1f}s clip")
+        return None
+    logger.info(f"✅ Trimmed audio {result.input_seconds:.1f}s -> {result.speech_seconds:.1f}s")
+    return make_audio_data(result.pcm)
+
+def no_speech_response():
+    """Response for clips rejected before transcription; the session is left untouched"""
+    return {
+        "success": False,
+        "error": NO_SPEECH_MESSAGE,
+        "transcription_status": "no_speech"
+    }
+
+def transcribe_pcm(pcm):
+    """
+    Trims and transcribes one segment of 16 kHz mono PCM
+    
+    Returns:
+        tuple: (text, status) as from transcribe_audio; ("", "no_speech")
+               for segments without speech
+    """
+    audio_data = trim_silence(make_audio_data(pcm))
+    if audio_data is None:
+        return "", "no_speech"
+    return transcribe_audio(audio_data)
+
+# ==============================================================================
+# STREAMED ANSWER UPLOADS
+# ==============================================================================
+stt_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("STT_WORKERS", 8)), thread_name_prefix="stt"
+)
+# Uploads live in this process: chunk and finish calls must reach the same worker
+ANSWER_STREAMS_ENABLED = os.environ.get("ANSWER_STREAMS_ENABLED", "true").lower() == "true"
+answer_streams = AnswerStreamRegistry(
+    idle_ttl=float(os.environ.get("ANSWER_STREAM_IDLE_TTL", 120)),
+    max_open=int(os.environ.get("ANSWER_STREAM_MAX_OPEN", 500)),
+)
+ANSWER_STREAM_SWEEP_INTERVAL = float(os.environ.get("ANSWER_STREAM_SWEEP_INTERVAL", 30))
+
+def _new_answer_stream(interview_id, wait=True):
+    deadline = request_deadline()
+    return AnswerStream(
+        interview_id, lambda: decoder_pool.checkout(deadline, wait=wait), AUDIO_SAMPLE_RATE, transcribe_pcm, stt_executor,
+        min_segment_seconds=float(os.environ.get("ANSWER_SEGMENT_MIN_SECONDS", 3)),
+        min_pause_ms=int(os.environ.get("ANSWER_SEGMENT_PAUSE_MS", 500)),
+        max_chunk_bytes=int(os.environ.get("ANSWER_STREAM_MAX_CHUNK_BYTES", 1024 * 1024)),
+        stop_decoder=decoder_pool.checkin,
+    )
+
+def open_answer_stream(interview_id, question_id=None):
+    """Starts decoding a new streamed answer for an interview, or takes the prepared one"""
+    stream = answer_streams.open(lambda: _new_answer_stream(interview_id), interview_id=interview_id)
+    stream.question_id = question_id
+    return stream
+
+# ==============================================================================
+# NEXT-TURN PREFETCH
+# ==============================================================================
+# While the candidate listens and thinks, get ready for their next answer:
+# health-check the interview's model client and, for clients that stream their
+# answers, start the next answer's decoder
+PREFETCH_NEXT_TURN = os.environ.get("PREFETCH_NEXT_TURN", "true").lower() == "true"
+PREFETCH_ANSWER_STREAM = os.environ.get("PREFETCH_ANSWER_STREAM", "true").lower() == "true"
+prefetch_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("PREFETCH_WORKERS", 2)), thread_name_prefix="prefetch"
+)
+
+@timed_stage("prefetch")
+def _prefetch(interview_id):
+    if not model_pool.check():
+        logger.info("Dropped a broken model client ahead of the next turn")
+    # A prepared decoder holds an ffmpeg slot, so it only takes a free one,
+    # and only while at least half of the slots are free for real work
+    limiter = decoder_pool.limiter
+    if PREFETCH_ANSWER_STREAM and ANSWER_STREAMS_ENABLED and limiter.stats()["active"] < limiter.limit // 2:
+        answer_streams.prepare(interview_id, lambda: _new_answer_stream(interview_id, wait=False))
+
+def prefetch_next_turn(interview_id):
+    """Queues next-turn preparation for an interview; never blocks the reply"""
+    if not PREFETCH_NEXT_TURN or not interview_id:
+        return
+    future = prefetch_executor.submit(_prefetch, interview_id)
+    future.add_done_callback(
+        lambda f: f.exception() and logger.warning(f"⚠️ Next-turn prefetch failed: {f.exception()}")
+    )
+
+def ensure_client():
+    """
+    Makes sure the Hugging Face client is connected, reconnecting if needed
+    
+    Returns:
+        bool: True if a client is available
+    """
+    if model_pool.size():
+        return True
+    if not warmed_up.is_set():
+        # Requests arriving during background warm-up wait for it briefly
+        warmed_up.wait(HF_CONNECT_WAIT)
+        if model_pool.size():
+            return True
+    if hf_breaker.state == CIRCUIT_OPEN:
+        return False
+    logger.info("Reconnecting to Hugging Face...")
+    return initialize_hf_client()
+
+# Asked in turn when the model is unavailable, after the opening question
+FALLBACK_QUESTIONS = [
+    "What is a project you are particularly proud of, and why?",
+    "Describe a difficult technical problem you solved recently.",
+    "How do you handle disagreements within your team?",
+    "Where do you see yourself in the next few years?",
+]
+
+def fallback_reply(session):
+    """
+    Scripted next question for interviews running without the model
+    
+    Args:
+        session (dict): Stored session, or None if it has expired
+    """
+    FALLBACKS.inc(kind="fallback_question")
+    answered = sum(1 for turn in session["turns"] if turn["role"] == "candidate") if session else 0
+    return f"Thank you for your response. {FALLBACK_QUESTIONS[answered % len(FALLBACK_QUESTIONS)]}"
+
+def record_turn(interview_id, conversation_history, user_response_text, new_ai_part):
+    """
+    Stores a completed turn and builds the conversation part of the response
+    
+    Session clients (interview_id) receive only the new turns; legacy clients
+    that sent conversation_history still get the full updated conversation.
+    
+    Args:
+        interview_id (str): Interview session ID, or None
+        conversation_history (str): Conversation sent by a legacy client, or None
+        user_response_text (str): Transcribed candidate response
+        new_ai_part (str): AI's reply
+        
+    Returns:
+        dict: Response fields describing the conversation update
+    """
+    fields = {}
+    if interview_id:
+        turns = [make_turn("candidate", user_response_text), make_turn("ai", new_ai_part)]
+        start = session_store.append_turns(interview_id, turns)
+        if start is not None:
+            persist([turn_record(interview_id, start + i, turn) for i, turn in enumerate(turns)])
+            fields["interview_id"] = interview_id
+            fields["turn_index"] = start
+            fields["turns"] = turns
+    if conversation_history is not None:
+        fields["conversation"] = conversation_history + f"\n\n**You:** {user_response_text}\n\n**AI:** {new_ai_part}"
+    return fields
+
+@timed_stage("client.predict")
+def predict(hf_client, *args, **kwargs):
+    """Calls the model through the circuit breaker, recording latency and failures"""
+    return hf_breaker.call(hf_client.predict, *args, **kwargs)
+
+def upstream_resume(hf_client, resume):
+    """
+    Returns what to pass the upstream as the resume file
+    
+    A resume is uploaded to a space once; the URL of the space's copy is kept
+    with the cached resume, so a repeat start with the same PDF passes the URL
+    and skips the upload. If the upload fails the local path is returned and
+    the Gradio client uploads the file itself.
+    
+    Args:
+        hf_client: Connected Gradio client
+        resume (ResumeEntry): Cached resume
+        
+    Returns:
+        tuple: (file path or URL, True if it is a cached upstream reference)
+    """
+    upstream = getattr(hf_client, "src", HF_SPACE)
+    reference = resume.remote.get(upstream)
+    if reference is not None:
+        return reference, True
+    try:
+        with open(resume.path, "rb") as f:
+            response = requests.post(
+                hf_client.upload_url,
+                headers=hf_client.headers,
+                files=[("files", (f"{resume.file_hash[:16]}.pdf", f, "application/pdf"))],
+                timeout=HF_UPLOAD_TIMEOUT
+            )
+        response.raise_for_status()
+        reference = urllib.parse.urljoin(upstream, f"file={response.json()[0]}")
+    except (requests.RequestException, OSError, ValueError, IndexError, AttributeError) as e:
+        logger.warning(f"⚠️ Resume upload failed, letting the client upload it: {e}")
+        return resume.path, False
+    resume_cache.set_remote(resume, upstream, reference)
+    return reference, False
+
+def _start_on_session(resume, job_description):
+    """
+    Starts an upstream interview on a pooled client
+    
+    Returns:
+        tuple: (opening conversation text, upstream session id)
+        
+    Raises:
+        CircuitOpenError: If the upstream circuit is open
+        Exception: If both endpoints failed
+    """
+    with admit("model"), model_pool.acquire(checked=True) as hf_client:
+        # A fresh upstream session, stored with the interview so any worker can resume it
+        hf_client.session_hash = uuid.uuid4().hex
+        upstream_session = hf_client.session_hash
+        resume_file, cached = upstream_resume(hf_client, resume)
+        try:
+            result = predict(
+                hf_client,
+                resume=resume_file,
+                job_desc=job_description,
+                api_name="/gradio_start_interview"
+            )
+        except (CircuitOpenError, Overloaded):
+            raise
+        except Exception as api_error:
+            logger.error(f"API call failed: {api_error}")
+            if cached:
+                # The space may have dropped its copy; upload again next time
+                resume_cache.set_remote(resume, getattr(hf_client, "src", HF_SPACE), None)
+                resume_file = resume.path
+            # Try alternative API endpoint
+            logger.info("Trying alternative endpoint...")
+            result = predict(
+                hf_client,
+                resume_file,
+                job_description,
+                api_name="/predict"
+            )
+    
+    text = result[0] if isinstance(result, (list, tuple)) else str(result)
+    return text, upstream_session
+
+def start_ai_interview(resume, job_description):
+    """
+    Starts the upstream interview
+    
+    With HF_HEDGE_AFTER set, a start that is still running after that many
+    seconds is raced against a second start on another pooled client, and the
+    interview keeps the upstream session that answered first.
+    
+    Args:
+        resume (ResumeEntry): Cached resume
+        job_description (str): Job description text
+        
+    Returns:
+        tuple: (opening conversation text, upstream session id), or
+               (None, None) if the upstream is unavailable
+    """
+    logger.info("Calling Hugging Face AI model...")
+    try:
+        if HF_HEDGE_AFTER > 0:
+            _, (conversation_text, upstream_session) = hedged_call(
+                hedge_executor,
+                lambda: _start_on_session(resume, job_description),
+                lambda: _start_on_session(resume, job_description),
+                HF_HEDGE_AFTER
+            )
+        else:
+            conversation_text, upstream_session = _start_on_session(resume, job_description)
+    except CircuitOpenError as e:
+        logger.warning(f"⚠️ {e}. Using fallback question.")
+        FALLBACKS.inc(kind="circuit_open")
+        return None, None
+    except (PoolExhausted, Overloaded):
+        raise
+    except Exception as alt_error:
+        logger.error(f"Alternative endpoint also failed: {alt_error}")
+        return None, None
+    
+    return conversation_text, upstream_session
+
+def get_ai_response(user_response_text, interview_id=None):
+    """
+    Sends the candidate's answer to the AI model
+    
+    Args:
+        user_response_text (str): Transcribed candidate response
+        interview_id (str): Interview session ID
+        
+    The answer goes to the interview's upstream session on any free pooled
+    client. Interviews started on the fallback question, and answers arriving
+    while no model client can be connected or the circuit is open, get a
+    scripted next question.
+    
+    Returns:
+        str: The AI's reply, without the transcript's role markers
+        
+    Raises:
+        PoolExhausted: If every model client stays busy
+    """
+    logger.info("Getting AI response...")
+    session = session_store.get(interview_id)
+    upstream_session = session and session["meta"].get("upstream_session")
+    if not upstream_session or not ensure_client():
+        return fallback_reply(session)
+    
+    try:
+        with admit("model"), model_pool.acquire() as hf_client:
+            hf_client.session_hash = upstream_session
+            result = predict(
+                hf_client,
+                response=user_response_text,
+                api_name="/gradio_handle_response"
+            )
+    except CircuitOpenError as e:
+        logger.warning(f"⚠️ {e}. Using fallback question.")
+        FALLBACKS.inc(kind="circuit_open")
+        return fallback_reply(session)
+    
+    ai_full_response = result[0]
+    logger.info(f"AI response received. Length: {len(ai_full_response)}")
+    
+    # Only the text appended since the previous turn is parsed
+    new_ai_part = reply_of(transcripts.advance(interview_id, ai_full_response))
+    if not new_ai_part:
+        new_ai_part = "Thank you for your response."
+        FALLBACKS.inc(kind="empty_ai_response")
+    return new_ai_part
 
 # ==============================================================================
 # API ENDPOINTS
 # ==============================================================================
 
+@app.before_request
+def start_request_metrics():
+    """Marks the request as in flight"""
+    g.metrics_endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+    g.metrics_started = time.perf_counter()
+    IN_FLIGHT.inc(endpoint=g.metrics_endpoint)
+
+# Endpoints that start expensive work are rate limited; chunk uploads and
+# polling are not, they only continue work already admitted
+RATE_LIMITED_ENDPOINTS = {'/api/start-interview', '/api/process-response', '/api/answer-stream', '/api/tts-stream'}
+
+def tenant_of(headers, remote_addr):
+    """
+    Tenant a request is charged to: X-Tenant-ID when sent by a trusted
+    proxy, else the client address
+    """
+    if remote_addr in TRUSTED_PROXY_ADDRS:
+        return headers.get('X-Tenant-ID') or remote_addr
+    return remote_addr
+
+def request_tenant():
+    """Tenant the current request is charged to"""
+    return tenant_of(request.headers, request.remote_addr)
+
+@app.before_request
+def admit_request():
+    """Sets the request deadline and applies rate limits"""
+    budget = REQUEST_BUDGET_SECONDS
+    requested = request.headers.get('X-Request-Timeout', type=float)
+    if requested and requested > 0:
+        budget = min(budget, requested)
+    g.deadline = time.monotonic() + budget
+    
+    if request.url_rule is not None and request.url_rule.rule in RATE_LIMITED_ENDPOINTS:
+        data = request.get_json(silent=True) or request.form
+        check_rate_limits(request_tenant(), data.get('interview_id'))
+
+@app.after_request
+def record_request_metrics(response):
+    """Records latency and status of a finished request"""
+    if 'metrics_started' in g:
+        REQUEST_LATENCY.observe(time.perf_counter() - g.metrics_started, endpoint=g.metrics_endpoint)
+        REQUESTS.inc(endpoint=g.metrics_endpoint, status=response.status_code)
+    return response
+
+@app.after_request
+def cache_audio_files(response):
+    """Lets clients and proxies keep audio files instead of re-fetching them"""
+    if request.path.startswith('/static/audio/') and response.status_code in (200, 206, 304):
+        response.headers['Cache-Control'] = AUDIO_CACHE_CONTROL
+        if request.path.endswith(speech_encoder.extension) and response.status_code != 304:
+            # e.g. .webm would otherwise be served as video/webm
+            response.mimetype = speech_encoder.format.mime_type
+    return response
+
+@app.teardown_request
+def end_request_metrics(error):
+    """Clears the in-flight mark, also for requests that raised"""
+    if 'metrics_started' in g:
+        IN_FLIGHT.dec(endpoint=g.metrics_endpoint)
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Prometheus scrape endpoint"""
+    return Response(metrics.REGISTRY.render(), mimetype=metrics.CONTENT_TYPE)
+
+@app.route('/health/live', methods=['GET'])
+def liveness():
+    """Liveness probe: the process is up and serving requests"""
+    return jsonify({"status": "alive"})
+
+@app.route('/health/ready', methods=['GET'])
+def readiness():
+    """Readiness probe: 503 until warm-up has finished"""
+    ready = is_ready()
+    return jsonify({
+        "ready": ready,
+        "warm_up": warm_up_status,
+        "huggingface": "connected" if model_pool.size() else "disconnected",
+        "circuit_breaker": hf_breaker.state
+    }), 200 if ready else 503
+
 @app.route('/health', methods=['GET'])
 def health():
     """Health check endpoint"""
-    hf_status = "connected" if client else "disconnected"
+    hf_status = "connected" if model_pool.size() else "disconnected"
     return jsonify({
         "status": "healthy",
+        "ready": is_ready(),
+        "warm_up": warm_up_status,
         "huggingface": hf_status,
+        "model_pool": model_pool.stats(),
+        "circuit_breaker": hf_breaker.stats(),
+        "tts_cache": tts_cache.stats() if tts_cache else None,
+        "resume_cache": resume_cache.stats(),
+        "tts_jobs": tts_jobs.stats(),
+        "audio_store": audio_store.stats(),
+        "answer_streams": answer_streams.stats(),
+        "decoder_pool": decoder_pool.stats(),
+        "transcripts": transcripts.stats(),
+        "admission": {
+            "stages": {name: limiter.stats() for name, limiter in stage_limits.items()},
+            "tenant": tenant_limiter.stats(),
+            "interview": interview_limiter.stats(),
+        },
+        "keyword_index": keyword_index.stats(),
+        "turn_writer": turn_writer.stats() if turn_writer else None,
+        "stt_backend": stt_backend.name,
+        "speech_format": speech_encoder.format.name,
         "service": "AI Interview Service"
     })
 
@@ -217,103 +1290,116 @@ def start_interview():
         - resume (file): PDF resume file
         - job_description (str): Job description text
         - interview_id (str): Optional interview session ID for database
+        - stream_audio (str): Optional "true" to stream the question audio
+        - async_audio (str): Optional "true" to synthesize the audio in the background
         
     Returns:
+        - interview_id (str): Session ID to send with each response
         - conversation (str): Initial conversation text
-        - audio_url (str): URL to first question audio
+        - audio_url (str): URL to first question audio (first segment when streaming)
+        - audio_stream_url (str): SSE endpoint for remaining segments, if any
+        - audio_job_id (str): Background synthesis job, when async_audio was sent
         - first_question (str): First question text
     """
-    global client
-    
     logger.info("Starting new interview session...")
     
-    # Check if client is connected
-    if not client:
-        logger.info("Reconnecting to Hugging Face...")
-        if not initialize_hf_client():
-            return jsonify({
-                "error": "Cannot connect to AI service. Please check internet connection."
-            }), 503
-    
     # Validate request
     if 'resume' not in request.files or 'job_description' not in request.form:
         return jsonify({"error": "Missing resume or job description"}), 400
     
     resume_file = request.files['resume']
     job_description = request.form['job_description']
+    interview_id = request.form.get('interview_id') or uuid.uuid4().hex
     
     if not resume_file.filename or not job_description.strip():
         return jsonify({"error": "Resume and job description required"}), 400
     
     try:
-        # Save temporary resume file
-        temp_resume_path = f"temp_resume_{datetime.datetime.now().timestamp()}.pdf"
-        resume_file.save(temp_resume_path)
+        # Stored and parsed once per distinct file; repeats reuse the cached
+        # copy, its features and the space's copy of the file
+        resume = resume_cache.get_or_add(resume_file.read())
+        resume_meta = {"resume_hash": resume.file_hash, "resume_features": resume.features}
         
-        logger.info(f"Resume saved: {temp_resume_path}")
+        # Call Hugging Face API; without a client the fallback question is served
+        if ensure_client():
+            conversation_text, upstream_session = start_ai_interview(resume, job_description)
+        else:
+            conversation_text, upstream_session = None, None
         
-        # Call Hugging Face API
-        logger.info("Calling Hugging Face AI model...")
-        try:
-            result = client.predict(
-                resume=temp_resume_path,
-                job_desc=job_description,
-                api_name="/gradio_start_interview"
+        if conversation_text is None:
+            # Return a fallback response
+            FALLBACKS.inc(kind="fallback_question")
+            fallback_question = f"Hello! I'm your AI interviewer. I've reviewed your resume and I'm excited to discuss the {job_description[:50]}... position with you. Let's start with a classic question: Tell me about yourself and your professional background."
+            audio_future = reply_executor.submit(
+                synthesize_reply, fallback_question, "question_0", interview_id,
+                stream=wants_audio_stream(), background=wants_background_audio()
             )
-        except Exception as api_error:
-            logger.error(f"API call failed: {api_error}")
-            # Try alternative API endpoint
-            try:
-                logger.info("Trying alternative endpoint...")
-                result = client.predict(
-                    temp_resume_path,
-                    job_description,
-                    api_name="/predict"
-                )
-            except Exception as alt_error:
-                logger.error(f"Alternative endpoint also failed: {alt_error}")
-                os.remove(temp_resume_path)
-                
-                # Return a fallback response
-                fallback_question = f"Hello! I'm your AI interviewer. I've reviewed your resume and I'm excited to discuss the {job_description[:50]}... position with you. Let's start with a classic question: Tell me about yourself and your professional background."
-                audio_url = text_to_speech(fallback_question, "question_0")
-                
-                return jsonify({
-                    "success": True,
-                    "conversation": f"AI Interviewer: {fallback_question}",
-                    "audio_url": audio_url,
-                    "first_question": fallback_question,
-                    "fallback": True
-                })
-        
-        conversation_text = result[0] if isinstance(result, (list, tuple)) else str(result)
+            opening_turn = make_turn("ai", fallback_question)
+            session_store.create(
+                interview_id,
+                turns=[opening_turn],
+                meta={"job_description": job_description, "fallback": True, **resume_meta}
+            )
+            persist([turn_record(interview_id, 0, opening_turn)])
+            prefetch_next_turn(interview_id)
+            
+            return jsonify({
+                "success": True,
+                "interview_id": interview_id,
+                "conversation": f"AI Interviewer: {fallback_question}",
+                **audio_future.result(),
+                "first_question": fallback_question,
+                "fallback": True
+            })
+        
         logger.info(f"AI response received. Length: {len(conversation_text)}")
         
         # Extract first question
-        lines = conversation_text.strip().split('\n')
-        first_question = lines[-1] if lines else "Tell me about yourself."
+        opening = reply_of(transcripts.start(interview_id, conversation_text))
+        first_question = question_of(opening) or "Tell me about yourself."
         
-        # Generate speech for first question
-        audio_url = text_to_speech(first_question, "question_0")
+        # Start speech for the first question; the session is stored meanwhile
+        audio_future = reply_executor.submit(
+            synthesize_reply, first_question, "question_0", interview_id,
+            stream=wants_audio_stream(), background=wants_background_audio()
+        )
         
-        # Cleanup
-        os.remove(temp_resume_path)
+        opening_turn = make_turn("ai", first_question)
+        session_store.create(
+            interview_id,
+            turns=[opening_turn],
+            meta={
+                "job_description": job_description,
+                "opening": conversation_text,
+                "upstream_session": upstream_session,
+                **resume_meta
+            }
+        )
+        persist([turn_record(interview_id, 0, opening_turn)])
+        prefetch_next_turn(interview_id)
         
         return jsonify({
             "success": True,
+            "interview_id": interview_id,
             "conversation": conversation_text,
-            "audio_url": audio_url,
+            **audio_future.result(),
             "first_question": first_question
         })
         
+    except PoolExhausted as e:
+        logger.warning(f"⚠️ {e}")
+        return jsonify({
+            "error": "AI interviewer is at capacity. Please try again shortly."
+        }), 503
+        
+    except Overloaded as e:
+        return overloaded_response(e)
+        
     except Exception as e:
         logger.error(f"Error starting interview: {e}")
         return jsonify({
             "error": f"Failed to start interview: {str(e)}"
         }), 500
-    finally:
-        if os.path.exists(temp_resume_path):
-            os.remove(temp_resume_path)
 
 @app.route('/api/process-response', methods=['POST'])
 def process_response():
@@ -322,122 +1408,531 @@ def process_response():
     
     Expected request data:
         - audio (file): WAV or WebM audio file of user's response
-        - conversation_history (str): Full conversation so far
+        - interview_id (str): Session ID from start-interview; required
+        - conversation_history (str): Optional conversation so far, for clients
+          that keep the transcript themselves
+        - question_id (str): Optional question being answered, for keyword feedback
+        - stream_audio (str): Optional "true" to stream the response audio
+        - async_audio (str): Optional "true" to synthesize the audio in the background
         
     Returns:
         - success (bool): Whether processing was successful
         - transcription (str): Transcribed user response
+        - transcription_status (str): "ok", "no_speech" or "error"
+        - stt_backend (str): Name of the speech-to-text backend used
         - ai_response (str): AI's next response
-        - audio_url (str): URL to AI's response audio
-        - conversation (str): Updated conversation
+        - question (str): The question the response ends with
+        - audio_url (str): URL to AI's response audio (first segment when streaming)
+        - audio_stream_url (str): SSE endpoint for remaining segments, if any
+        - audio_job_id (str): Background synthesis job, when async_audio was sent
+        - turns (list): The two new turns, when interview_id was sent
+        - turn_index (int): Position of the first new turn in the session
+        - conversation (str): Updated conversation, when conversation_history was sent
+        - keyword_feedback (dict): matched and missing expected keywords, when
+          question_id names an indexed question
+        
+        A clip without speech is rejected before transcription with
+        success=false, transcription_status="no_speech" and an error message.
     """
-    global client
-    
     logger.info("Processing user response...")
     
-    # Check if client is connected
-    if not client:
-        logger.info("Reconnecting to Hugging Face...")
-        if not initialize_hf_client():
-            return jsonify({
-                "error": "Cannot connect to AI service"
-            }), 503
-    
     # Validate request
-    if 'audio' not in request.files or 'conversation_history' not in request.form:
-        return jsonify({"error": "Missing audio or conversation history"}), 400
+    interview_id = request.form.get('interview_id')
+    conversation_history = request.form.get('conversation_history')
+    if 'audio' not in request.files:
+        return jsonify({"error": "Missing audio"}), 400
+    if not interview_id:
+        return jsonify({"error": "Missing interview_id; start the interview with /api/start-interview first"}), 400
+    if session_store.get(interview_id) is None:
+        return jsonify({"error": "Unknown or expired interview session"}), 404
     
     audio_file = request.files['audio']
-    conversation_history = request.form['conversation_history']
-    
-    temp_audio_path = None
-    wav_audio_path = None
     
     try:
-        # Save temporary audio file
-        timestamp = datetime.datetime.now().timestamp()
-        temp_audio_path = f"temp_audio_{timestamp}.webm"
-        audio_file.save(temp_audio_path)
-        
-        logger.info(f"Audio file saved: {temp_audio_path}")
-        
-        # Convert to WAV for speech recognition
-        wav_audio_path = convert_audio_to_wav(temp_audio_path)
+        # Decode the upload straight from memory
+        audio_data = convert_audio_to_wav(audio_file.read(), audio_file.content_type)
         
-        if not wav_audio_path:
+        if audio_data is None:
             return jsonify({
                 "error": "Could not process audio file. Check FFmpeg installation."
             }), 500
         
-        # Transcribe audio
-        user_response_text = transcribe_audio(wav_audio_path)
-        logger.info(f"User said: {user_response_text}")
-        
-        # Get AI response
-        logger.info("Getting AI response...")
-        result = client.predict(
-            response=user_response_text,
-            api_name="/gradio_handle_response"
-        )
+        # Drop silence; empty clips never reach STT or the model
+        audio_data = trim_silence(audio_data)
+        if audio_data is None:
+            return no_speech_response()
         
-        ai_full_response = result[0]
-        logger.info(f"AI response received. Length: {len(ai_full_response)}")
+        # Transcribe audio
+        user_response_text, transcription_status = transcribe_audio(audio_data)
         
-        # Extract new AI response (after user's response)
-        new_ai_part = ai_full_response.split(user_response_text, 1)[-1].strip()
-        if not new_ai_part:
-            new_ai_part = "Thank you for your response."
+        return jsonify(answer_turn(
+            interview_id, conversation_history, user_response_text, transcription_status,
+            request.form.get('question_id')
+        ))
         
-        # Generate speech for new response
-        audio_url = text_to_speech(new_ai_part, "question")
+    except PoolExhausted as e:
+        return model_unavailable_response(e)
         
-        # Update conversation
-        updated_conversation = conversation_history + f"\n\n**You:** {user_response_text}\n\n**AI:** {new_ai_part}"
+    except Overloaded as e:
+        return overloaded_response(e)
         
+    except Exception as e:
+        logger.error(f"Error processing response: {e}")
         return jsonify({
-            "success": True,
-            "transcription": user_response_text,
-            "ai_response": new_ai_part,
-            "audio_url": audio_url,
-            "conversation": updated_conversation
-        })
+            "error": f"Failed to process response: {str(e)}"
+        }), 500
+
+def answer_turn(interview_id, conversation_history, user_response_text, transcription_status,
+                question_id=None, stream=None, background=None):
+    """
+    Gets the next question for a transcribed answer and records the turn
+    
+    Args:
+        stream, background (bool): Audio delivery as in synthesize_reply; None
+                                   reads the current Flask request
+    
+    Returns:
+        dict: Response payload shared by process-response, streamed answers
+              and the async app
+    """
+    logger.info(f"User said: {user_response_text}")
+    
+    # Get AI response
+    new_ai_part = get_ai_response(user_response_text, interview_id)
+    
+    # Start speech for the reply; the turn is recorded meanwhile
+    audio_future = reply_executor.submit(
+        synthesize_reply, new_ai_part, "question", interview_id,
+        stream=wants_audio_stream() if stream is None else stream,
+        background=wants_background_audio() if background is None else background
+    )
+    
+    # Update conversation
+    conversation_fields = record_turn(interview_id, conversation_history, user_response_text, new_ai_part)
+    
+    feedback = keyword_feedback(user_response_text, question_id)
+    if feedback is not None:
+        conversation_fields["keyword_feedback"] = feedback
+    
+    payload = {
+        "success": True,
+        "transcription": user_response_text,
+        "transcription_status": transcription_status,
+        "stt_backend": stt_backend.name,
+        "ai_response": new_ai_part,
+        "question": question_of(new_ai_part),
+        **conversation_fields
+    }
+    prefetch_next_turn(interview_id)
+    try:
+        payload.update(audio_future.result(timeout=TTS_REPLY_TIMEOUT))
+    except FutureTimeoutError:
+        logger.warning(f"⚠️ Reply audio not ready after {TTS_REPLY_TIMEOUT:g}s, sending text only")
+        FALLBACKS.inc(kind="tts_timeout")
+        payload["audio_url"] = None
+    return payload
+
+def model_unavailable_response(e):
+    """503 for a saturated client pool"""
+    logger.warning(f"⚠️ {e}")
+    return {
+        "error": "AI interviewer is busy. Please try again shortly."
+    }, 503
+
+@app.route('/api/answer-stream', methods=['POST'])
+def start_answer_stream():
+    """
+    Opens a streamed answer upload
+    
+    The client then posts recorder chunks to /api/answer-stream/<upload_id>/chunk
+    while the candidate speaks, and /api/answer-stream/<upload_id>/finish when
+    done. Audio is decoded and transcribed at every pause in the meantime.
+    
+    Expected request data:
+        - interview_id (str): Session ID from start-interview
+        - question_id (str): Optional question being answered; chunk replies
+          then carry keyword feedback on the text transcribed so far
+        
+    Returns:
+        - success (bool)
+        - upload_id (str): ID for the chunk and finish calls
+        
+        With ANSWER_STREAMS_ENABLED off this returns 404 and clients send the
+        whole recording to /api/process-response instead.
+    """
+    if not ANSWER_STREAMS_ENABLED:
+        return jsonify({"error": "Streamed answer uploads are disabled"}), 404
+    data = request.get_json(silent=True) or request.form
+    interview_id = data.get('interview_id')
+    if not interview_id:
+        return jsonify({"error": "Missing interview_id"}), 400
+    if session_store.get(interview_id) is None:
+        return jsonify({"error": "Unknown or expired interview session"}), 404
+    
+    try:
+        stream = open_answer_stream(interview_id, data.get('question_id'))
+    except UploadError as e:
+        logger.warning(f"⚠️ {e}")
+        return jsonify({"error": "Too many answers in progress. Please try again shortly."}), 503
+    return jsonify({"success": True, "upload_id": stream.upload_id})
+
+@app.route('/api/answer-stream/<upload_id>/chunk', methods=['POST'])
+def answer_stream_chunk(upload_id):
+    """
+    Appends a recorder chunk to a streamed answer
+    
+    Expected request data:
+        - chunk (file): Encoded audio chunk, or the raw request body
+        - seq (int): Optional chunk position starting at 0; repeats are ignored
+        
+    Returns:
+        - success (bool)
+        - received_bytes, decoded_seconds, segments: Progress so far
+        - keyword_feedback (dict): Keywords covered so far, when the upload
+          was opened with a question_id
+    """
+    stream = answer_streams.get(upload_id)
+    if stream is None:
+        return jsonify({"error": "Unknown or expired answer upload"}), 404
+    
+    chunk = request.files.get('chunk')
+    data = chunk.read() if chunk else request.get_data()
+    if len(data) > stream.max_chunk_bytes:
+        return jsonify({"error": f"Chunk larger than {stream.max_chunk_bytes} bytes"}), 413
+    try:
+        stream.feed(data, seq=request.values.get('seq', type=int))
+    except UploadError as e:
+        answer_streams.pop(upload_id)
+        stream.abort()
+        logger.error(f"Answer upload {upload_id[:8]} failed: {e}")
+        return jsonify({"error": f"Could not process audio: {e}"}), 422
+    
+    progress = stream.stats()
+    feedback = keyword_feedback(stream.partial_text(), stream.question_id)
+    if feedback is not None:
+        progress["keyword_feedback"] = feedback
+    return jsonify({"success": True, **progress})
+
+@app.route('/api/answer-stream/<upload_id>/finish', methods=['POST'])
+def finish_answer_stream(upload_id):
+    """
+    Completes a streamed answer and returns the next question
+    
+    Expected request data:
+        - stream_audio (str): Optional "true" to stream the response audio
+        - async_audio (str): Optional "true" to synthesize the audio in the background
+        
+    Returns:
+        Same fields as /api/process-response
+    """
+    stream = answer_streams.pop(upload_id)
+    if stream is None:
+        return jsonify({"error": "Unknown or expired answer upload"}), 404
+    
+    try:
+        user_response_text, transcription_status = stream.finish(timeout=FFMPEG_TIMEOUT)
+        if transcription_status == "no_speech":
+            return no_speech_response()
+        return jsonify(answer_turn(stream.interview_id, None, user_response_text, transcription_status, stream.question_id))
+        
+    except UploadError as e:
+        logger.error(f"Answer upload {upload_id[:8]} failed: {e}")
+        return jsonify({"error": f"Could not process audio: {e}"}), 422
+        
+    except PoolExhausted as e:
+        return model_unavailable_response(e)
+        
+    except Overloaded as e:
+        return overloaded_response(e)
         
     except Exception as e:
-        logger.error(f"Error processing response: {e}")
+        logger.error(f"Error processing streamed answer: {e}")
         return jsonify({
             "error": f"Failed to process response: {str(e)}"
         }), 500
+
+@app.route('/api/answer-stream/<upload_id>', methods=['DELETE'])
+def abort_answer_stream(upload_id):
+    """
+    Aborts a streamed answer, e.g. when the client falls back to sending the
+    whole recording to /api/process-response
+    """
+    if not answer_streams.abort(upload_id):
+        return jsonify({"error": "Unknown or expired answer upload"}), 404
+    return jsonify({"success": True})
+
+TTS_STREAM_MAX_CHARS = int(os.environ.get("TTS_STREAM_MAX_CHARS", 2000))
+
+@app.route('/api/tts-stream', methods=['POST'])
+def tts_stream():
+    """
+    Streams speech for arbitrary text as server-sent events
+    
+    Expected request data:
+        - text (str): Text to speak (JSON body or form field), at most
+          TTS_STREAM_MAX_CHARS characters
         
-    finally:
-        # Cleanup temporary files
-        for path in [temp_audio_path, wav_audio_path]:
-            if path and os.path.exists(path):
-                try:
-                    os.remove(path)
-                except:
-                    pass
+    Returns:
+        - text/event-stream of "segment" events ({index, text, audio_url})
+          followed by a "done" event
+    """
+    data = request.get_json(silent=True) or request.form
+    text = (data.get('text') or '').strip()
+    if not text:
+        return jsonify({"error": "Missing text"}), 400
+    if len(text) > TTS_STREAM_MAX_CHARS:
+        return jsonify({"error": f"Text longer than {TTS_STREAM_MAX_CHARS} characters"}), 400
+    
+    segments = split_sentences(text) or [text]
+    return event_stream_response(audio_segment_events(segments, "segment"))
+
+@app.route('/api/tts-stream/<stream_id>', methods=['GET'])
+def tts_stream_remaining(stream_id):
+    """
+    Streams the remaining segments of a reply started with stream_audio=true
+    
+    Segment indexes continue from 1, the first segment having been returned
+    as audio_url by the originating request.
+    """
+    with _pending_streams_lock:
+        pending = _pending_streams.pop(stream_id, None)
+    if not pending:
+        return jsonify({"error": "Unknown or expired audio stream"}), 404
+    
+    _, filename_prefix, owner, segments = pending
+    return event_stream_response(audio_segment_events(segments, filename_prefix, start_index=1, owner=owner))
+
+@app.route('/api/audio-jobs/<job_id>', methods=['GET'])
+def get_audio_job(job_id):
+    """
+    Returns the state of a background synthesis job
+    
+    Query parameters:
+        - wait (float): Optional seconds to wait for completion (long polling, max 30)
+        
+    Returns:
+        - job_id, status ("queued", "running", "done", "failed"), audio_url, error
+    """
+    wait = min(max(request.args.get('wait', default=0, type=float), 0), 30)
+    job = tts_jobs.get(job_id, wait=wait)
+    if job is None:
+        return jsonify({"error": "Unknown or expired audio job"}), 404
+    return jsonify({"success": True, **job})
+
+@app.route('/api/audio-jobs/<job_id>/events', methods=['GET'])
+def audio_job_events(job_id):
+    """
+    Pushes the result of a background synthesis job as a server-sent event
+    
+    Emits a single "done" or "failed" event carrying the job state.
+    """
+    if tts_jobs.get(job_id) is None:
+        return jsonify({"error": "Unknown or expired audio job"}), 404
+    
+    def events():
+        job = tts_jobs.get(job_id)
+        while job is not None and job["status"] not in ("done", "failed"):
+            # Comment lines keep proxies from closing an idle stream
+            yield ": waiting\n\n"
+            job = tts_jobs.get(job_id, wait=15)
+        if job is None:
+            yield f"event: failed\ndata: {json.dumps({'job_id': job_id, 'error': 'expired'})}\n\n"
+            return
+        yield f"event: {job['status']}\ndata: {json.dumps(job)}\n\n"
+    
+    return event_stream_response(events())
+
+@app.route('/api/session/<interview_id>', methods=['GET'])
+def get_session(interview_id):
+    """
+    Returns the stored turns of an interview, e.g. after a client reconnect
+    
+    Query parameters:
+        - since (int): Optional index of the first turn to return
+    """
+    session = session_store.get(interview_id)
+    if session is None:
+        return jsonify({"error": "Unknown or expired interview session"}), 404
+    
+    since = request.args.get('since', default=0, type=int)
+    return jsonify({
+        "success": True,
+        "interview_id": interview_id,
+        "turn_index": since,
+        "turns": session["turns"][since:],
+        "total_turns": len(session["turns"])
+    })
+
+# Job description terms used as keywords when none are given
+JD_KEYWORDS = int(os.environ.get("SCORING_JD_KEYWORDS", 8))
+SCORING_MAX_BATCH = int(os.environ.get("SCORING_MAX_BATCH", 10000))
+
+@timed_stage("scoring")
+def score_session(session, interview_data, expected_keywords, rubric):
+    """
+    Scores a finished interview from its session turns or submitted answers
+    
+    Returns:
+        dict: Result of scoring.score_interview
+    """
+    if session is not None:
+        answers = scoring.session_answers(session["turns"])
+        job_description = session["meta"].get("job_description", "")
+    else:
+        answers = interview_data.get('answers') or []
+        job_description = interview_data.get('job_description', "")
+    
+    if expected_keywords is None:
+        expected_keywords = derive_features(job_description)["top_terms"][:JD_KEYWORDS]
+    return scoring.score_interview(answers, rubric=rubric, default_keywords=tuple(expected_keywords))
+
+@app.route('/api/score-interviews', methods=['POST'])
+def score_interviews():
+    """
+    Scores many completed interviews in one call, e.g. after a rubric change
+    
+    Expected request data (JSON):
+        - interviews (list): {id, answers: [{answer, duration, question_index or question_id}]}
+        - questions (list): {id, expected_keywords}; answers refer to them by
+          question_id or by position (question_index). Defaults to the
+          questions in the keyword index.
+        - rubric (dict): Optional overrides of scoring.Rubric fields
+        
+    Returns:
+        - success (bool)
+        - results (list): {id, score, strengths, weaknesses, missing_keywords, answers}
+        - rubric (dict): The rubric applied
+    """
+    data = request.get_json(silent=True) or {}
+    interviews = data.get('interviews')
+    if not isinstance(interviews, list):
+        return jsonify({"error": "Missing interviews"}), 400
+    if len(interviews) > SCORING_MAX_BATCH:
+        return jsonify({"error": f"At most {SCORING_MAX_BATCH} interviews per batch"}), 413
+    
+    questions = data.get('questions')
+    try:
+        scoring.validate_batch(interviews, questions)
+    except ValueError as e:
+        return jsonify({"error": f"Invalid batch: {e}"}), 400
+    
+    try:
+        rubric = scoring.Rubric(**(data.get('rubric') or {}))
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": f"Invalid rubric: {e}"}), 400
+    
+    started = time.perf_counter()
+    if questions is None:
+        questions = keyword_index.questions()
+    results = scoring.score_interviews(interviews, questions, rubric)
+    STAGE_LATENCY.observe(time.perf_counter() - started, stage="scoring_batch")
+    logger.info(f"Scored {len(results)} interviews in {time.perf_counter() - started:.3f}s")
+    
+    return jsonify({
+        "success": True,
+        "count": len(results),
+        "results": results,
+        "rubric": rubric.to_dict()
+    })
+
+@app.route('/api/questions/index', methods=['POST'])
+def update_keyword_index():
+    """
+    Applies question changes to the keyword index without waiting for a poll
+    
+    Expected request data (JSON):
+        - upsert (list): {id, expected_keywords, is_active}; inactive questions are removed
+        - delete (list): Question ids to remove
+        
+    Returns:
+        - success (bool)
+        - keyword_index (dict): Index size and version after the change
+    """
+    data = request.get_json(silent=True) or {}
+    upserts = data.get('upsert') or []
+    deletes = data.get('delete') or []
+    if not isinstance(upserts, list) or not isinstance(deletes, list):
+        return jsonify({"error": "upsert and delete must be lists"}), 400
+    if any(not isinstance(q, dict) or q.get('id') is None for q in upserts):
+        return jsonify({"error": "Every upserted question needs an id"}), 400
+    
+    keyword_index.update(upserts, deletes)
+    logger.info(f"Keyword index updated: {len(upserts)} upserted, {len(deletes)} deleted")
+    return jsonify({"success": True, "keyword_index": keyword_index.stats()})
+
+@app.route('/api/keywords/match', methods=['POST'])
+def match_keywords():
+    """
+    Finds expected keywords in a piece of text, e.g. a live transcript
+    
+    Expected request data (JSON):
+        - text (str): Answer so far
+        - question_id (str): Optional; limits the result to one question
+        
+    Returns:
+        - success (bool)
+        - keyword_feedback (dict): With question_id, its matched and missing keywords
+        - matches (dict): Without question_id, question id -> keywords found
+    """
+    data = request.get_json(silent=True) or {}
+    text = data.get('text') or ""
+    question_id = data.get('question_id')
+    if question_id:
+        return jsonify({"success": True, "keyword_feedback": keyword_feedback(text, question_id)})
+    return jsonify({"success": True, "matches": keyword_index.match(text)})
 
 @app.route('/api/end-interview', methods=['POST'])
 def end_interview():
     """
-    Ends interview session and returns summary
+    Ends interview session and returns its score
+    
+    Answers come from the stored session, or from interview_data.answers
+    when the session is unknown. Without expected_keywords, answers are
+    checked against the main terms of the job description.
     
     Expected request data:
+        - interview_id (str): Session ID from start-interview
         - interview_data (dict): Full interview data
+        - expected_keywords (list): Optional keywords every answer should cover
+        - rubric (dict): Optional overrides of scoring.Rubric fields
         
     Returns:
         - success (bool)
-        - summary (str): Interview summary
+        - score (dict): score, strengths, weaknesses, missing_keywords, answers
     """
     try:
-        data = request.json
+        data = request.json or {}
         logger.info(f"Interview ended. Session data received.")
         
-        # You can save to database here if needed
+        interview_data = data.get('interview_data') or {}
+        if not isinstance(interview_data, dict):
+            return jsonify({"error": "interview_data must be an object"}), 400
+        try:
+            scoring.validate_answers(interview_data.get('answers'), "interview_data.answers")
+            scoring.validate_keywords(data.get('expected_keywords'), "expected_keywords")
+        except ValueError as e:
+            return jsonify({"error": f"Invalid interview data: {e}"}), 400
+        interview_id = data.get('interview_id') or interview_data.get('id')
+        session = session_store.get(interview_id) if interview_id else None
+        
+        try:
+            rubric = scoring.Rubric(**(data.get('rubric') or {}))
+        except (TypeError, ValueError) as e:
+            return jsonify({"error": f"Invalid rubric: {e}"}), 400
+        score = score_session(session, interview_data, data.get('expected_keywords'), rubric)
+        
+        if interview_id:
+            # Turns were persisted as they happened; this adds the outcome
+            persist([result_record(interview_id, interview_data, score)])
+            session_store.delete(interview_id)
+            transcripts.forget(interview_id)
+            audio_store.release(interview_id)
+            answer_streams.discard_prepared(interview_id)
         
         return jsonify({
             "success": True,
-            "message": "Interview session saved successfully"
+            "message": "Interview session saved successfully",
+            "score": score
         })
         
     except Exception as e:
@@ -455,6 +1950,11 @@ def not_found(error):
     """Handle 404 errors"""
     return jsonify({"error": "Endpoint not found"}), 404
 
+@app.errorhandler(Overloaded)
+def overloaded(error):
+    """Handle work refused by admission control"""
+    return overloaded_response(error)
+
 @app.errorhandler(500)
 def internal_error(error):
     """Handle 500 errors"""
@@ -465,12 +1965,98 @@ def internal_error(error):
 # MAIN
 # ==============================================================================
 
+# ==============================================================================
+# PROCESS STARTUP
+# ==============================================================================
+# Under gunicorn.conf.py the app is imported once in the master, which loads
+# models and cache indexes, and is then forked. Threads and upstream
+# connections do not survive a fork, so each worker starts its own in post_fork.
+PREFORK = os.environ.get("AI_SERVICE_PREFORK", "false").lower() == "true"
+
+# eager: load models and connect before serving; background: serve at once
+# (liveness) and warm up on a thread, reporting progress through readiness
+STARTUP_MODE = os.environ.get("STARTUP_MODE", "background").lower()
+
+# Without a model client interviews run on fallback questions; set to require a connection
+READINESS_REQUIRES_MODEL = os.environ.get("READINESS_REQUIRES_MODEL", "false").lower() == "true"
+
+warmed_up = threading.Event()
+warm_up_status = {"state": "pending", "seconds": None}
+
+def warm_up():
+    """Loads the STT model and connects to Hugging Face"""
+    started = time.perf_counter()
+    warm_up_status["state"] = "warming"
+    try:
+        warm_up_stt()
+        if VAD_ENABLED and not vad.available():
+            logger.warning("⚠️ NumPy not installed, silence trimming disabled")
+        connected = initialize_hf_client()
+        warm_up_status["state"] = "ready" if connected else "degraded"
+    except Exception as e:
+        logger.error(f"Warm-up failed: {e}")
+        warm_up_status["state"] = "degraded"
+    finally:
+        warm_up_status["seconds"] = round(time.perf_counter() - started, 3)
+        warmed_up.set()
+        logger.info(f"Warm-up finished in {warm_up_status['seconds']}s ({warm_up_status['state']})")
+
+def is_ready():
+    """True once warm-up has finished and, if required, a model client exists"""
+    if not warmed_up.is_set():
+        return False
+    return model_pool.size() > 0 or not READINESS_REQUIRES_MODEL
+
+def start_turn_writer():
+    """Creates this process's turn writer, replaying what a previous one left behind"""
+    global turn_writer
+    try:
+        turn_writer = BatchingTurnWriter(
+            create_turn_sink(TURN_STORE_URL),
+            TURN_WAL_DIR,
+            max_batch=int(os.environ.get("TURN_BATCH_SIZE", 500)),
+            flush_interval=float(os.environ.get("TURN_FLUSH_INTERVAL", 2)),
+            fsync=os.environ.get("TURN_WAL_FSYNC", "false").lower() == "true",
+        )
+    except Exception as e:
+        logger.error(f"❌ Interview turns will not be persisted: {e}")
+        return
+    turn_writer.start()
+    atexit.register(turn_writer.stop)
+    logger.info(f"✅ Persisting interview turns to {TURN_STORE_URL.split('://')[0]}")
+
+def start_worker():
+    """Starts per-process background threads and warms up"""
+    if TURN_STORE_URL:
+        start_turn_writer()
+    decoder_pool.start()
+    atexit.register(decoder_pool.stop)
+    tts_jobs.start()
+    audio_store.start_sweeper(interval=AUDIO_SWEEP_INTERVAL)
+    if ANSWER_STREAMS_ENABLED:
+        answer_streams.start_sweeper(interval=ANSWER_STREAM_SWEEP_INTERVAL)
+    if keyword_refresher is not None:
+        keyword_refresher.start()
+    if STARTUP_MODE == "eager":
+        warm_up()
+    else:
+        threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+
+if PREFORK:
+    # Load models and NumPy in the master so workers share them
+    warm_up_stt()
+    vad.available()
+else:
+    start_worker()
+
 if __name__ == '__main__':
     logger.info("="*70)
     logger.info("Starting AI Video Interviewer Service")
     logger.info("="*70)
     logger.info(f"FFmpeg Status: {'✅ Available' if os.system('ffmpeg -version > nul 2>&1') == 0 else '⚠️ Not found in PATH'}")
-    logger.info("Visit http://localhost:5001 to start interviews")
+    port = int(os.environ.get("AI_SERVICE_PORT", 5001))
+    logger.info(f"Visit http://localhost:{port} to start interviews")
+    logger.info("Development server; use `gunicorn -c gunicorn.conf.py` in production")
     logger.info("="*70)
     
-    app.run(debug=False, port=5001, host='0.0.0.0')
+    app.run(debug=False, port=port, host='0.0.0.0')
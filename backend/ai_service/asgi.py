@@ -0,0 +1,219 @@
+"""
+Asynchronous execution mode for the AI Interview Service
+Runs the response pipeline as awaitable stages with per-stage timeouts,
+so one process can hold many in-flight interviews
+
+Run with:
+    uvicorn asgi:application --host 0.0.0.0 --port 5001
+
+Endpoints listed in ASYNC_PATHS are served by the async pipeline below;
+every other route is forwarded to the regular Flask app.
+"""
+
+import asyncio
+import contextvars
+import functools
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.wsgi import WsgiToAsgi
+from quart import Quart, request, jsonify
+
+import app as service
+
+logger = logging.getLogger(__name__)
+
+# ==============================================================================
+# STAGE CONFIGURATION
+# ==============================================================================
+STAGE_TIMEOUTS = {
+    "convert_audio_to_wav": float(os.environ.get("STAGE_TIMEOUT_CONVERT", 15)),
+    "trim_silence": float(os.environ.get("STAGE_TIMEOUT_TRIM", 5)),
+    "transcribe_audio": float(os.environ.get("STAGE_TIMEOUT_TRANSCRIBE", 20)),
+    # Model call, turn write and reply audio, run by service.answer_turn;
+    # audio past service.TTS_REPLY_TIMEOUT is dropped, not waited for
+    "answer_turn": float(os.environ.get("STAGE_TIMEOUT_ANSWER", 50)),
+    "session_store": float(os.environ.get("STAGE_TIMEOUT_SESSION", 5)),
+}
+
+# Blocking library calls (SpeechRecognition, gradio_client, gTTS) run here.
+# The event loop only waits on them, so in-flight requests are not bound to threads.
+stage_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("ASYNC_STAGE_WORKERS", 64)),
+    thread_name_prefix="stage"
+)
+
+
+class StageTimeout(Exception):
+    """Raised when a pipeline stage exceeds its time budget"""
+
+    def __init__(self, stage):
+        super().__init__(f"Stage '{stage}' timed out after {STAGE_TIMEOUTS[stage]}s")
+        self.stage = stage
+
+
+async def run_stage(stage, func, *args, **kwargs):
+    """
+    Runs a blocking pipeline stage without blocking the event loop
+
+    Args:
+        stage (str): Stage name, used for its timeout and in logs
+        func (callable): Blocking function to run
+        *args, **kwargs: Passed to func
+
+    Returns:
+        Whatever func returns
+
+    Raises:
+        StageTimeout: If the stage does not finish within its timeout
+
+    A thread cannot be interrupted, so on timeout func keeps running and
+    keeps any slot it holds (model client, TTS, ffmpeg) until it returns;
+    the upstream timeouts of those stages bound how long. The stage's
+    deadline is passed on as service.request_deadline(), so a timed-out
+    stage still waiting for a slot gives up instead of taking one.
+    """
+    loop = asyncio.get_running_loop()
+    timeout = STAGE_TIMEOUTS[stage]
+    context = contextvars.copy_context()
+    context.run(service.stage_deadline.set, time.monotonic() + timeout)
+    call = functools.partial(context.run, func, *args, **kwargs)
+    started = loop.time()
+    try:
+        result = await asyncio.wait_for(
+            loop.run_in_executor(stage_executor, call),
+            timeout=timeout
+        )
+    except asyncio.TimeoutError:
+        logger.error(f"⏱️ Stage {stage} timed out")
+        raise StageTimeout(stage)
+    logger.info(f"Stage {stage} finished in {loop.time() - started:.3f}s")
+    return result
+
+
+async def convert_audio_async(audio_bytes, content_type=None):
+    """
+    Decodes uploaded audio on a stage thread through the shared decoder pool
+
+    The pool's limiter bounds ffmpeg for both execution modes, so the spares
+    started by the pool serve async requests too. If the stage times out the
+    decode still finishes or hits the pool's own timeout, and only then
+    gives its slot back.
+
+    Args:
+        audio_bytes (bytes): Encoded audio as uploaded
+        content_type (str): MIME type declared by the client
+
+    Returns:
+        sr.AudioData: Decoded PCM, or None if ffmpeg failed
+
+    Raises:
+        StageTimeout: If decoding does not finish in time
+        Overloaded: If no decoder slot frees up in time
+    """
+    return await run_stage("convert_audio_to_wav", service.convert_audio_to_wav, audio_bytes, content_type)
+
+
+# ==============================================================================
+# ASYNC APP
+# ==============================================================================
+async_app = Quart(__name__)
+
+
+@async_app.route('/api/process-response', methods=['POST'])
+async def process_response():
+    """
+    Async version of app.process_response with the same request/response contract
+    """
+    endpoint = '/api/process-response'
+    started = time.perf_counter()
+    service.IN_FLIGHT.inc(endpoint=endpoint)
+    try:
+        response = await _process_response()
+    finally:
+        service.IN_FLIGHT.dec(endpoint=endpoint)
+    status = response[1] if isinstance(response, tuple) else 200
+    service.REQUEST_LATENCY.observe(time.perf_counter() - started, endpoint=endpoint)
+    service.REQUESTS.inc(endpoint=endpoint, status=status)
+    return response
+
+
+async def _process_response():
+    logger.info("Processing user response (async)...")
+
+    files = await request.files
+    form = await request.form
+
+    interview_id = form.get('interview_id')
+    conversation_history = form.get('conversation_history')
+    try:
+        service.check_rate_limits(service.tenant_of(request.headers, request.remote_addr), interview_id)
+    except service.Overloaded as e:
+        return service.overloaded_response(e)
+    if 'audio' not in files:
+        return jsonify({"error": "Missing audio"}), 400
+    if not interview_id:
+        return jsonify({"error": "Missing interview_id; start the interview with /api/start-interview first"}), 400
+    if await run_stage("session_store", service.session_store.get, interview_id) is None:
+        return jsonify({"error": "Unknown or expired interview session"}), 404
+
+    audio_file = files['audio']
+
+    try:
+        audio_data = await convert_audio_async(audio_file.read(), audio_file.content_type)
+        if audio_data is None:
+            return jsonify({
+                "error": "Could not process audio file. Check FFmpeg installation."
+            }), 500
+
+        audio_data = await run_stage("trim_silence", service.trim_silence, audio_data)
+        if audio_data is None:
+            return service.no_speech_response()
+
+        user_response_text, transcription_status = await run_stage("transcribe_audio", service.transcribe_audio, audio_data)
+
+        # The same turn logic as the Flask app, so a slow reply audio degrades
+        # to audio_url=None after the turn is recorded instead of failing it
+        return jsonify(await run_stage(
+            "answer_turn", service.answer_turn,
+            interview_id, conversation_history, user_response_text, transcription_status,
+            form.get('question_id'),
+            stream=service.TTS_STREAMING_ENABLED and form.get('stream_audio', '').lower() == 'true',
+            background=service.AUDIO_JOBS_ENABLED and form.get('async_audio', '').lower() == 'true'
+        ))
+
+    except service.PoolExhausted as e:
+        return service.model_unavailable_response(e)
+
+    except service.Overloaded as e:
+        return service.overloaded_response(e)
+
+    except StageTimeout as e:
+        return jsonify({
+            "error": f"Failed to process response: {e}",
+            "stage": e.stage
+        }), 504
+
+    except Exception as e:
+        logger.error(f"Error processing response: {e}")
+        return jsonify({
+            "error": f"Failed to process response: {str(e)}"
+        }), 500
+
+
+# ==============================================================================
+# ASGI ENTRY POINT
+# ==============================================================================
+ASYNC_PATHS = {'/api/process-response'}
+
+flask_asgi = WsgiToAsgi(service.app)
+
+
+async def application(scope, receive, send):
+    """Routes async endpoints to the Quart app and everything else to Flask"""
+    if scope["type"] == "lifespan" or scope.get("path") in ASYNC_PATHS:
+        await async_app(scope, receive, send)
+    else:
+        await flask_asgi(scope, receive, send)
@@ -0,0 +1,228 @@
+"""
+Audio formats for synthesized speech and uploaded answers
+Speech is produced as MP3 by the TTS backends and can be re-encoded to a
+smaller format per deployment (TTS_OUTPUT_FORMAT). Uploads that are already
+PCM at the recognizer's sample rate skip ffmpeg entirely.
+"""
+
+import logging
+import re
+import struct
+import subprocess
+
+logger = logging.getLogger(__name__)
+
+
+class AudioFormat:
+    """
+    An output format for synthesized speech
+
+    Args:
+        name (str): Setting value, e.g. "opus"
+        extension (str): File extension of stored audio
+        mime_type (str): Content type served to clients
+        encoder (str): ffmpeg encoder, or None to keep the backend's MP3
+        container (str): ffmpeg muxer
+        default_bitrate (str): Bitrate when none is configured
+        sample_rate (int): Output sample rate, or None to keep the input's
+    """
+
+    def __init__(self, name, extension, mime_type, encoder=None, container=None,
+                 default_bitrate=None, sample_rate=None):
+        self.name = name
+        self.extension = extension
+        self.mime_type = mime_type
+        self.encoder = encoder
+        self.container = container
+        self.default_bitrate = default_bitrate
+        self.sample_rate = sample_rate
+
+    @property
+    def passthrough(self):
+        return self.encoder is None
+
+
+OUTPUT_FORMATS = {
+    # As synthesized (gTTS: 24 kHz mono, 32-64 kbit/s)
+    "mp3": AudioFormat("mp3", ".mp3", "audio/mpeg"),
+    # Plays everywhere, about half the size of gTTS output
+    "mp3-low": AudioFormat("mp3-low", ".mp3", "audio/mpeg", "libmp3lame", "mp3", "24k", 22050),
+    # Smallest; Chrome, Firefox, Edge and Safari 17+
+    "opus": AudioFormat("opus", ".webm", "audio/webm", "libopus", "webm", "20k"),
+    "ogg-opus": AudioFormat("ogg-opus", ".ogg", "audio/ogg", "libopus", "ogg", "20k"),
+}
+
+
+class SpeechEncoder:
+    """
+    Re-encodes synthesized MP3 into the configured output format
+
+    Args:
+        ffmpeg (str): ffmpeg binary
+        audio_format (AudioFormat): Target format
+        bitrate (str): Target bitrate, e.g. "24k"; the format's default if None
+        timeout (float): Seconds allowed per encode
+    """
+
+    def __init__(self, ffmpeg, audio_format, bitrate=None, timeout=15):
+        self.ffmpeg = ffmpeg
+        self.format = audio_format
+        self.bitrate = bitrate or audio_format.default_bitrate
+        self.timeout = timeout
+
+    @property
+    def extension(self):
+        return self.format.extension
+
+    def available(self):
+        """True if ffmpeg can produce this format"""
+        if self.format.passthrough:
+            return True
+        try:
+            proc = subprocess.run(
+                [self.ffmpeg, "-hide_banner", "-encoders"],
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, timeout=self.timeout
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            return False
+        return re.search(rf"\s{re.escape(self.format.encoder)}\s", proc.stdout.decode(errors="replace")) is not None
+
+    def command(self):
+        """ffmpeg arguments reading MP3 on stdin and writing the format to stdout"""
+        args = [
+            self.ffmpeg, "-hide_banner", "-loglevel", "error",
+            "-f", "mp3", "-i", "pipe:0",
+            "-vn", "-ac", "1", "-c:a", self.format.encoder, "-b:a", self.bitrate,
+        ]
+        if self.format.sample_rate:
+            args += ["-ar", str(self.format.sample_rate)]
+        if self.format.encoder == "libopus":
+            args += ["-application", "voip"]
+        return args + ["-f", self.format.container, "pipe:1"]
+
+    def encode(self, mp3_bytes):
+        """
+        Args:
+            mp3_bytes (bytes): Speech as returned by the TTS backend
+
+        Returns:
+            bytes: Speech in the output format (the input itself for passthrough)
+
+        Raises:
+            RuntimeError: If ffmpeg fails
+        """
+        if self.format.passthrough:
+            return mp3_bytes
+        proc = subprocess.run(
+            self.command(), input=mp3_bytes,
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=self.timeout
+        )
+        if proc.returncode != 0 or not proc.stdout:
+            raise RuntimeError(f"Speech encoding failed: {proc.stderr.decode(errors='replace').strip()}")
+        return proc.stdout
+
+
+def create_speech_encoder(ffmpeg, name, bitrate=None, timeout=15):
+    """
+    Builds the encoder for a TTS_OUTPUT_FORMAT value
+
+    Falls back to plain MP3 if the format is unknown or ffmpeg cannot
+    produce it, so a misconfiguration never silences the interviewer.
+
+    Returns:
+        SpeechEncoder: Ready-to-use encoder
+    """
+    audio_format = OUTPUT_FORMATS.get(name)
+    if audio_format is None:
+        logger.warning(f"⚠️ Unknown TTS output format '{name}'. Available: {', '.join(OUTPUT_FORMATS)}")
+        return SpeechEncoder(ffmpeg, OUTPUT_FORMATS["mp3"])
+    encoder = SpeechEncoder(ffmpeg, audio_format, bitrate, timeout)
+    if not encoder.available():
+        logger.warning(f"⚠️ ffmpeg cannot encode {audio_format.encoder}; serving MP3 speech")
+        return SpeechEncoder(ffmpeg, OUTPUT_FORMATS["mp3"])
+    return encoder
+
+
+# ==============================================================================
+# INGEST
+# ==============================================================================
+def parse_wav(data):
+    """
+    Reads a canonical PCM WAV file without decoding it
+
+    Returns:
+        tuple: (pcm bytes, sample_rate, channels, sample_width), or None if
+               data is not uncompressed PCM WAV
+    """
+    if len(data) < 12 or data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        return None
+    offset = 12
+    fmt = None
+    while offset + 8 <= len(data):
+        chunk_id, size = struct.unpack_from("<4sI", data, offset)
+        body = offset + 8
+        if chunk_id == b"fmt ":
+            if size < 16:
+                return None
+            try:
+                fmt = struct.unpack_from("<HHIIHH", data, body)
+            except struct.error:
+                # Truncated header; let ffmpeg make what it can of it
+                return None
+        elif chunk_id == b"data":
+            if fmt is None:
+                return None
+            audio_format, channels, sample_rate, _, _, bits = fmt
+            # 1 = PCM; 0xFFFE (extensible) is left to ffmpeg
+            if audio_format != 1:
+                return None
+            # Streamed WAVs may carry a placeholder size
+            end = min(body + size, len(data))
+            return data[body:end], sample_rate, channels, bits // 8
+        offset = body + size + (size & 1)
+    return None
+
+
+def pcm_passthrough(data, content_type, sample_rate):
+    """
+    Returns uploaded audio as PCM when it is already what the recognizer takes
+
+    Accepted without transcoding:
+        - WAV with 16-bit mono PCM at sample_rate
+        - Raw audio/L16 (or audio/pcm) declared with rate=sample_rate
+
+    Args:
+        data (bytes): Upload
+        content_type (str): Declared MIME type, possibly with parameters
+        sample_rate (int): Rate the recognizer expects
+
+    Returns:
+        bytes: 16-bit little-endian mono PCM, or None if ffmpeg is needed
+    """
+    wav = parse_wav(data)
+    if wav is not None:
+        pcm, rate, channels, width = wav
+        return pcm if (rate, channels, width) == (sample_rate, 1, 2) else None
+
+    mime, _, params = (content_type or "").partition(";")
+    if mime.strip().lower() not in ("audio/l16", "audio/pcm"):
+        return None
+    options = dict(
+        part.strip().lower().split("=", 1) for part in params.split(";") if "=" in part
+    )
+    if options.get("rate") != str(sample_rate) or options.get("channels", "1") != "1":
+        return None
+    if mime.strip().lower() == "audio/l16" and options.get("endianness", "big-endian") != "little-endian":
+        # RFC 2586 L16 is big-endian; swap to the little-endian the recognizers expect
+        return swap_bytes(data)
+    return data if len(data) % 2 == 0 else data[:-1]
+
+
+def swap_bytes(pcm):
+    """Converts 16-bit samples between big- and little-endian"""
+    pcm = pcm[:len(pcm) - len(pcm) % 2]
+    swapped = bytearray(len(pcm))
+    swapped[0::2] = pcm[1::2]
+    swapped[1::2] = pcm[0::2]
+    return bytes(swapped)
+
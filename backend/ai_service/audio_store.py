@@ -0,0 +1,227 @@
+"""
+Lifecycle management for generated audio under static/audio
+Every file belongs to the interview that produced it and lives in a sharded
+subdirectory. A background sweeper deletes files whose interview has ended
+or whose TTL has passed, and a hard disk quota evicts the oldest files first.
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+SHARD_CHARS = 2
+PREFIX_PATTERN = re.compile(r"[A-Za-z0-9_-]+")
+
+
+class AudioFile:
+    """Bookkeeping for one stored file"""
+
+    __slots__ = ("size", "created_at", "expires_at", "owners")
+
+    def __init__(self, size, created_at, expires_at, owners=()):
+        self.size = size
+        self.created_at = created_at
+        self.expires_at = expires_at
+        self.owners = set(owners)
+
+
+class AudioStore:
+    """
+    Sharded directory of per-interview audio files
+
+    Args:
+        directory (str): Root directory, served as /static/audio
+        max_bytes (int): Hard quota; the oldest files are evicted beyond it
+        ttl (float): Lifetime of files that no interview holds
+        owned_ttl (float): Upper bound on the lifetime of held files, so
+                           abandoned interviews do not pin audio forever
+        release_grace (float): Seconds a released file stays available, so
+                               the client can finish playing it
+        skip_dirs (tuple): Subdirectories managed by someone else (TTS cache)
+    """
+
+    def __init__(self, directory, max_bytes=1024 * 1024 * 1024, ttl=15 * 60,
+                 owned_ttl=4 * 60 * 60, release_grace=60, skip_dirs=()):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.owned_ttl = owned_ttl
+        self.release_grace = release_grace
+        self.skip_dirs = set(skip_dirs)
+        self._files = OrderedDict()  # relative name -> AudioFile, oldest first
+        self._by_owner = {}  # owner -> set of relative names
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._sweeper = None
+        self._stop = threading.Event()
+        os.makedirs(self.directory, exist_ok=True)
+        self._load()
+
+    def path(self, name):
+        """Absolute path of a stored file"""
+        return os.path.join(self.directory, name)
+
+    def _load(self):
+        """Index files left by earlier runs; they are unowned and expire by mtime"""
+        found = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file():
+                # Flat files from before sharding
+                candidates = [(entry.name, entry)]
+            elif entry.is_dir() and entry.name not in self.skip_dirs and len(entry.name) == SHARD_CHARS:
+                candidates = [
+                    (f"{entry.name}/{child.name}", child)
+                    for child in os.scandir(entry.path) if child.is_file()
+                ]
+            else:
+                continue
+            for name, item in candidates:
+                try:
+                    stat = item.stat()
+                except OSError:
+                    continue
+                found.append((stat.st_mtime, name, stat.st_size))
+
+        with self._lock:
+            for mtime, name, size in sorted(found):
+                self._files[name] = AudioFile(size, mtime, mtime + self.ttl)
+                self._total_bytes += size
+            self._evict_locked()
+        logger.info(f"Audio store loaded: {len(self._files)} files, {self._total_bytes} bytes")
+
+    def allocate(self, prefix, extension=".mp3"):
+        """
+        Reserves a unique name for a new file
+
+        Args:
+            prefix (str): Human-readable filename prefix of letters, digits, _ and -
+            extension (str): File extension
+
+        Returns:
+            str: Name relative to the store root; write to path(name), then add(name)
+
+        Raises:
+            ValueError: If the prefix could leave the store directory
+        """
+        if not PREFIX_PATTERN.fullmatch(prefix or ""):
+            raise ValueError(f"Invalid audio file prefix: {prefix!r}")
+        token = uuid.uuid4().hex
+        shard = token[:SHARD_CHARS]
+        os.makedirs(os.path.join(self.directory, shard), exist_ok=True)
+        return f"{shard}/{prefix}_{token}{extension}"
+
+    def add(self, name, owner=None):
+        """
+        Registers a written file
+
+        Args:
+            name (str): Name from allocate()
+            owner (str): Interview holding the file, if any
+
+        Returns:
+            str: The same name, for chaining into a URL
+        """
+        size = os.path.getsize(self.path(name))
+        now = time.time()
+        with self._lock:
+            self._files[name] = AudioFile(
+                size, now, now + (self.owned_ttl if owner else self.ttl),
+                owners=[owner] if owner else ()
+            )
+            self._total_bytes += size
+            if owner:
+                self._by_owner.setdefault(owner, set()).add(name)
+            self._evict_locked(keep=name)
+        return name
+
+    def release(self, owner):
+        """
+        Drops an interview's references; its files expire after the grace period
+
+        Returns:
+            int: Number of files released
+        """
+        deadline = time.time() + self.release_grace
+        with self._lock:
+            names = self._by_owner.pop(owner, set())
+            for name in names:
+                entry = self._files.get(name)
+                if entry is None:
+                    continue
+                entry.owners.discard(owner)
+                if not entry.owners:
+                    entry.expires_at = min(entry.expires_at, deadline)
+        return len(names)
+
+    def _remove_locked(self, name):
+        entry = self._files.pop(name)
+        self._total_bytes -= entry.size
+        for owner in entry.owners:
+            names = self._by_owner.get(owner)
+            if names is not None:
+                names.discard(name)
+                if not names:
+                    del self._by_owner[owner]
+        try:
+            os.remove(self.path(name))
+        except OSError:
+            pass
+
+    def _evict_locked(self, keep=None):
+        """Delete oldest files until within quota. Caller holds the lock."""
+        while self._files and self._total_bytes > self.max_bytes:
+            name = next(iter(self._files))
+            if name == keep:
+                break
+            self._remove_locked(name)
+            logger.info(f"Audio store over quota, evicted {name}")
+
+    def sweep(self):
+        """
+        Deletes expired files
+
+        Returns:
+            int: Number of files deleted
+        """
+        now = time.time()
+        with self._lock:
+            expired = [name for name, entry in self._files.items() if entry.expires_at <= now]
+            for name in expired:
+                self._remove_locked(name)
+        if expired:
+            logger.info(f"Audio store swept {len(expired)} expired files")
+        return len(expired)
+
+    def start_sweeper(self, interval=60):
+        """Runs sweep() every interval seconds on a daemon thread"""
+        if self._sweeper is not None and self._sweeper.is_alive():
+            return
+
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    self.sweep()
+                except Exception as e:
+                    logger.error(f"Audio sweep failed: {e}")
+
+        self._sweeper = threading.Thread(target=run, name="audio-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def stats(self):
+        """Returns current store usage"""
+        with self._lock:
+            return {
+                "files": len(self._files),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "interviews": len(self._by_owner),
+            }
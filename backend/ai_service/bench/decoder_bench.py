@@ -0,0 +1,113 @@
+"""
+Benchmark of audio decoding: one ffmpeg spawned per upload vs. the decoder pool
+Encodes a synthetic answer the way browsers record it (Opus in WebM by
+default), then decodes it --jobs times with --concurrency callers through
+DecoderPool with spares=0 (a fresh ffmpeg per call, the old behaviour) and
+with --spares pre-started decoders. Reports throughput, p50/p95/p99 latency
+and the CPU time used by ffmpeg processes.
+
+Requires ffmpeg on PATH.
+
+    python bench/decoder_bench.py --jobs 2000 --concurrency 32 --workers 16 --spares 4
+"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVICE_DIR)
+
+from decoder_pool import DecoderPool  # noqa: E402
+
+CONTAINERS = {
+    "webm": ["-c:a", "libopus", "-b:a", "32k", "-f", "webm"],
+    "ogg": ["-c:a", "libopus", "-b:a", "32k", "-f", "ogg"],
+    "wav": ["-c:a", "pcm_s16le", "-ar", "48000", "-f", "wav"],
+}
+
+
+def make_clip(ffmpeg, seconds, container):
+    """Encodes a tone of the given length in a recorder-like container"""
+    proc = subprocess.run(
+        [ffmpeg, "-hide_banner", "-loglevel", "error",
+         "-f", "lavfi", "-i", f"sine=frequency=220:duration={seconds}",
+         "-ac", "1", *CONTAINERS[container], "pipe:1"],
+        stdout=subprocess.PIPE, check=True
+    )
+    return proc.stdout
+
+
+def decode_command(ffmpeg, rate):
+    # Same command as app.ffmpeg_decode_command
+    return [
+        ffmpeg, "-hide_banner", "-loglevel", "error",
+        "-i", "pipe:0",
+        "-f", "s16le", "-acodec", "pcm_s16le",
+        "-ac", "1", "-ar", str(rate),
+        "pipe:1",
+    ]
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def child_cpu():
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def run(pool, clip, jobs, concurrency):
+    """Decodes the clip `jobs` times; returns (elapsed, latencies, ffmpeg cpu seconds)"""
+    latencies = []
+
+    def job(_):
+        started = time.perf_counter()
+        pool.decode(clip)
+        latencies.append(time.perf_counter() - started)
+
+    pool.start()
+    time.sleep(0.5)  # let the spares come up
+    cpu_before = child_cpu()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(job, range(jobs)))
+    elapsed = time.perf_counter() - started
+    pool.stop()
+    return elapsed, latencies, child_cpu() - cpu_before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="Decodes at once (FFMPEG_WORKERS)")
+    parser.add_argument("--spares", type=int, default=4, help="Pre-started decoders (FFMPEG_SPARES)")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Length of the test answer")
+    parser.add_argument("--container", choices=sorted(CONTAINERS), default="webm")
+    parser.add_argument("--rate", type=int, default=16000)
+    parser.add_argument("--ffmpeg", default="ffmpeg")
+    args = parser.parse_args()
+
+    clip = make_clip(args.ffmpeg, args.seconds, args.container)
+    command = decode_command(args.ffmpeg, args.rate)
+    print(f"{args.jobs} decodes of a {args.seconds:g}s {args.container} clip ({len(clip)} bytes), "
+          f"concurrency {args.concurrency}, {args.workers} workers\n")
+    print(f"{'mode':<16}{'jobs/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'cpu ms/job':>12}")
+    for label, spares in (("spawn per call", 0), (f"pool ({args.spares} spares)", args.spares)):
+        pool = DecoderPool(command, args.workers, spares=spares, max_queue=args.jobs, queue_timeout=600)
+        elapsed, latencies, cpu = run(pool, clip, args.jobs, args.concurrency)
+        print(f"{label:<16}{args.jobs / elapsed:>10.1f}"
+              f"{percentile(latencies, 0.5) * 1000:>10.1f}{percentile(latencies, 0.95) * 1000:>10.1f}"
+              f"{percentile(latencies, 0.99) * 1000:>10.1f}{cpu / args.jobs * 1000:>12.2f}")
+    print("\nCPU time counts ffmpeg processes that have exited, including spares started during the run.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,378 @@
+"""
+Offline load test for the AI Interview Service
+Starts app.py against local stand-ins for the Gradio model, STT and TTS,
+replays synthetic interviews (resume upload + N audio turns + end) with the
+requested concurrency, and reports throughput and p50/p95/p99 latency per
+endpoint and per pipeline stage (scraped from /metrics). Answers are sent
+in each of --answer-formats in turn and reported per format: 16 kHz WAV
+skips ffmpeg, while 48 kHz WAV and the browser's WebM/Opus are decoded.
+
+Requires ffmpeg on PATH and `pip install gradio` for the model stand-in.
+
+    python bench/loadgen.py --interviews 2000 --concurrency 200 --turns 3 \\
+        --model-latency-ms 800 --stt-latency-ms 300 --tts-latency-ms 200
+
+Use --target http://host:port to load an already running service instead.
+"""
+
+import argparse
+import io
+import json
+import math
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import wave
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MINIMAL_PDF = b"""%PDF-1.4
+1 0 obj << /Type /Catalog /Pages 2 0 R >> endobj
+2 0 obj << /Type /Pages /Kids [3 0 R] /Count 1 >> endobj
+3 0 obj << /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] >> endobj
+trailer << /Root 1 0 R >>
+%%EOF"""
+
+JOB_DESCRIPTION = "Senior Backend Engineer - Python, microservices, AWS, PostgreSQL"
+
+# Answer upload formats: filename, content type, recording sample rate
+ANSWER_FORMATS = {
+    "wav": ("response.wav", "audio/wav", 16000),
+    "wav48k": ("response.wav", "audio/wav", 48000),
+    "webm": ("response.webm", "audio/webm", 48000),
+}
+
+BUCKET_LINE = re.compile(r'^ai_service_stage_seconds_bucket\{stage="([^"]+)",le="([^"]+)"\} (\S+)$')
+
+
+# ==============================================================================
+# PAYLOADS
+# ==============================================================================
+def make_answer_wav(seconds=2.0, rate=16000, frequency=150.0):
+    """
+    Builds a mono 16-bit WAV standing in for a recorded answer
+
+    The tone is shaped into syllables (about 4 per second, with a gliding
+    pitch) and separated into words by short pauses, so silence trimming
+    has the same work to do as on speech.
+    """
+    frames = bytearray()
+    phase = 0.0
+    for i in range(int(seconds * rate)):
+        t = i / rate
+        syllable = max(0.0, math.sin(2 * math.pi * 4 * t)) ** 2
+        word = 0.0 if (t % 1.0) > 0.8 else 1.0
+        pitch = frequency * (1 + 0.2 * math.sin(2 * math.pi * 0.7 * t))
+        phase += 2 * math.pi * pitch / rate
+        sample = int(12000 * syllable * word * math.sin(phase))
+        frames += sample.to_bytes(2, "little", signed=True)
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(bytes(frames))
+    return buffer.getvalue()
+
+
+def make_answer(name, seconds):
+    """
+    Builds an answer upload in one of ANSWER_FORMATS
+
+    Returns:
+        tuple: (filename, data, content type) for a requests file field
+    """
+    filename, content_type, rate = ANSWER_FORMATS[name]
+    data = make_answer_wav(seconds, rate=rate)
+    if name == "webm":
+        # What MediaRecorder uploads from the browser
+        data = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-loglevel", "error", "-f", "wav", "-i", "pipe:0",
+             "-c:a", "libopus", "-b:a", "32k", "-f", "webm", "pipe:1"],
+            input=data, capture_output=True, check=True
+        ).stdout
+    return filename, data, content_type
+
+
+def make_resume(index, distinct):
+    """Returns resume bytes; only `distinct` different files are used, like real retries"""
+    return MINIMAL_PDF + f"\n% candidate {index % distinct}\n".encode()
+
+
+# ==============================================================================
+# PROCESS MANAGEMENT
+# ==============================================================================
+def spawn(args_list, log_path, env=None):
+    log = open(log_path, "wb")
+    return subprocess.Popen(
+        [sys.executable] + args_list,
+        cwd=SERVICE_DIR, stdout=log, stderr=subprocess.STDOUT,
+        env={**os.environ, **(env or {})}
+    )
+
+
+def wait_for(url, timeout=120):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if requests.get(url, timeout=2).status_code < 500:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"{url} did not come up within {timeout}s")
+
+
+def start_stack(args, workdir):
+    """Starts the stand-ins and the service; returns (base_url, processes)"""
+    procs = []
+    procs.append(spawn([
+        "stubs/gradio_stub.py", "--port", str(args.model_port),
+        "--latency-ms", str(args.model_latency_ms),
+        "--jitter-ms", str(args.model_jitter_ms),
+        "--failure-rate", str(args.model_failure_rate),
+    ], os.path.join(workdir, "gradio_stub.log")))
+    procs.append(spawn([
+        "stubs/fake_services.py", "--port", str(args.speech_port),
+        "--stt-latency-ms", str(args.stt_latency_ms),
+        "--stt-failure-rate", str(args.stt_failure_rate),
+        "--tts-latency-ms", str(args.tts_latency_ms),
+        "--tts-failure-rate", str(args.tts_failure_rate),
+    ], os.path.join(workdir, "fake_services.log")))
+    wait_for(f"http://127.0.0.1:{args.model_port}/config")
+
+    env = {
+        "AI_SERVICE_PORT": str(args.app_port),
+        "HF_SPACE": f"http://127.0.0.1:{args.model_port}",
+        "STT_BACKEND": "http",
+        "STT_HTTP_URL": f"http://127.0.0.1:{args.speech_port}/stt",
+        "TTS_BACKEND": "http",
+        "TTS_HTTP_URL": f"http://127.0.0.1:{args.speech_port}/tts",
+        "TTS_CACHE_ENABLED": "true" if args.tts_cache else "false",
+        "RESUME_CACHE_DIR": os.path.join(workdir, "resume_cache"),
+        # Measure the pipeline, not the rate limits; stage limits stay on
+        "TENANT_RATE": "0",
+        "INTERVIEW_RATE": "0",
+    }
+    for item in args.env:
+        key, _, value = item.partition("=")
+        env[key] = value
+    procs.append(spawn(["app.py"], os.path.join(workdir, "app.log"), env))
+    base_url = f"http://127.0.0.1:{args.app_port}"
+    wait_for(f"{base_url}/health/ready")
+    return base_url, procs
+
+
+# ==============================================================================
+# LOAD
+# ==============================================================================
+class Recorder:
+    """Thread-safe collection of request timings"""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.rejected = defaultdict(int)  # 429 and 503 from admission control
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, seconds, ok, status=None):
+        with self._lock:
+            self.samples[endpoint].append(seconds)
+            if not ok:
+                self.errors[endpoint] += 1
+            if status in (429, 503):
+                self.rejected[endpoint] += 1
+
+
+def run_interview(base_url, index, args, answers, recorder):
+    session = requests.Session()
+    # One tenant per virtual user, so a --target with rate limits on does
+    # not charge every user to this machine's address
+    session.headers["X-Tenant-ID"] = f"bench-{index}"
+
+    def call(endpoint, label=None, **kwargs):
+        started = time.perf_counter()
+        status = None
+        try:
+            response = session.post(f"{base_url}{endpoint}", timeout=args.request_timeout, **kwargs)
+            status = response.status_code
+            ok = response.ok
+            data = response.json() if ok else {}
+            # A turn rejected as no_speech never reached STT, the model or TTS
+            if data.get("success") is False or data.get("transcription_status") == "no_speech":
+                ok = False
+        except (requests.RequestException, ValueError):
+            ok, data = False, {}
+        recorder.record(label or endpoint, time.perf_counter() - started, ok, status)
+        return ok, data
+
+    ok, data = call(
+        "/api/start-interview",
+        files={"resume": ("resume.pdf", make_resume(index, args.distinct_resumes), "application/pdf")},
+        data={"job_description": JOB_DESCRIPTION},
+    )
+    if not ok:
+        return
+    interview_id = data.get("interview_id")
+    # Interviews alternate formats; each is reported under its own row
+    answer_format = args.answer_formats[index % len(args.answer_formats)]
+    for _ in range(args.turns):
+        call(
+            "/api/process-response",
+            label=f"/api/process-response ({answer_format})",
+            files={"audio": answers[answer_format]},
+            data={"interview_id": interview_id},
+        )
+    call("/api/end-interview", json={"interview_id": interview_id})
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return float("nan")
+    index = min(len(sorted_values) - 1, max(0, math.ceil(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def histogram_percentiles(metrics_text, quantiles=(0.5, 0.95, 0.99)):
+    """Estimates per-stage percentiles from Prometheus histogram buckets"""
+    buckets = defaultdict(list)
+    for line in metrics_text.splitlines():
+        match = BUCKET_LINE.match(line)
+        if match:
+            stage, le, count = match.groups()
+            buckets[stage].append((float("inf") if le == "+Inf" else float(le), float(count)))
+
+    result = {}
+    for stage, series in buckets.items():
+        series.sort()
+        total = series[-1][1]
+        if not total:
+            continue
+        estimates = {}
+        for q in quantiles:
+            target = q * total
+            lower_bound, lower_count = 0.0, 0.0
+            for bound, count in series:
+                if count >= target:
+                    if bound == float("inf"):
+                        estimates[q] = lower_bound
+                    else:
+                        fraction = (target - lower_count) / max(count - lower_count, 1e-9)
+                        estimates[q] = lower_bound + (bound - lower_bound) * fraction
+                    break
+                lower_bound, lower_count = bound, count
+        result[stage] = {"count": int(total), **{f"p{int(q * 100)}": v for q, v in estimates.items()}}
+    return result
+
+
+def report(recorder, elapsed, stage_stats, args):
+    endpoints = {}
+    total = 0
+    for endpoint, values in sorted(recorder.samples.items()):
+        values = sorted(values)
+        total += len(values)
+        endpoints[endpoint] = {
+            "count": len(values),
+            "errors": recorder.errors[endpoint],
+            "rejected": recorder.rejected[endpoint],
+            "p50": percentile(values, 0.50),
+            "p95": percentile(values, 0.95),
+            "p99": percentile(values, 0.99),
+        }
+    summary = {
+        "interviews": args.interviews,
+        "concurrency": args.concurrency,
+        "turns": args.turns,
+        "answer_formats": args.answer_formats,
+        "elapsed_seconds": elapsed,
+        "requests_per_second": total / elapsed if elapsed else 0,
+        "interviews_per_second": args.interviews / elapsed if elapsed else 0,
+        "endpoints": endpoints,
+        "stages": stage_stats,
+    }
+
+    print(f"\n{args.interviews} interviews x {args.turns} turns, concurrency {args.concurrency}")
+    print(f"Elapsed {elapsed:.1f}s | {summary['requests_per_second']:.1f} req/s | "
+          f"{summary['interviews_per_second']:.2f} interviews/s\n")
+    print(f"{'endpoint / stage':<32}{'count':>8}{'errors':>8}{'429/503':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, row in endpoints.items():
+        print(f"{name:<32}{row['count']:>8}{row['errors']:>8}{row['rejected']:>9}"
+              f"{row['p50'] * 1000:>10.1f}{row['p95'] * 1000:>10.1f}{row['p99'] * 1000:>10.1f}")
+    for name, row in sorted(stage_stats.items()):
+        print(f"{'  ' + name:<32}{row['count']:>8}{'':>8}{'':>9}"
+              f"{row.get('p50', 0) * 1000:>10.1f}{row.get('p95', 0) * 1000:>10.1f}{row.get('p99', 0) * 1000:>10.1f}")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--interviews", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--distinct-resumes", type=int, default=50)
+    parser.add_argument("--answer-seconds", type=float, default=2.0)
+    parser.add_argument("--answer-formats", default="wav,webm",
+                        help=f"Comma-separated upload formats, from {', '.join(ANSWER_FORMATS)}")
+    parser.add_argument("--request-timeout", type=float, default=120)
+    parser.add_argument("--target", help="Base URL of a running service; skips starting the stack")
+    parser.add_argument("--app-port", type=int, default=5101)
+    parser.add_argument("--model-port", type=int, default=7861)
+    parser.add_argument("--speech-port", type=int, default=8765)
+    parser.add_argument("--model-latency-ms", type=float, default=500)
+    parser.add_argument("--model-jitter-ms", type=float, default=200)
+    parser.add_argument("--model-failure-rate", type=float, default=0.0)
+    parser.add_argument("--stt-latency-ms", type=float, default=200)
+    parser.add_argument("--stt-failure-rate", type=float, default=0.0)
+    parser.add_argument("--tts-latency-ms", type=float, default=150)
+    parser.add_argument("--tts-failure-rate", type=float, default=0.0)
+    parser.add_argument("--tts-cache", action="store_true", help="Leave the TTS cache enabled")
+    parser.add_argument("--env", action="append", default=[], help="Extra KEY=VALUE for app.py")
+    parser.add_argument("--json", help="Write the summary as JSON to this file")
+    args = parser.parse_args()
+    args.answer_formats = [name.strip() for name in args.answer_formats.split(",") if name.strip()]
+    unknown = [name for name in args.answer_formats if name not in ANSWER_FORMATS]
+    if unknown or not args.answer_formats:
+        parser.error(f"--answer-formats: choose from {', '.join(ANSWER_FORMATS)}")
+
+    workdir = tempfile.mkdtemp(prefix="jobsupi_bench_")
+    procs = []
+    try:
+        if args.target:
+            base_url = args.target.rstrip("/")
+        else:
+            base_url, procs = start_stack(args, workdir)
+            print(f"Stack started, logs in {workdir}")
+
+        answers = {name: make_answer(name, args.answer_seconds) for name in args.answer_formats}
+        recorder = Recorder()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            for index in range(args.interviews):
+                executor.submit(run_interview, base_url, index, args, answers, recorder)
+        elapsed = time.perf_counter() - started
+
+        stage_stats = histogram_percentiles(requests.get(f"{base_url}/metrics", timeout=10).text)
+        summary = report(recorder, elapsed, stage_stats, args)
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump(summary, f, indent=2)
+    finally:
+        for proc in procs:
+            proc.terminate()
+        for proc in procs:
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+
+if __name__ == '__main__':
+    main()
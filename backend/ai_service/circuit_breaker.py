@@ -0,0 +1,157 @@
+"""
+Circuit breaker and hedged calls for upstream model requests
+When the upstream keeps failing, calls fail fast instead of each request
+waiting out full timeouts before degrading
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, wait
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the upstream while the circuit is open"""
+
+    def __init__(self, name, retry_after):
+        super().__init__(f"Circuit '{name}' is open, retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Failure-rate circuit breaker
+
+    Args:
+        name (str): Name used in logs and errors
+        failure_rate_threshold (float): Failure ratio (0-1) over the window that opens the circuit
+        window_size (int): Number of most recent calls considered
+        min_calls (int): Calls needed in the window before the rate is evaluated
+        open_seconds (float): How long the circuit stays open before a trial call
+        half_open_max_calls (int): Concurrent trial calls allowed while half-open
+    """
+
+    def __init__(self, name, failure_rate_threshold=0.5, window_size=20, min_calls=5,
+                 open_seconds=30, half_open_max_calls=1):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self._window = deque(maxlen=window_size)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._trial_calls = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            self._refresh_locked(time.monotonic())
+            return self._state
+
+    def _refresh_locked(self, now):
+        if self._state == OPEN and now - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._trial_calls = 0
+            logger.info(f"Circuit {self.name} half-open, allowing a trial call")
+
+    def _open_locked(self, now):
+        self._state = OPEN
+        self._opened_at = now
+        logger.warning(f"⚠️ Circuit {self.name} opened for {self.open_seconds}s")
+
+    def _before_call(self):
+        with self._lock:
+            now = time.monotonic()
+            self._refresh_locked(now)
+            if self._state == OPEN:
+                raise CircuitOpenError(self.name, self.open_seconds - (now - self._opened_at))
+            if self._state == HALF_OPEN:
+                if self._trial_calls >= self.half_open_max_calls:
+                    raise CircuitOpenError(self.name, self.open_seconds)
+                self._trial_calls += 1
+
+    def _after_call(self, success):
+        with self._lock:
+            now = time.monotonic()
+            if self._state == HALF_OPEN:
+                if success:
+                    self._state = CLOSED
+                    self._window.clear()
+                    logger.info(f"✅ Circuit {self.name} closed")
+                else:
+                    self._open_locked(now)
+                return
+            self._window.append(success)
+            if self._state == CLOSED and len(self._window) >= self.min_calls:
+                failures = self._window.count(False)
+                if failures / len(self._window) >= self.failure_rate_threshold:
+                    self._open_locked(now)
+
+    def call(self, func, *args, **kwargs):
+        """
+        Calls func through the breaker
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+            Exception: Whatever func raises (recorded as a failure)
+        """
+        self._before_call()
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            self._after_call(False)
+            raise
+        self._after_call(True)
+        return result
+
+    def stats(self):
+        with self._lock:
+            self._refresh_locked(time.monotonic())
+            return {
+                "state": self._state,
+                "window_calls": len(self._window),
+                "window_failures": self._window.count(False),
+            }
+
+
+def hedged_call(executor, primary, hedge, hedge_after):
+    """
+    Runs primary, and also hedge if primary has not finished after hedge_after seconds
+
+    The first attempt to succeed wins. If the first attempt to finish fails,
+    the other one is awaited before giving up.
+
+    Args:
+        executor (Executor): Runs the attempts
+        primary (callable): First attempt
+        hedge (callable): Backup attempt
+        hedge_after (float): Seconds to wait before starting the backup
+
+    Returns:
+        tuple: (index of the winning attempt, its result)
+
+    Raises:
+        Exception: The primary's error if both attempts fail
+    """
+    futures = [executor.submit(primary)]
+    done, _ = wait(futures, timeout=hedge_after)
+    if not done:
+        logger.info(f"Primary call slower than {hedge_after}s, sending hedged request")
+        futures.append(executor.submit(hedge))
+
+    pending = set(futures)
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                return futures.index(future), future.result()
+    return 0, futures[0].result()
@@ -0,0 +1,218 @@
+"""
+Pool of upstream model clients
+The Gradio interviewer keeps conversation state per upstream session, which a
+client selects through its session_hash. A request checks out any free
+client, points it at its interview's session and returns it when done, so
+clients are shared by all interviews and a client is only ever used by one
+request at a time.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class PoolExhausted(Exception):
+    """Raised when no client can be checked out within the acquire timeout"""
+
+
+class PooledClient:
+    """A client plus the bookkeeping the pool needs"""
+
+    def __init__(self, client):
+        self.client = client
+        self.busy = False
+        self.last_used = time.monotonic()
+        self.last_checked = time.monotonic()
+
+
+class ModelClientPool:
+    """
+    Bounded pool of model clients
+
+    Args:
+        factory (callable): Creates a new connected client
+        max_size (int): Maximum number of clients
+        client_ttl (float): Seconds after which an idle client is closed
+        health_check (callable): Called with a client; raises if it is unusable
+        health_check_interval (float): Minimum seconds between checks of one client
+        acquire_timeout (float): Seconds to wait for a free client
+    """
+
+    def __init__(self, factory, max_size=8, client_ttl=600,
+                 health_check=None, health_check_interval=60, acquire_timeout=10):
+        self.factory = factory
+        self.max_size = max_size
+        self.client_ttl = client_ttl
+        self.health_check = health_check
+        self.health_check_interval = health_check_interval
+        self.acquire_timeout = acquire_timeout
+        self._clients = []
+        self._creating = 0
+        self._cond = threading.Condition()
+
+    # --------------------------------------------------------------------------
+    # Checkout
+    # --------------------------------------------------------------------------
+    def _evict_idle_locked(self, now):
+        """Close surplus idle clients"""
+        for pooled in list(self._clients):
+            if not pooled.busy and now - pooled.last_used > self.client_ttl and len(self._clients) > 1:
+                self._clients.remove(pooled)
+                logger.info("Closed idle model client")
+
+    def _free_client_locked(self):
+        # Most recently used first, so surplus clients go idle and get closed
+        for pooled in sorted(self._clients, key=lambda p: p.last_used, reverse=True):
+            if not pooled.busy:
+                return pooled
+        return None
+
+    def _checkout(self):
+        """Marks a free client busy, creating one if the pool has room"""
+        deadline = time.monotonic() + self.acquire_timeout
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._evict_idle_locked(now)
+                pooled = self._free_client_locked()
+                if pooled is not None:
+                    pooled.busy = True
+                    return pooled
+                if len(self._clients) + self._creating < self.max_size:
+                    self._creating += 1
+                    break
+                remaining = deadline - now
+                if remaining <= 0:
+                    raise PoolExhausted(f"All {self.max_size} model clients are busy")
+                self._cond.wait(remaining)
+
+        # Create outside the lock: connecting takes seconds
+        try:
+            pooled = PooledClient(self.factory())
+        finally:
+            with self._cond:
+                self._creating -= 1
+                self._cond.notify_all()
+        pooled.busy = True
+        with self._cond:
+            self._clients.append(pooled)
+        logger.info(f"✅ Created model client ({len(self._clients)}/{self.max_size})")
+        return pooled
+
+    def _checkin(self, pooled):
+        with self._cond:
+            pooled.busy = False
+            pooled.last_used = time.monotonic()
+            self._cond.notify_all()
+
+    def _check(self, pooled):
+        """Runs the health check if due; returns False if the client is broken"""
+        if self.health_check is None:
+            return True
+        now = time.monotonic()
+        if now - pooled.last_checked < self.health_check_interval:
+            return True
+        try:
+            self.health_check(pooled.client)
+            pooled.last_checked = now
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ Model client failed health check: {e}")
+            return False
+
+    def _discard(self, pooled):
+        with self._cond:
+            if pooled in self._clients:
+                self._clients.remove(pooled)
+            self._cond.notify_all()
+
+    # --------------------------------------------------------------------------
+    # Public API
+    # --------------------------------------------------------------------------
+    @contextmanager
+    def acquire(self, checked=False):
+        """
+        Gives exclusive use of a free client for one request
+
+        The caller points the client at its interview by setting session_hash.
+
+        Args:
+            checked (bool): Health-check the client first if a check is due,
+                            e.g. before starting an interview
+
+        Yields:
+            The underlying model client
+        """
+        pooled = self._checkout()
+        if checked and not self._check(pooled):
+            self._discard(pooled)
+            pooled = self._checkout()
+        try:
+            yield pooled.client
+        finally:
+            self._checkin(pooled)
+
+    def check(self):
+        """
+        Health-checks one idle client, if a check is due
+
+        Meant to run between turns, so a broken client is replaced before the
+        next answer arrives rather than during it.
+
+        Returns:
+            bool: False if a client was broken and has been dropped
+        """
+        with self._cond:
+            due = [p for p in self._clients if not p.busy]
+            pooled = min(due, key=lambda p: p.last_checked) if due else None
+            if pooled is None:
+                return True
+            pooled.busy = True
+        try:
+            healthy = self._check(pooled)
+        finally:
+            self._checkin(pooled)
+        if not healthy:
+            self._discard(pooled)
+        return healthy
+
+    def warm_up(self, count=1):
+        """
+        Creates idle clients ahead of demand
+
+        Returns:
+            bool: True if at least one client is available afterwards
+        """
+        while True:
+            with self._cond:
+                if len(self._clients) + self._creating >= min(count, self.max_size):
+                    break
+                self._creating += 1
+            try:
+                pooled = PooledClient(self.factory())
+            except Exception as e:
+                logger.error(f"❌ Could not create model client: {e}")
+                with self._cond:
+                    self._creating -= 1
+                break
+            with self._cond:
+                self._creating -= 1
+                self._clients.append(pooled)
+                self._cond.notify_all()
+        return self.size() > 0
+
+    def size(self):
+        with self._cond:
+            return len(self._clients)
+
+    def stats(self):
+        with self._cond:
+            return {
+                "clients": len(self._clients),
+                "max_size": self.max_size,
+                "busy": sum(1 for p in self._clients if p.busy),
+            }
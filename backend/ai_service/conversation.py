@@ -0,0 +1,194 @@
+"""
+Structured view of the upstream interviewer's transcript
+The Gradio space returns the whole conversation as Markdown on every call
+("**AI:** ..." and "**You:** ..." blocks). TranscriptTracker remembers how
+much of each interview's transcript has been seen, so a reply is found by
+parsing only the text appended since the last call, and never by searching
+for the candidate's words (which the AI may quote back).
+"""
+
+import re
+import threading
+from collections import OrderedDict
+
+ROLE_MARKER = re.compile(r"^[ \t]*\*\*(You|AI):\*\*[ \t]*", re.MULTILINE)
+ROLES = {"You": "candidate", "AI": "ai"}
+
+# Characters before the seen offset that must be unchanged for the
+# transcript to count as an extension of the one seen last
+ANCHOR_LENGTH = 64
+
+
+class Turn:
+    """
+    One speaker block of the transcript
+
+    Args:
+        role (str): "ai" or "candidate"
+        text (str): What was said, without the role marker
+    """
+
+    __slots__ = ("role", "text")
+
+    def __init__(self, role, text):
+        self.role = role
+        self.text = text
+
+    def __repr__(self):
+        return f"Turn({self.role!r}, {self.text[:40]!r})"
+
+
+def parse_turns(text):
+    """
+    Splits transcript text into turns
+
+    Text before the first marker belongs to the AI, which is how replies
+    without a marker (and the start of an opening) look.
+
+    Returns:
+        list: Turn objects with non-empty text, in order
+    """
+    turns = []
+    role, start = "ai", 0
+    for marker in ROLE_MARKER.finditer(text):
+        body = text[start:marker.start()].strip()
+        if body:
+            turns.append(Turn(role, body))
+        role, start = ROLES[marker.group(1)], marker.end()
+    body = text[start:].strip()
+    if body:
+        turns.append(Turn(role, body))
+    return turns
+
+
+def reply_of(turns):
+    """
+    Returns:
+        str: The AI turns after the candidate's last turn, joined, or "" if the
+             transcript ends with the candidate
+    """
+    reply = []
+    for turn in reversed(turns):
+        if turn.role != "ai":
+            break
+        reply.append(turn.text)
+    return "\n\n".join(reversed(reply))
+
+
+def question_of(text):
+    """
+    Finds where the question starts in an AI turn
+
+    The question is the last paragraph that asks something; a paragraph that
+    opens with greetings or acknowledgements on lines of their own has those
+    lines left out. Without any "?" the last paragraph is taken, since
+    prompts like "Tell me about yourself." are questions too.
+
+    Returns:
+        str: The question
+    """
+    paragraphs = [p.strip() for p in re.split(r"\n\s*\n", text or "") if p.strip()]
+    if not paragraphs:
+        return ""
+    asking = [p for p in paragraphs if "?" in p]
+    paragraph = asking[-1] if asking else paragraphs[-1]
+    lines = [line.strip() for line in paragraph.split("\n") if line.strip()]
+    # Lead-in lines before the question line, e.g. "Welcome! I've read your resume."
+    first = 0
+    for index, line in enumerate(lines):
+        if "?" in line or index == len(lines) - 1:
+            first = index
+            break
+        if line.endswith(":"):
+            # "Consider this scenario:" introduces the question
+            first = index
+            break
+    return "\n".join(lines[first:])
+
+
+class TranscriptTracker:
+    """
+    Remembers how far each interview's transcript has been read
+
+    Args:
+        max_sessions (int): Interviews tracked; the least recently used are
+                            dropped and resynchronized on their next turn
+    """
+
+    def __init__(self, max_sessions=10000):
+        self.max_sessions = max_sessions
+        self._seen = OrderedDict()  # key -> (offset, anchor)
+        self._lock = threading.Lock()
+        self.resyncs = 0
+
+    def _remember(self, key, transcript):
+        anchor = transcript[max(0, len(transcript) - ANCHOR_LENGTH):]
+        with self._lock:
+            self._seen.pop(key, None)
+            self._seen[key] = (len(transcript), anchor)
+            while len(self._seen) > self.max_sessions:
+                self._seen.popitem(last=False)
+
+    def start(self, key, transcript):
+        """
+        Records the opening of an interview
+
+        Returns:
+            list: Turns of the opening
+        """
+        self._remember(key, transcript)
+        return parse_turns(transcript)
+
+    def advance(self, key, transcript):
+        """
+        Returns the turns added to a transcript since it was last seen
+
+        The new text is transcript[offset:] when the transcript still ends
+        the way it did at that offset. An interview this process has not
+        seen (started by another worker, evicted) or whose transcript was
+        rewritten is resynchronized from the candidate's last turn, found by
+        scanning backwards from the end.
+
+        Args:
+            key (str): Interview id
+            transcript (str): Full transcript returned by the upstream
+
+        Returns:
+            list: New Turn objects, normally the candidate's answer and the reply
+        """
+        with self._lock:
+            seen = self._seen.get(key)
+        new = None
+        if seen is not None:
+            offset, anchor = seen
+            if len(transcript) >= offset and transcript.startswith(anchor, offset - len(anchor)):
+                new = transcript[offset:]
+        if new is None:
+            self.resyncs += 1
+            new = transcript[last_candidate_marker(transcript):]
+        self._remember(key, transcript)
+        return parse_turns(new)
+
+    def forget(self, key):
+        with self._lock:
+            self._seen.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            return {"sessions": len(self._seen), "resyncs": self.resyncs}
+
+
+def last_candidate_marker(transcript):
+    """
+    Returns:
+        int: Offset of the last "**You:**" marker starting a line, or 0
+    """
+    end = len(transcript)
+    while True:
+        index = transcript.rfind("**You:**", 0, end)
+        if index < 0:
+            return 0
+        line_start = transcript.rfind("\n", 0, index) + 1
+        if not transcript[line_start:index].strip(" \t"):
+            return line_start
+        end = index
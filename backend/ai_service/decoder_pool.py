@@ -0,0 +1,247 @@
+"""
+Pool of ffmpeg decoders for uploaded audio
+An ffmpeg process is started, linked and has its codecs registered before
+any audio exists, and then sits blocked on stdin. A job takes one of these
+spare decoders, pipes the upload through it and leaves; a background thread
+starts a replacement. Process startup is thereby moved off the request path
+and happens at a steady rate instead of in bursts.
+
+Every ffmpeg doing work for a request holds a slot of the pool's
+StageLimiter: one-shot decodes for as long as they run, decoders checked
+out for streamed answers until they are checked back in. At most `size`
+run at once, a bounded number wait, and the rest are refused with a
+Retry-After estimate.
+
+With spares=0 every job starts its own ffmpeg, as before the pool existed;
+bench/decoder_bench.py compares the two.
+"""
+
+import logging
+import subprocess
+import threading
+import time
+from collections import deque
+
+from admission import StageLimiter
+
+logger = logging.getLogger(__name__)
+
+# Backoff between failed attempts to start a spare decoder
+SPAWN_RETRY_DELAY = 1.0
+SPAWN_RETRY_MAX_DELAY = 60.0
+
+
+class DecodeError(Exception):
+    """Raised when ffmpeg fails, exits early or exceeds the job timeout"""
+
+
+class DecoderPool:
+    """
+    Fixed pool of long-lived, pre-started ffmpeg decoders
+
+    Args:
+        command (list): ffmpeg command reading stdin and writing PCM to stdout
+        size (int): ffmpeg processes working at once, streamed answers included
+        spares (int): Decoders kept started and idle; 0 spawns one per job
+        max_queue (int): Jobs allowed to wait for a slot
+        queue_timeout (float): Longest wait for a slot
+        timeout (float): Seconds a single decode may take
+        max_idle (float): Spares older than this are replaced, so a spare
+                          never outlives a binary upgrade by long
+    """
+
+    def __init__(self, command, size, spares=None, max_queue=None, queue_timeout=10,
+                 timeout=15, max_idle=600):
+        self.command = list(command)
+        self.size = max(1, size)
+        self.spares = self.size if spares is None else max(0, spares)
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.limiter = StageLimiter("ffmpeg", self.size, max_queue=max_queue, queue_timeout=queue_timeout)
+        self._idle = deque()  # (process, started at)
+        self._leases = {}  # pid of a checked-out decoder -> limiter acquire() time
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+        self.warm_starts = 0
+        self.cold_starts = 0
+        self.failures = 0
+
+    # --------------------------------------------------------------------------
+    # Spares
+    # --------------------------------------------------------------------------
+    def _spawn(self):
+        return subprocess.Popen(
+            self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+
+    def _refill(self):
+        retry_delay = SPAWN_RETRY_DELAY
+        while True:
+            with self._cond:
+                if not self._running:
+                    return
+                stale = self._take_stale_locked()
+                if not stale and len(self._idle) >= self.spares:
+                    self._cond.wait(self.max_idle / 2)
+                    continue
+            for proc in stale:
+                _close(proc)
+            with self._cond:
+                if len(self._idle) >= self.spares:
+                    continue
+            try:
+                proc = self._spawn()
+            except OSError as e:
+                # Jobs spawn their own decoder meanwhile; keep trying in case
+                # the binary reappears or the process limit clears
+                logger.error(f"❌ Cannot start ffmpeg decoder, retrying in {retry_delay:.0f}s: {e}")
+                self._wait_running(retry_delay)
+                retry_delay = min(retry_delay * 2, SPAWN_RETRY_MAX_DELAY)
+                continue
+            retry_delay = SPAWN_RETRY_DELAY
+            with self._cond:
+                self._idle.append((proc, time.monotonic()))
+
+    def _wait_running(self, delay):
+        """Sleeps up to delay seconds, returning early if the pool is stopped"""
+        until = time.monotonic() + delay
+        with self._cond:
+            while self._running:
+                remaining = until - time.monotonic()
+                if remaining <= 0:
+                    return
+                self._cond.wait(remaining)
+
+    def _take_stale_locked(self):
+        cutoff = time.monotonic() - self.max_idle
+        stale = []
+        while self._idle and self._idle[0][1] < cutoff:
+            stale.append(self._idle.popleft()[0])
+        return stale
+
+    def start(self):
+        """Starts the spare decoders; call once per process, after forking"""
+        if self.spares == 0 or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._refill, name="decoder-pool", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stops refilling and closes idle decoders"""
+        with self._cond:
+            self._running = False
+            idle, self._idle = list(self._idle), deque()
+            self._cond.notify_all()
+        for proc, _ in idle:
+            _close(proc)
+
+    def _take(self):
+        """Pops a live spare, or spawns a decoder if none is idle"""
+        with self._cond:
+            while self._idle:
+                proc, _ = self._idle.popleft()
+                if proc.poll() is None:
+                    self._cond.notify()
+                    self.warm_starts += 1
+                    return proc
+                _close(proc)
+            self._cond.notify()
+            self.cold_starts += 1
+        return self._spawn()
+
+    # --------------------------------------------------------------------------
+    # Jobs
+    # --------------------------------------------------------------------------
+    def checkout(self, deadline=None, wait=True):
+        """
+        Takes a started decoder for the caller to drive, e.g. a streamed upload
+
+        The decoder holds a limiter slot until checkin().
+
+        Args:
+            deadline (float): As for decode()
+            wait (bool): False to return None at once when all slots are taken
+
+        Returns:
+            subprocess.Popen: ffmpeg with stdin, stdout and stderr pipes
+
+        Raises:
+            Overloaded: If no slot frees up in time
+        """
+        started = self.limiter.acquire(deadline, wait=wait)
+        if started is None:
+            return None
+        try:
+            proc = self._take()
+        except BaseException:
+            self.limiter.release(started, sample=False)
+            raise
+        with self._cond:
+            self._leases[proc.pid] = started
+        return proc
+
+    def checkin(self, proc):
+        """Returns the slot of a decoder from checkout(); safe to call twice"""
+        with self._cond:
+            started = self._leases.pop(proc.pid, None)
+        if started is not None:
+            self.limiter.release(started, sample=False)
+
+    def decode(self, data, deadline=None):
+        """
+        Decodes one upload
+
+        Args:
+            data (bytes): Encoded audio
+            deadline (float): time.monotonic() after which waiting for a slot is pointless
+
+        Returns:
+            bytes: Decoder output
+
+        Raises:
+            Overloaded: If no slot frees up in time
+            DecodeError: If ffmpeg fails or times out
+        """
+        with self.limiter.slot(deadline=deadline):
+            proc = self._take()
+            try:
+                out, err = proc.communicate(data, timeout=self.timeout)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.communicate()
+                self.failures += 1
+                raise DecodeError(f"ffmpeg timed out after {self.timeout:g}s")
+            if proc.returncode != 0:
+                self.failures += 1
+                raise DecodeError(err.decode(errors="replace").strip() or f"ffmpeg exited with {proc.returncode}")
+            return out
+
+    def stats(self):
+        with self._cond:
+            idle = len(self._idle)
+        return {
+            **self.limiter.stats(),
+            "spares": self.spares,
+            "idle": idle,
+            "checked_out": len(self._leases),
+            "warm_starts": self.warm_starts,
+            "cold_starts": self.cold_starts,
+            "failures": self.failures,
+        }
+
+
+def _close(proc):
+    """Ends an unused decoder: EOF on stdin makes ffmpeg exit on its own"""
+    try:
+        proc.stdin.close()
+    except OSError:
+        pass
+    try:
+        proc.wait(timeout=2)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+    for stream in (proc.stdout, proc.stderr):
+        stream.close()
@@ -0,0 +1,88 @@
+"""
+Production server configuration for the AI Interview Service
+
+    gunicorn -c gunicorn.conf.py
+
+The app is imported once in the master (ffmpeg lookup, STT model, cache
+indexes), then forked into AI_SERVICE_WORKERS processes that share those
+pages copy-on-write. Each worker starts its own background threads and
+Hugging Face clients after the fork.
+
+State shared between workers:
+    - Interview sessions: SESSION_STORE_URL (defaults to a local SQLite file
+      here, since memory:// is per process). The upstream session id is kept
+      with the interview, so any worker can continue it.
+    - TTS and resume caches: the directories on disk; a worker picks up
+      entries written by the others.
+    - Persisted turns (TURN_STORE_URL): each worker has its own write-ahead
+      file in TURN_WAL_DIR, and a new worker replays those of exited ones.
+
+State kept per worker (requests must reach the worker that created it):
+    - Streamed answer uploads (/api/answer-stream/*), pending speech streams
+      (/api/tts-stream/<id>) and background audio jobs (/api/audio-jobs/<id>).
+      A follow-up request landing on another worker gets 404, so with more
+      than one worker these modes default to off (ANSWER_STREAMS_ENABLED,
+      TTS_STREAMING_ENABLED, AUDIO_JOBS_ENABLED). Clients then upload whole
+      answers and get whole audio files. Set AI_SERVICE_STICKY_ROUTING=true
+      when a proxy pins each interview to one worker to keep them on.
+    - The generated audio quota: each worker accounts only for the files it
+      wrote, so AUDIO_STORE_MAX_BYTES defaults to 1 GiB / workers.
+    - /metrics, which reports only the worker that served the scrape. Scrape
+      every worker, or read totals from the access log.
+    - The keyword index. A push to /api/questions/index reaches one worker;
+      the others pick the change up on their next Supabase poll.
+    - Admission control and decoders: ADMISSION_<STAGE>_LIMIT, FFMPEG_WORKERS,
+      FFMPEG_SPARES, TENANT_RATE and INTERVIEW_RATE apply per worker, so
+      size them as totals / workers.
+
+Graceful reload: `kill -HUP <master pid>` starts new workers and lets the
+old ones finish in-flight requests for up to graceful_timeout seconds.
+Interviews continue on the new workers through the shared session store.
+"""
+
+import multiprocessing
+import os
+import tempfile
+
+# Must be set before the master imports the app (preload_app)
+os.environ.setdefault("AI_SERVICE_PREFORK", "true")
+
+workers = int(os.environ.get("AI_SERVICE_WORKERS", multiprocessing.cpu_count()))
+if workers > 1:
+    os.environ.setdefault(
+        "SESSION_STORE_URL",
+        f"sqlite:///{os.path.join(tempfile.gettempdir(), 'jobsupi_sessions.db')}"
+    )
+    os.environ.setdefault("AUDIO_STORE_MAX_BYTES", str(1024 * 1024 * 1024 // workers))
+    if os.environ.get("AI_SERVICE_STICKY_ROUTING", "false").lower() != "true":
+        for mode in ("ANSWER_STREAMS_ENABLED", "TTS_STREAMING_ENABLED", "AUDIO_JOBS_ENABLED"):
+            os.environ.setdefault(mode, "false")
+
+wsgi_app = "app:app"
+bind = f"0.0.0.0:{os.environ.get('AI_SERVICE_PORT', 5001)}"
+
+# Threads per worker: requests spend most of their time waiting on the
+# model, STT and TTS services
+worker_class = "gthread"
+threads = int(os.environ.get("AI_SERVICE_THREADS", 16))
+
+preload_app = True
+
+# A turn can take tens of seconds (model call + synthesis)
+timeout = int(os.environ.get("AI_SERVICE_TIMEOUT", 120))
+graceful_timeout = int(os.environ.get("AI_SERVICE_GRACEFUL_TIMEOUT", 120))
+keepalive = 5
+
+# Recycle workers now and then to bound memory growth
+max_requests = int(os.environ.get("AI_SERVICE_MAX_REQUESTS", 5000))
+max_requests_jitter = max_requests // 10
+
+accesslog = "-"
+errorlog = "-"
+
+
+def post_fork(server, worker):
+    import app
+
+    app.start_worker()
+    server.log.info(f"Worker {worker.pid} ready")
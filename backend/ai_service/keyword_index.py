@@ -0,0 +1,373 @@
+"""
+Multi-pattern index over the expected keywords of interview questions
+Keywords and answers are case-folded, tokenized and lightly stemmed, and all
+keywords are compiled into one Aho-Corasick automaton over tokens, so an
+answer is scanned once in O(length) however many keywords exist. Questions
+can be added, changed or removed one at a time; the automaton is rebuilt
+from the already normalized keywords and swapped in atomically.
+"""
+
+import logging
+import re
+import threading
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+
+# ==============================================================================
+# NORMALIZATION
+# ==============================================================================
+def stem(token):
+    """
+    Reduces an English word to a crude stem
+
+    Only needs to map inflections of a word to the same string (api/apis,
+    cache/caches/caching, query/queries); the stem itself need not be a word.
+    Short and non-alphabetic tokens (sql, c++, k8s) are kept as they are.
+    """
+    if len(token) <= 3 or not token.isalpha():
+        return token
+    if token.endswith(("ies", "ied")) and len(token) > 4:
+        token = token[:-3] + "y"
+    elif token.endswith("ing") and len(token) > 5:
+        token = token[:-3]
+        if len(token) > 3 and token[-1] == token[-2] and token[-1] not in "aeiouls":
+            token = token[:-1]
+    elif token.endswith("ed") and len(token) > 4:
+        token = token[:-2]
+        if len(token) > 3 and token[-1] == token[-2] and token[-1] not in "aeiouls":
+            token = token[:-1]
+    elif token.endswith("es") and token[:-2].endswith(("s", "x", "z", "ch", "sh")):
+        token = token[:-2]
+    elif token.endswith("s") and not token.endswith(("ss", "us", "sis")):
+        token = token[:-1]
+    if token.endswith("e") and len(token) > 3:
+        token = token[:-1]
+    return token
+
+
+def normalize(text):
+    """
+    Case-folds, tokenizes and stems text
+
+    Returns:
+        tuple: Stemmed tokens
+    """
+    return tuple(stem(token) for token in TOKEN_PATTERN.findall((text or "").casefold()))
+
+
+# ==============================================================================
+# AUTOMATON
+# ==============================================================================
+class Automaton:
+    """
+    Aho-Corasick automaton over token sequences
+
+    Args:
+        phrases (iterable): Normalized keyword token tuples
+    """
+
+    def __init__(self, phrases):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        for phrase in phrases:
+            node = 0
+            for token in phrase:
+                child = self._goto[node].get(token)
+                if child is None:
+                    child = len(self._goto)
+                    self._goto[node][token] = child
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                node = child
+            self._out[node] += (phrase,)
+        self._link()
+
+    def _link(self):
+        queue = list(self._goto[0].values())
+        for node in queue:
+            for token, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(token, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] += self._out[self._fail[child]]
+
+    def scan(self, tokens):
+        """
+        Finds every phrase occurring in a token sequence
+
+        Returns:
+            set: Phrases found
+        """
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set()
+        node = 0
+        for token in tokens:
+            while node and token not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(token, 0)
+            if out[node]:
+                found.update(out[node])
+        return found
+
+    def __len__(self):
+        return len(self._goto)
+
+
+class KeywordSet:
+    """
+    One compiled list of keywords, e.g. for a single question
+
+    Args:
+        keywords (iterable): Keywords as written by the question author
+    """
+
+    def __init__(self, keywords):
+        self._phrases = {}  # normalized phrase -> keyword as written
+        for keyword in keywords:
+            phrase = normalize(keyword)
+            if phrase and phrase not in self._phrases:
+                self._phrases[phrase] = keyword.strip()
+        self.keywords = list(self._phrases.values())
+        self._automaton = Automaton(self._phrases)
+
+    def match(self, tokens):
+        """
+        Args:
+            tokens (tuple): Output of normalize()
+
+        Returns:
+            tuple: (matched keywords, missing keywords), in keyword order
+        """
+        found = self._automaton.scan(tokens)
+        matched = [kw for phrase, kw in self._phrases.items() if phrase in found]
+        missing = [kw for phrase, kw in self._phrases.items() if phrase not in found]
+        return matched, missing
+
+
+# ==============================================================================
+# INDEX
+# ==============================================================================
+class KeywordIndex:
+    """
+    Keywords of all active questions in one automaton
+
+    Reads use an immutable snapshot and take no lock; writers build a new
+    question map and automaton and swap both in with one assignment.
+    """
+
+    def __init__(self):
+        # (automaton, phrase -> {question id: keyword},
+        #  question id -> {normalized phrase: keyword as written})
+        self._snapshot = (Automaton(()), {}, {})
+        self._lock = threading.Lock()  # serializes writers
+        self.version = 0
+
+    def _swap_locked(self, questions):
+        owners = {}
+        for question_id, phrases in questions.items():
+            for phrase, keyword in phrases.items():
+                owners.setdefault(phrase, {})[question_id] = keyword
+        self._snapshot = (Automaton(owners), owners, questions)
+        self.version += 1
+
+    @staticmethod
+    def _normalize_questions(upserts):
+        """Returns {question id: {phrase: keyword}}, None for questions to drop"""
+        normalized = {}
+        for question in upserts:
+            question_id = str(question["id"])
+            if question.get("is_active", True) is False:
+                normalized[question_id] = None
+                continue
+            phrases = {}
+            for keyword in question.get("expected_keywords") or ():
+                phrase = normalize(keyword)
+                if phrase:
+                    phrases.setdefault(phrase, keyword.strip())
+            normalized[question_id] = phrases or None
+        return normalized
+
+    def update(self, upserts=(), deletes=()):
+        """
+        Applies question changes
+
+        Args:
+            upserts (iterable): Question dicts with id, expected_keywords and
+                                optionally is_active (inactive ones are removed)
+            deletes (iterable): Question ids to remove
+
+        Returns:
+            int: Index version after the change
+        """
+        normalized = self._normalize_questions(upserts)
+        with self._lock:
+            questions = dict(self._snapshot[2])
+            for question_id in deletes:
+                questions.pop(str(question_id), None)
+            for question_id, phrases in normalized.items():
+                if phrases is None:
+                    questions.pop(question_id, None)
+                else:
+                    questions[question_id] = phrases
+            self._swap_locked(questions)
+            return self.version
+
+    def replace(self, questions):
+        """Replaces the whole index with a fresh list of questions"""
+        normalized = self._normalize_questions(questions)
+        with self._lock:
+            self._swap_locked({k: v for k, v in normalized.items() if v is not None})
+            return self.version
+
+    def match(self, text, question_id=None):
+        """
+        Finds expected keywords mentioned in text
+
+        Args:
+            text (str): Answer or transcript
+            question_id (str): Limit the result to one question
+
+        Returns:
+            dict: question id -> list of keywords found; with question_id,
+                  {"matched": [...], "missing": [...]} for that question
+        """
+        automaton, owners, questions = self._snapshot
+        found = automaton.scan(normalize(text))
+        if question_id is not None:
+            question_id = str(question_id)
+            expected = questions.get(question_id, {})
+            return {
+                "matched": [kw for phrase, kw in expected.items() if phrase in found],
+                "missing": [kw for phrase, kw in expected.items() if phrase not in found],
+            }
+        hits = {}
+        for phrase in found:
+            for owner, keyword in owners[phrase].items():
+                hits.setdefault(owner, []).append(keyword)
+        return hits
+
+    def questions(self):
+        """Returns the indexed questions as {id, expected_keywords} dicts"""
+        questions = self._snapshot[2]
+        return [
+            {"id": question_id, "expected_keywords": list(phrases.values())}
+            for question_id, phrases in questions.items()
+        ]
+
+    def stats(self):
+        automaton, owners, questions = self._snapshot
+        return {
+            "questions": len(questions),
+            "keywords": len(owners),
+            "states": len(automaton),
+            "version": self.version,
+        }
+
+
+# ==============================================================================
+# QUESTION SOURCE
+# ==============================================================================
+class SupabaseQuestionSource:
+    """
+    Reads questions from the Supabase REST API
+
+    Args:
+        url (str): SUPABASE_URL
+        key (str): SUPABASE_KEY
+        timeout (float): Request timeout in seconds
+    """
+
+    def __init__(self, url, key, timeout=10):
+        self.endpoint = f"{url.rstrip('/')}/rest/v1/questions"
+        self.timeout = timeout
+        self._session = requests.Session()
+        self._session.headers.update({"apikey": key, "Authorization": f"Bearer {key}"})
+
+    def fetch(self, updated_since=None):
+        """
+        Returns questions, optionally only those updated after a timestamp
+
+        Returns:
+            list: Question dicts with id, expected_keywords, is_active, updated_at
+        """
+        params = {"select": "id,expected_keywords,is_active,updated_at", "order": "updated_at.asc"}
+        if updated_since:
+            params["updated_at"] = f"gt.{updated_since}"
+        response = self._session.get(self.endpoint, params=params, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+
+class IndexRefresher:
+    """
+    Keeps a KeywordIndex in sync with a question source
+
+    Polls for questions updated since the last refresh; every full_every
+    polls the whole table is reloaded so deleted questions drop out too.
+
+    Args:
+        index (KeywordIndex): Index to maintain
+        source: Object with fetch(updated_since=None)
+        interval (float): Seconds between polls
+        full_every (int): Polls between full reloads
+    """
+
+    def __init__(self, index, source, interval=60, full_every=30):
+        self.index = index
+        self.source = source
+        self.interval = interval
+        self.full_every = full_every
+        self.last_updated = None
+        self._polls = 0
+        self._thread = None
+        self._stop = threading.Event()
+
+    def refresh(self, full=False):
+        """
+        Pulls changes from the source into the index
+
+        Returns:
+            int: Number of questions applied
+        """
+        questions = self.source.fetch(None if full else self.last_updated)
+        if full:
+            self.index.replace(questions)
+        elif questions:
+            self.index.update(questions)
+        stamps = [q["updated_at"] for q in questions if q.get("updated_at")]
+        if stamps:
+            self.last_updated = max(stamps + ([self.last_updated] if self.last_updated else []))
+        return len(questions)
+
+    def start(self):
+        """Loads the index and starts polling on a daemon thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        def run():
+            while True:
+                try:
+                    count = self.refresh(full=self._polls % self.full_every == 0)
+                    if count:
+                        logger.info(f"Keyword index refreshed: {count} questions, {self.index.stats()}")
+                except Exception as e:
+                    logger.warning(f"⚠️ Keyword index refresh failed: {e}")
+                self._polls += 1
+                if self._stop.wait(self.interval):
+                    return
+
+        self._thread = threading.Thread(target=run, name="keyword-index", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
@@ -0,0 +1,212 @@
+"""
+Resume cache keyed by file hash
+Each distinct resume is stored once and parsed once; its extracted text,
+derived features and the references under which upstream model servers
+already hold the file are reused when the same PDF is uploaded again
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from text_features import derive_features
+
+logger = logging.getLogger(__name__)
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # Text extraction is optional
+    PdfReader = None
+
+
+def extract_text(path):
+    """
+    Extracts plain text from a PDF
+
+    Returns:
+        str: Extracted text, or "" if extraction is unavailable or fails
+    """
+    if PdfReader is None:
+        return ""
+    try:
+        reader = PdfReader(path)
+        return "\n".join(page.extract_text() or "" for page in reader.pages).strip()
+    except Exception as e:
+        logger.warning(f"⚠️ Could not extract resume text: {e}")
+        return ""
+
+
+class ResumeEntry:
+    """
+    A cached resume: stored PDF path, extracted text and features, and the
+    upstream file references by upstream (see ResumeCache.set_remote)
+    """
+
+    def __init__(self, file_hash, path, text, features, remote=None):
+        self.file_hash = file_hash
+        self.path = path
+        self.text = text
+        self.features = features
+        self.remote = remote or {}
+
+
+class ResumeCache:
+    """
+    LRU cache of resumes on disk
+
+    Args:
+        directory (str): Where PDFs and their extracted data are kept
+        max_entries (int): Maximum number of resumes kept
+        max_bytes (int): Maximum total size of stored PDFs
+        min_age (float): Entries used more recently than this are never evicted,
+            so a file is not removed while a start is still uploading it
+    """
+
+    def __init__(self, directory, max_entries=2000, max_bytes=512 * 1024 * 1024, min_age=300):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.min_age = min_age
+        self._entries = OrderedDict()  # hash -> (size, last_used)
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        os.makedirs(self.directory, exist_ok=True)
+        self._load()
+
+    def _pdf_path(self, file_hash):
+        return os.path.join(self.directory, f"{file_hash}.pdf")
+
+    def _meta_path(self, file_hash):
+        return os.path.join(self.directory, f"{file_hash}.json")
+
+    def _write_meta(self, file_hash, meta):
+        temp_meta = f"{self._meta_path(file_hash)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_meta, "w") as f:
+            json.dump(meta, f)
+        os.replace(temp_meta, self._meta_path(file_hash))
+
+    def _load(self):
+        """Rebuild the LRU index from entries already on disk"""
+        found = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".pdf"):
+                continue
+            file_hash = name[:-4]
+            if not os.path.exists(self._meta_path(file_hash)):
+                continue
+            stat = os.stat(os.path.join(self.directory, name))
+            found.append((stat.st_mtime, file_hash, stat.st_size))
+        for mtime, file_hash, size in sorted(found):
+            self._entries[file_hash] = (size, mtime)
+            self._total_bytes += size
+        logger.info(f"Resume cache loaded: {len(self._entries)} resumes")
+
+    def get_or_add(self, data):
+        """
+        Returns the cache entry for a resume, storing and parsing it on first sight
+
+        Args:
+            data (bytes): Uploaded PDF contents
+
+        Returns:
+            ResumeEntry: Stored resume with its extracted text and features
+        """
+        file_hash = hashlib.sha256(data).hexdigest()
+        path = self._pdf_path(file_hash)
+        now = time.time()
+
+        with self._lock:
+            known = file_hash in self._entries
+            if known:
+                self._entries[file_hash] = (self._entries[file_hash][0], now)
+                self._entries.move_to_end(file_hash)
+        if not known and os.path.exists(self._meta_path(file_hash)):
+            # Stored by another worker process sharing the directory
+            known = True
+            with self._lock:
+                if file_hash not in self._entries:
+                    self._entries[file_hash] = (len(data), now)
+                    self._total_bytes += len(data)
+
+        if known:
+            try:
+                with open(self._meta_path(file_hash)) as f:
+                    meta = json.load(f)
+                os.utime(path, None)
+                with self._lock:
+                    self._hits += 1
+                logger.info(f"✅ Resume cache hit: {file_hash[:12]}")
+                return ResumeEntry(file_hash, path, meta["text"], meta["features"], meta.get("remote"))
+            except (OSError, ValueError, KeyError):
+                logger.warning(f"⚠️ Resume cache entry {file_hash[:12]} unreadable, rebuilding")
+
+        with self._lock:
+            self._misses += 1
+        # Written under a temporary name, so a PDF on disk is always complete
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+        text = extract_text(path)
+        features = derive_features(text)
+        self._write_meta(file_hash, {"text": text, "features": features, "remote": {}})
+
+        with self._lock:
+            if file_hash in self._entries:
+                self._total_bytes -= self._entries.pop(file_hash)[0]
+            self._entries[file_hash] = (len(data), now)
+            self._total_bytes += len(data)
+            self._evict_locked(now)
+        logger.info(f"Resume cached: {file_hash[:12]} ({features['word_count']} words)")
+        return ResumeEntry(file_hash, path, text, features)
+
+    def set_remote(self, entry, upstream, reference):
+        """
+        Records where an upstream holds its copy of a resume, so repeats can
+        pass the reference instead of uploading the file again
+
+        Args:
+            entry (ResumeEntry): From get_or_add()
+            upstream (str): Upstream the file was uploaded to
+            reference (str): The upstream's reference to the file, or None to
+                             forget it (e.g. after the upstream dropped the file)
+        """
+        if reference is None:
+            entry.remote.pop(upstream, None)
+        else:
+            entry.remote[upstream] = reference
+        try:
+            self._write_meta(entry.file_hash, {"text": entry.text, "features": entry.features, "remote": entry.remote})
+        except OSError as e:
+            logger.warning(f"⚠️ Could not update resume cache entry {entry.file_hash[:12]}: {e}")
+
+    def _evict_locked(self, now):
+        """Drop least recently used resumes until within budget. Caller holds the lock."""
+        for file_hash, (size, last_used) in list(self._entries.items()):
+            if self._total_bytes <= self.max_bytes and len(self._entries) <= self.max_entries:
+                break
+            if now - last_used < self.min_age:
+                break
+            del self._entries[file_hash]
+            self._total_bytes -= size
+            for path in (self._pdf_path(file_hash), self._meta_path(file_hash)):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+            }
@@ -0,0 +1,242 @@
+"""
+Interview scoring engine
+Applies the rules of the Node service's completeInterview (start at 5, +2 for
+a detailed answer, +1 for thinking time, capped at 10) plus coverage of each
+question's expected keywords. Keyword sets are compiled once and reused, so
+re-scoring thousands of interviews after a rubric change is a tight loop.
+Keyword matching is shared with the live keyword index (keyword_index.py), so
+"caching" counts for "cache" in both.
+"""
+
+import functools
+
+from keyword_index import KeywordSet, normalize
+
+
+class Rubric:
+    """
+    Scoring weights and thresholds
+
+    Any field can be overridden by keyword, e.g. Rubric(detailed_bonus=3).
+    """
+
+    DEFAULTS = {
+        "base": 5,
+        "max_score": 10,
+        "detailed_min_chars": 100,
+        "detailed_bonus": 2,
+        "thinking_min_seconds": 60,
+        "thinking_bonus": 1,
+        "short_max_chars": 20,
+        # Keyword coverage: full bonus at or above the ratio, partial for any hit
+        "keyword_full_ratio": 0.5,
+        "keyword_full_bonus": 2,
+        "keyword_partial_bonus": 1,
+    }
+
+    def __init__(self, **overrides):
+        unknown = set(overrides) - set(self.DEFAULTS)
+        if unknown:
+            raise ValueError(f"Unknown rubric fields: {', '.join(sorted(unknown))}")
+        for name, default in self.DEFAULTS.items():
+            setattr(self, name, type(default)(overrides.get(name, default)))
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.DEFAULTS}
+
+
+@functools.lru_cache(maxsize=4096)
+def compile_keywords(keywords):
+    """
+    Returns a cached matcher for a keyword set
+
+    Args:
+        keywords (tuple): Expected keywords
+
+    Returns:
+        KeywordSet: Shared compiled matcher
+    """
+    return KeywordSet(keywords)
+
+
+def index_questions(questions):
+    """
+    Maps question ids and positions to their expected keywords
+
+    Args:
+        questions (list): Dicts with expected_keywords (or expectedKeywords)
+                          and optionally id
+
+    Returns:
+        dict: id or index -> tuple of keywords
+    """
+    index = {}
+    for position, question in enumerate(questions or []):
+        keywords = tuple(question.get("expected_keywords") or question.get("expectedKeywords") or ())
+        index[position] = keywords
+        if question.get("id") is not None:
+            index[str(question["id"])] = keywords
+    return index
+
+
+def _answer_keywords(answer, position, question_index, default_keywords):
+    if answer.get("question_id") is not None and str(answer["question_id"]) in question_index:
+        return question_index[str(answer["question_id"])]
+    key = answer.get("question_index", position)
+    try:
+        return question_index.get(int(key), default_keywords)
+    except (TypeError, ValueError):
+        return default_keywords
+
+
+def validate_keywords(keywords, where="expected_keywords"):
+    """
+    Checks a keyword list is a list of strings
+
+    Raises:
+        ValueError: If it is not
+    """
+    if keywords is None:
+        return
+    if not isinstance(keywords, list) or not all(isinstance(k, str) for k in keywords):
+        raise ValueError(f"{where} must be a list of strings")
+
+
+def validate_answers(answers, where="answers"):
+    """
+    Checks answers have the shape score_interview() expects
+
+    Raises:
+        ValueError: Naming the first malformed field
+    """
+    if answers is None:
+        return
+    if not isinstance(answers, list):
+        raise ValueError(f"{where} must be a list")
+    for position, answer in enumerate(answers):
+        if not answer:
+            continue
+        if not isinstance(answer, dict):
+            raise ValueError(f"{where}[{position}] must be an object")
+        if not isinstance(answer.get("answer") or "", str):
+            raise ValueError(f"{where}[{position}].answer must be a string")
+        duration = answer.get("duration")
+        if duration is not None and (isinstance(duration, bool) or not isinstance(duration, (int, float))):
+            raise ValueError(f"{where}[{position}].duration must be a number of seconds")
+
+
+def validate_batch(interviews, questions=None):
+    """
+    Checks a score_interviews() batch before any of it is scored
+
+    Raises:
+        ValueError: Naming the first malformed field
+    """
+    if not isinstance(interviews, list):
+        raise ValueError("interviews must be a list")
+    for position, interview in enumerate(interviews):
+        if not isinstance(interview, dict):
+            raise ValueError(f"interviews[{position}] must be an object")
+        validate_answers(interview.get("answers"), f"interviews[{position}].answers")
+    if questions is None:
+        return
+    if not isinstance(questions, list):
+        raise ValueError("questions must be a list")
+    for position, question in enumerate(questions):
+        if not isinstance(question, dict):
+            raise ValueError(f"questions[{position}] must be an object")
+        validate_keywords(question.get("expected_keywords") or question.get("expectedKeywords"),
+                           f"questions[{position}].expected_keywords")
+
+
+def session_answers(turns):
+    """
+    Returns the candidate's answers of a stored session in score_interview form
+
+    Args:
+        turns (list): Session turns as built by session_store.make_turn
+    """
+    return [{"answer": turn["text"]} for turn in turns if turn["role"] == "candidate"]
+
+
+def score_interview(answers, question_index=None, rubric=None, default_keywords=()):
+    """
+    Scores one interview
+
+    Args:
+        answers (list): Dicts with answer, duration and question_index or question_id
+        question_index (dict): From index_questions()
+        rubric (Rubric): Weights; defaults to Rubric()
+        default_keywords (tuple): Keywords for answers whose question has none listed
+
+    Returns:
+        dict: score, strengths, weaknesses, missing_keywords and per-answer details
+    """
+    rubric = rubric or Rubric()
+    question_index = question_index or {}
+    score = rubric.base
+    strengths, weaknesses, missing_keywords, details = [], [], [], []
+
+    for position, answer in enumerate(answers or []):
+        if not answer:
+            continue
+        text = answer.get("answer") or ""
+        bonus = 0
+        if len(text) > rubric.detailed_min_chars:
+            bonus += rubric.detailed_bonus
+            strengths.append("Detailed answers provided")
+        if (answer.get("duration") or 0) > rubric.thinking_min_seconds:
+            bonus += rubric.thinking_bonus
+            strengths.append("Good thinking time")
+        if len(text) < rubric.short_max_chars:
+            weaknesses.append("Short or unclear answers")
+
+        keywords = _answer_keywords(answer, position, question_index, tuple(default_keywords))
+        matched, missing = compile_keywords(keywords).match(normalize(text)) if keywords else ([], [])
+        coverage = len(matched) / (len(matched) + len(missing)) if keywords and (matched or missing) else None
+        if coverage is not None:
+            if coverage >= rubric.keyword_full_ratio:
+                bonus += rubric.keyword_full_bonus
+                strengths.append("Covered expected topics")
+            elif matched:
+                bonus += rubric.keyword_partial_bonus
+            else:
+                weaknesses.append("Missed expected topics")
+            missing_keywords.extend(missing)
+
+        score += bonus
+        details.append({
+            "question_index": answer.get("question_index", position),
+            "score": min(rubric.base + bonus, rubric.max_score),
+            "matched_keywords": matched,
+            "missing_keywords": missing,
+            "keyword_coverage": coverage,
+        })
+
+    return {
+        "score": min(score, rubric.max_score),
+        "strengths": list(dict.fromkeys(strengths)),
+        "weaknesses": list(dict.fromkeys(weaknesses)),
+        "missing_keywords": list(dict.fromkeys(missing_keywords)),
+        "answers": details,
+    }
+
+
+def score_interviews(interviews, questions=None, rubric=None):
+    """
+    Scores many interviews against one question set
+
+    Args:
+        interviews (list): Dicts with id and answers
+        questions (list): Question dicts, see index_questions()
+        rubric (Rubric): Weights; defaults to Rubric()
+
+    Returns:
+        list: One result per interview, with its id
+    """
+    rubric = rubric or Rubric()
+    question_index = index_questions(questions)
+    return [
+        {"id": interview.get("id"), **score_interview(interview.get("answers"), question_index, rubric)}
+        for interview in interviews
+    ]
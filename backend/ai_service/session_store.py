@@ -0,0 +1,275 @@
+"""
+Server-side interview session store
+Keeps each interview's turns as a structured list keyed by interview_id,
+so clients no longer resend the whole conversation on every response
+
+Backends are selected with a URL:
+    memory://                  - In-process dictionary (default)
+    sqlite:///path/to/file.db  - Local SQLite file, shared by processes on one host
+    redis://host:6379/0        - Redis or any Redis-compatible server
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def make_turn(role, text):
+    """
+    Builds a turn record
+
+    Args:
+        role (str): "ai" or "candidate"
+        text (str): What was said
+
+    Returns:
+        dict: Turn record
+    """
+    return {"role": role, "text": text, "ts": time.time()}
+
+
+class SessionStore:
+    """
+    Interface shared by all session store backends
+
+    A session is a dict with interview_id, turns (list of turn records),
+    meta (free-form dict) and created_at/updated_at timestamps.
+    """
+
+    def create(self, interview_id, turns=None, meta=None):
+        raise NotImplementedError
+
+    def get(self, interview_id):
+        """Returns the session dict, or None if it does not exist"""
+        raise NotImplementedError
+
+    def append_turns(self, interview_id, turns):
+        """Appends turns and returns the index of the first appended turn, or None if unknown"""
+        raise NotImplementedError
+
+    def delete(self, interview_id):
+        raise NotImplementedError
+
+
+class InMemorySessionStore(SessionStore):
+    """Dictionary-backed store with idle expiry"""
+
+    def __init__(self, ttl_seconds=4 * 3600):
+        self.ttl_seconds = ttl_seconds
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def _expire_locked(self, now):
+        expired = [k for k, v in self._sessions.items() if now - v["updated_at"] > self.ttl_seconds]
+        for key in expired:
+            del self._sessions[key]
+
+    def create(self, interview_id, turns=None, meta=None):
+        now = time.time()
+        with self._lock:
+            self._expire_locked(now)
+            self._sessions[interview_id] = {
+                "interview_id": interview_id,
+                "turns": list(turns or []),
+                "meta": dict(meta or {}),
+                "created_at": now,
+                "updated_at": now,
+            }
+
+    def get(self, interview_id):
+        with self._lock:
+            session = self._sessions.get(interview_id)
+            if session is None:
+                return None
+            return {**session, "turns": list(session["turns"]), "meta": dict(session["meta"])}
+
+    def append_turns(self, interview_id, turns):
+        with self._lock:
+            session = self._sessions.get(interview_id)
+            if session is None:
+                return None
+            start = len(session["turns"])
+            session["turns"].extend(turns)
+            session["updated_at"] = time.time()
+            return start
+
+    def delete(self, interview_id):
+        with self._lock:
+            self._sessions.pop(interview_id, None)
+
+
+class SQLiteSessionStore(SessionStore):
+    """SQLite-backed store; turns are rows, so appends never rewrite history"""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        conn = self._conn()
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS sessions (
+                interview_id TEXT PRIMARY KEY,
+                meta TEXT NOT NULL DEFAULT '{}',
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS session_turns (
+                interview_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                turn TEXT NOT NULL,
+                PRIMARY KEY (interview_id, seq)
+            );
+        """)
+        conn.commit()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        # Connections must not cross a fork; a prefork worker opens its own
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def create(self, interview_id, turns=None, meta=None):
+        now = time.time()
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM session_turns WHERE interview_id = ?", (interview_id,))
+            conn.execute(
+                "INSERT OR REPLACE INTO sessions (interview_id, meta, created_at, updated_at) VALUES (?, ?, ?, ?)",
+                (interview_id, json.dumps(meta or {}), now, now)
+            )
+            conn.executemany(
+                "INSERT INTO session_turns (interview_id, seq, turn) VALUES (?, ?, ?)",
+                [(interview_id, i, json.dumps(t)) for i, t in enumerate(turns or [])]
+            )
+
+    def get(self, interview_id):
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT meta, created_at, updated_at FROM sessions WHERE interview_id = ?", (interview_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        turns = [json.loads(t) for (t,) in conn.execute(
+            "SELECT turn FROM session_turns WHERE interview_id = ? ORDER BY seq", (interview_id,)
+        )]
+        return {
+            "interview_id": interview_id,
+            "turns": turns,
+            "meta": json.loads(row[0]),
+            "created_at": row[1],
+            "updated_at": row[2],
+        }
+
+    def append_turns(self, interview_id, turns):
+        conn = self._conn()
+        with conn:
+            # BEGIN IMMEDIATE serializes concurrent appenders across processes
+            conn.execute("BEGIN IMMEDIATE")
+            exists = conn.execute(
+                "SELECT 1 FROM sessions WHERE interview_id = ?", (interview_id,)
+            ).fetchone()
+            if not exists:
+                return None
+            (start,) = conn.execute(
+                "SELECT COUNT(*) FROM session_turns WHERE interview_id = ?", (interview_id,)
+            ).fetchone()
+            conn.executemany(
+                "INSERT INTO session_turns (interview_id, seq, turn) VALUES (?, ?, ?)",
+                [(interview_id, start + i, json.dumps(t)) for i, t in enumerate(turns)]
+            )
+            conn.execute(
+                "UPDATE sessions SET updated_at = ? WHERE interview_id = ?", (time.time(), interview_id)
+            )
+            return start
+
+    def delete(self, interview_id):
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM session_turns WHERE interview_id = ?", (interview_id,))
+            conn.execute("DELETE FROM sessions WHERE interview_id = ?", (interview_id,))
+
+
+class RedisSessionStore(SessionStore):
+    """Redis-backed store; turns live in a list, meta in a hash"""
+
+    def __init__(self, url, ttl_seconds=4 * 3600):
+        import redis
+        self._redis = redis.Redis.from_url(url)
+        self.ttl_seconds = ttl_seconds
+
+    def _keys(self, interview_id):
+        return f"interview:{interview_id}:meta", f"interview:{interview_id}:turns"
+
+    def create(self, interview_id, turns=None, meta=None):
+        meta_key, turns_key = self._keys(interview_id)
+        now = time.time()
+        pipe = self._redis.pipeline()
+        pipe.delete(meta_key, turns_key)
+        pipe.hset(meta_key, mapping={
+            "meta": json.dumps(meta or {}),
+            "created_at": now,
+            "updated_at": now,
+        })
+        if turns:
+            pipe.rpush(turns_key, *[json.dumps(t) for t in turns])
+        pipe.expire(meta_key, self.ttl_seconds)
+        pipe.expire(turns_key, self.ttl_seconds)
+        pipe.execute()
+
+    def get(self, interview_id):
+        meta_key, turns_key = self._keys(interview_id)
+        pipe = self._redis.pipeline()
+        pipe.hgetall(meta_key)
+        pipe.lrange(turns_key, 0, -1)
+        header, turns = pipe.execute()
+        if not header:
+            return None
+        return {
+            "interview_id": interview_id,
+            "turns": [json.loads(t) for t in turns],
+            "meta": json.loads(header[b"meta"]),
+            "created_at": float(header[b"created_at"]),
+            "updated_at": float(header[b"updated_at"]),
+        }
+
+    def append_turns(self, interview_id, turns):
+        meta_key, turns_key = self._keys(interview_id)
+        if not self._redis.exists(meta_key):
+            return None
+        pipe = self._redis.pipeline()
+        pipe.rpush(turns_key, *[json.dumps(t) for t in turns])
+        pipe.hset(meta_key, "updated_at", time.time())
+        pipe.expire(meta_key, self.ttl_seconds)
+        pipe.expire(turns_key, self.ttl_seconds)
+        length = pipe.execute()[0]
+        return length - len(turns)
+
+    def delete(self, interview_id):
+        self._redis.delete(*self._keys(interview_id))
+
+
+def create_session_store(url):
+    """
+    Builds a session store from a URL
+
+    Args:
+        url (str): memory://, sqlite:///path or redis://...
+
+    Returns:
+        SessionStore: Configured store
+    """
+    if url.startswith("memory://"):
+        return InMemorySessionStore()
+    if url.startswith("sqlite:///"):
+        return SQLiteSessionStore(url[len("sqlite:///"):])
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisSessionStore(url)
+    raise ValueError(f"Unsupported session store URL: {url}")
@@ -0,0 +1,183 @@
+"""
+Speech-to-text backends for the AI Interview Service
+The backend is chosen per deployment with the STT_BACKEND setting:
+    google - Google Web Speech API (network, default)
+    vosk   - Local offline Vosk recognizer, loaded once and kept warm
+    http   - Any HTTP service accepting WAV, FLAC or PCM and answering {"text": ...}
+             (self-hosted recognizers, or the benchmark stand-in)
+"""
+
+import json
+import logging
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+
+class TranscriptionError(Exception):
+    """Raised when a backend fails for reasons other than unintelligible audio"""
+
+
+class NoSpeechError(Exception):
+    """Raised when the audio contains no recognizable speech"""
+
+
+class STTBackend:
+    """
+    Base class for speech-to-text engines
+
+    transcribe() takes an sr.AudioData and returns the recognized text, raises
+    NoSpeechError when the audio contains no recognizable speech, and
+    TranscriptionError for any engine or network failure. Engines are
+    imported on first use, so building a backend is cheap.
+    """
+
+    name = "base"
+
+    def transcribe(self, audio_data):
+        raise NotImplementedError
+
+    def warm_up(self):
+        """Loads models or opens connections ahead of the first request"""
+
+
+class GoogleSTTBackend(STTBackend):
+    """Google Web Speech API via SpeechRecognition"""
+
+    name = "google"
+
+    def __init__(self, language="en-US", key=None):
+        self.language = language
+        self.key = key
+        self._recognizer = None
+
+    def warm_up(self):
+        if self._recognizer is None:
+            import speech_recognition as sr
+            self._recognizer = sr.Recognizer()
+
+    def transcribe(self, audio_data):
+        import speech_recognition as sr
+
+        self.warm_up()
+        try:
+            return self._recognizer.recognize_google(audio_data, key=self.key, language=self.language)
+        except sr.UnknownValueError as e:
+            raise NoSpeechError() from e
+        except sr.RequestError as e:
+            raise TranscriptionError(f"Google Speech Recognition request failed: {e}") from e
+
+
+class VoskSTTBackend(STTBackend):
+    """Offline Kaldi-based recognizer running in-process on CPU"""
+
+    name = "vosk"
+    sample_rate = 16000
+
+    def __init__(self, model_path):
+        self.model_path = model_path
+        self._model = None
+
+    def warm_up(self):
+        if self._model is None:
+            from vosk import Model, SetLogLevel
+            SetLogLevel(-1)
+            logger.info(f"Loading Vosk model from {self.model_path}...")
+            self._model = Model(self.model_path)
+            logger.info("✅ Vosk model loaded")
+
+    def transcribe(self, audio_data):
+        from vosk import KaldiRecognizer
+
+        try:
+            self.warm_up()
+            # The model is shared; recognizers are cheap and not thread-safe
+            recognizer = KaldiRecognizer(self._model, self.sample_rate)
+            recognizer.AcceptWaveform(
+                audio_data.get_raw_data(convert_rate=self.sample_rate, convert_width=2)
+            )
+            text = json.loads(recognizer.FinalResult()).get("text", "").strip()
+        except Exception as e:
+            raise TranscriptionError(f"Vosk recognition failed: {e}") from e
+
+        if not text:
+            raise NoSpeechError()
+        return text
+
+
+class HTTPSTTBackend(STTBackend):
+    """
+    Posts audio to an HTTP recognizer
+
+    audio_format picks the request body: wav (default), flac (about half the
+    bytes) or pcm (raw little-endian 16-bit mono, no container at all).
+    """
+
+    name = "http"
+    FORMATS = ("wav", "flac", "pcm")
+
+    def __init__(self, url, timeout=15, audio_format="wav"):
+        if audio_format not in self.FORMATS:
+            raise ValueError(f"Unknown STT audio format '{audio_format}'. Available: {', '.join(self.FORMATS)}")
+        self.url = url
+        self.timeout = timeout
+        self.audio_format = audio_format
+        self._session = requests.Session()
+
+    def _encode(self, audio_data):
+        """Returns (body, content type) for the configured format"""
+        if self.audio_format == "flac":
+            return audio_data.get_flac_data(), "audio/flac"
+        if self.audio_format == "pcm":
+            return (
+                audio_data.get_raw_data(convert_width=2),
+                f"audio/L16; rate={audio_data.sample_rate}; channels=1; endianness=little-endian"
+            )
+        return audio_data.get_wav_data(), "audio/wav"
+
+    def transcribe(self, audio_data):
+        try:
+            body, content_type = self._encode(audio_data)
+            response = self._session.post(
+                self.url,
+                data=body,
+                headers={"Content-Type": content_type},
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+            text = (response.json().get("text") or "").strip()
+        except (requests.RequestException, ValueError, OSError) as e:
+            # OSError: no FLAC encoder available to SpeechRecognition
+            raise TranscriptionError(f"HTTP recognizer at {self.url} failed: {e}") from e
+
+        if not text:
+            raise NoSpeechError()
+        return text
+
+
+STT_BACKENDS = {
+    GoogleSTTBackend.name: GoogleSTTBackend,
+    VoskSTTBackend.name: VoskSTTBackend,
+    HTTPSTTBackend.name: HTTPSTTBackend,
+}
+
+
+def create_stt_backend(name, warm_up=True, **options):
+    """
+    Builds and optionally warms up a speech-to-text backend
+
+    Args:
+        name (str): Backend name, one of STT_BACKENDS
+        warm_up (bool): Load models now; otherwise on warm_up() or first use
+        **options: Backend constructor arguments
+
+    Returns:
+        STTBackend: Ready-to-use backend
+    """
+    if name not in STT_BACKENDS:
+        raise ValueError(f"Unknown STT backend '{name}'. Available: {', '.join(STT_BACKENDS)}")
+    backend = STT_BACKENDS[name](**options)
+    if warm_up:
+        backend.warm_up()
+    return backend
@@ -0,0 +1,98 @@
+"""
+Local stand-ins for the speech services used by the AI Interview Service
+    POST /stt  - accepts WAV, answers {"text": ...}      (STT_BACKEND=http)
+    POST /tts  - accepts {"text", "lang"}, answers MP3   (TTS_BACKEND=http)
+
+Latency and failure rate are configurable per service:
+
+    python stubs/fake_services.py --port 8765 --stt-latency-ms 300 --tts-latency-ms 200
+"""
+
+import argparse
+import json
+import random
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ANSWERS = [
+    "I have six years of backend experience with Python and Node.js.",
+    "I led a small team that migrated our monolith to microservices.",
+    "I usually start by reproducing the problem and adding monitoring.",
+    "We resolved it by agreeing on measurable criteria before deciding.",
+    "I would like to grow into a technical leadership role.",
+]
+
+# One silent MPEG-1 Layer III frame (128 kbps, 44.1 kHz); enough for clients to accept the file
+SILENT_MP3_FRAME = bytes.fromhex("fffb9064") + bytes(413)
+
+
+class Profile:
+    """Latency/failure profile of one fake endpoint"""
+
+    def __init__(self, latency_ms=0.0, jitter_ms=0.0, failure_rate=0.0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.failure_rate = failure_rate
+
+    def apply(self):
+        """Sleeps for the configured latency; returns False if this call should fail"""
+        time.sleep((self.latency_ms + random.uniform(0, self.jitter_ms)) / 1000)
+        return random.random() >= self.failure_rate
+
+
+def make_handler(stt_profile, tts_profile):
+    """Builds a request handler bound to the given profiles"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _reply(self, status, body, content_type):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if self.path == "/stt":
+                if not stt_profile.apply():
+                    return self._reply(503, b'{"error": "simulated failure"}', "application/json")
+                text = random.choice(ANSWERS) if body else ""
+                return self._reply(200, json.dumps({"text": text}).encode(), "application/json")
+            if self.path == "/tts":
+                if not tts_profile.apply():
+                    return self._reply(503, b'{"error": "simulated failure"}', "application/json")
+                text = json.loads(body or b"{}").get("text", "")
+                # Roughly one frame per word, like real speech length scales with text
+                frames = max(1, len(text.split()))
+                return self._reply(200, SILENT_MP3_FRAME * frames, "audio/mpeg")
+            self._reply(404, b'{"error": "not found"}', "application/json")
+
+    return Handler
+
+
+def serve(port, stt_profile, tts_profile):
+    """Runs the fake services until interrupted"""
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(stt_profile, tts_profile))
+    server.daemon_threads = True
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    for service in ("stt", "tts"):
+        parser.add_argument(f"--{service}-latency-ms", type=float, default=0)
+        parser.add_argument(f"--{service}-jitter-ms", type=float, default=0)
+        parser.add_argument(f"--{service}-failure-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    serve(
+        args.port,
+        Profile(args.stt_latency_ms, args.stt_jitter_ms, args.stt_failure_rate),
+        Profile(args.tts_latency_ms, args.tts_jitter_ms, args.tts_failure_rate),
+    )
@@ -0,0 +1,88 @@
+"""
+Local stand-in for the ahmedatk/ai_interviewer Hugging Face space
+Exposes the same API names with configurable latency and failure rate,
+so the service can be exercised offline (requires `pip install gradio`):
+
+    python stubs/gradio_stub.py --port 7860 --latency-ms 800 --failure-rate 0.1
+    HF_SPACE=http://127.0.0.1:7860 python app.py
+"""
+
+import argparse
+import random
+import time
+
+import gradio as gr
+
+QUESTIONS = [
+    "Tell me about yourself and your professional background.",
+    "What is a project you are particularly proud of, and why?",
+    "Describe a difficult technical problem you solved recently.",
+    "How do you handle disagreements within your team?",
+    "Where do you see yourself in the next few years?",
+]
+
+
+def build_demo(latency_ms=0, jitter_ms=0, failure_rate=0.0):
+    """
+    Builds a Gradio app mimicking the upstream interviewer
+
+    Args:
+        latency_ms (float): Base delay added to every call
+        jitter_ms (float): Extra uniformly distributed delay
+        failure_rate (float): Probability (0-1) that a call raises
+
+    Returns:
+        gr.Blocks: The stub app
+    """
+
+    def simulate():
+        time.sleep((latency_ms + random.uniform(0, jitter_ms)) / 1000)
+        if random.random() < failure_rate:
+            raise gr.Error("Simulated upstream failure")
+
+    def start_interview(resume, job_desc, state):
+        simulate()
+        opening = (
+            f"**AI:** Welcome! I've read your resume for the role: {(job_desc or '')[:60]}.\n"
+            f"{QUESTIONS[0]}"
+        )
+        state = {"transcript": opening, "turn": 1}
+        return opening, state
+
+    def handle_response(response, state):
+        simulate()
+        state = state or {"transcript": "", "turn": 1}
+        question = QUESTIONS[state["turn"] % len(QUESTIONS)]
+        state["transcript"] += f"\n\n**You:** {response}\n\n**AI:** Thanks. {question}"
+        state["turn"] += 1
+        return state["transcript"], state
+
+    with gr.Blocks() as demo:
+        state = gr.State()
+        resume = gr.File(label="Resume")
+        job_desc = gr.Textbox(label="Job description")
+        response = gr.Textbox(label="Response")
+        conversation = gr.Markdown()
+
+        gr.Button("Start").click(
+            start_interview, [resume, job_desc, state], [conversation, state],
+            api_name="gradio_start_interview"
+        )
+        gr.Button("Respond").click(
+            handle_response, [response, state], [conversation, state],
+            api_name="gradio_handle_response"
+        )
+    return demo
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=7860)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    build_demo(args.latency_ms, args.jitter_ms, args.failure_rate).queue(
+        default_concurrency_limit=None
+    ).launch(server_name="127.0.0.1", server_port=args.port)
@@ -0,0 +1,26 @@
+"""
+Recognition of uploads that need no ffmpeg decode
+Run from backend/ai_service: python -m pytest tests
+"""
+
+import os
+import struct
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import audio_codec  # noqa: E402
+
+
+def wav(pcm, sample_rate=16000, channels=1, bits=16):
+    fmt = struct.pack("<HHIIHH", 1, channels, sample_rate, sample_rate * channels * bits // 8, channels * bits // 8, bits)
+    body = b"WAVE" + b"fmt " + struct.pack("<I", len(fmt)) + fmt + b"data" + struct.pack("<I", len(pcm)) + pcm
+    return b"RIFF" + struct.pack("<I", len(body)) + body
+
+
+def test_parse_wav_returns_pcm():
+    assert audio_codec.parse_wav(wav(b"\x01\x00" * 8)) == (b"\x01\x00" * 8, 16000, 1, 2)
+
+
+def test_parse_wav_rejects_truncated_fmt_chunk():
+    assert audio_codec.parse_wav(wav(b"\x00\x00" * 8)[:30]) is None
@@ -0,0 +1,70 @@
+"""
+Scoring of stored interview sessions
+Run from backend/ai_service: python -m pytest tests
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scoring  # noqa: E402
+from session_store import InMemorySessionStore, make_turn  # noqa: E402
+
+
+def stored_session(answers):
+    store = InMemorySessionStore()
+    store.create("interview-1", turns=[make_turn("ai", "Tell me about yourself.")], meta={})
+    for answer in answers:
+        store.append_turns("interview-1", [make_turn("candidate", answer), make_turn("ai", "Thanks. Next question?")])
+    return store.get("interview-1")
+
+
+def test_session_answers_selects_candidate_turns():
+    session = stored_session(["I build APIs.", "I led a migration."])
+    assert scoring.session_answers(session["turns"]) == [
+        {"answer": "I build APIs."},
+        {"answer": "I led a migration."},
+    ]
+
+
+def test_stored_session_with_real_answers_scores_above_base():
+    detailed = (
+        "I designed the caching layer for our Python microservices on AWS, "
+        "moved hot queries to PostgreSQL read replicas and cut p95 latency in half."
+    )
+    session = stored_session([detailed])
+    result = scoring.score_interview(
+        scoring.session_answers(session["turns"]),
+        default_keywords=("python", "caching", "postgresql"),
+    )
+    assert result["score"] > scoring.Rubric().base
+    assert "Detailed answers provided" in result["strengths"]
+
+
+def test_session_without_answers_keeps_base_score():
+    session = stored_session([])
+    result = scoring.score_interview(scoring.session_answers(session["turns"]))
+    assert result["score"] == scoring.Rubric().base
+
+
+def test_batch_validation_names_malformed_fields():
+    for interviews, field in [
+        (["not an interview"], "interviews[0]"),
+        ([{"answers": "text"}], "interviews[0].answers"),
+        ([{"answers": [42]}], "interviews[0].answers[0]"),
+        ([{"answers": [{"answer": "ok", "duration": "90"}]}], "interviews[0].answers[0].duration"),
+    ]:
+        try:
+            scoring.validate_batch(interviews)
+        except ValueError as e:
+            assert str(e).startswith(field)
+        else:
+            raise AssertionError(f"accepted {interviews!r}")
+
+
+def test_batch_validation_accepts_well_formed_batch():
+    interviews = [{"id": 1, "answers": [{"answer": "I use Python.", "duration": 75, "question_index": 0}, None]}]
+    questions = [{"id": "q1", "expected_keywords": ["python"]}]
+    scoring.validate_batch(interviews, questions)
+    assert scoring.score_interviews(interviews, questions)[0]["answers"][0]["matched_keywords"]
@@ -0,0 +1,44 @@
+"""
+Voice activity detection on synthetic clips
+Run from backend/ai_service: python -m pytest tests
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import vad  # noqa: E402
+
+RATE = 16000
+
+
+def tone(seconds, dbfs, frequency=220):
+    t = np.arange(int(seconds * RATE)) / RATE
+    amplitude = 32767 * 10 ** (dbfs / 20) * np.sqrt(2)
+    return (amplitude * np.sin(2 * np.pi * frequency * t)).astype("<i2")
+
+
+def setup_module():
+    assert vad.available()
+
+
+def test_clip_without_silence_has_speech():
+    result = vad.trim_silence(tone(3, -20).tobytes(), RATE)
+    assert result.has_speech
+    assert result.speech_seconds > 2.5
+
+
+def test_silence_has_no_speech():
+    assert not vad.trim_silence(np.zeros(3 * RATE, dtype="<i2").tobytes(), RATE).has_speech
+
+
+def test_quiet_noise_is_trimmed_around_speech():
+    rng = np.random.default_rng(0)
+    noise = (rng.standard_normal(RATE) * 32767 * 10 ** (-60 / 20)).astype("<i2")
+    clip = np.concatenate([noise, tone(1, -20), noise])
+    result = vad.trim_silence(clip.tobytes(), RATE)
+    assert result.has_speech
+    assert result.speech_seconds < 2
@@ -0,0 +1,30 @@
+"""
+Cheap features of free text such as resumes and job descriptions
+Word counts and the most frequent non-stopword terms, computed without any
+language model so they can be derived on every upload.
+"""
+
+import re
+from collections import Counter
+
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have i in is it its of on or our that the
+their this to was were will with you your we my me he she they them his her
+""".split())
+
+WORD_PATTERN = re.compile(r"[a-zA-Z][a-zA-Z+#.\-]{1,}")
+
+
+def derive_features(text):
+    """
+    Computes cheap features from text
+
+    Returns:
+        dict: word_count and the most frequent non-stopword terms
+    """
+    words = [w.lower().strip(".-") for w in WORD_PATTERN.findall(text)]
+    terms = Counter(w for w in words if w and w not in STOPWORDS)
+    return {
+        "word_count": len(words),
+        "top_terms": [term for term, _ in terms.most_common(20)],
+    }
@@ -0,0 +1,183 @@
+"""
+Content-addressed cache for synthesized speech
+Repeated phrases (fallback questions, acknowledgements, common questions)
+are synthesized once and served from disk afterwards
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+SHARD_CHARS = 2
+
+
+def make_cache_key(text, lang, slow=False, tld="com", engine="gtts", audio_format="mp3"):
+    """
+    Builds the cache key for a piece of speech
+
+    Args:
+        text (str): Cleaned text that will be spoken
+        lang (str): gTTS language code
+        slow (bool): gTTS slow mode
+        tld (str): gTTS top-level domain (accent)
+        engine (str): TTS backend that produced the audio
+        audio_format (str): Output format; mp3 leaves the voice part as just the
+                            engine, so mp3 keys are the same as without a format
+
+    Returns:
+        str: Hex digest identifying the audio
+    """
+    voice = engine if audio_format == "mp3" else f"{engine}/{audio_format}"
+    payload = f"{voice}|{lang}|{int(bool(slow))}|{tld}|{text}".encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+class TTSCache:
+    """
+    LRU cache of speech files keyed by content hash
+
+    The directory itself is the source of truth: on startup the index is
+    rebuilt from the files on disk, ordered by modification time, and every
+    hit touches the file so recency survives restarts. Files are spread over
+    subdirectories named after the first characters of their key.
+    """
+
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024, max_entries=5000, extension=".mp3"):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.extension = extension
+        self._entries = OrderedDict()  # key -> size in bytes, oldest first
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+        self._load()
+
+    def _name(self, key):
+        return f"{key[:SHARD_CHARS]}/{key}{self.extension}"
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:SHARD_CHARS], key + self.extension)
+
+    def _load(self):
+        """Rebuild the LRU index from files already on disk"""
+        found = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                self._load_file(os.path.join(root, name), found)
+
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._total_bytes += size
+
+        with self._lock:
+            self._evict_locked()
+        logger.info(f"TTS cache loaded: {len(self._entries)} files, {self._total_bytes} bytes")
+
+    def _load_file(self, path, found):
+        """Collects one file for _load, moving files from the flat layout into shards"""
+        name = os.path.basename(path)
+        if name.endswith(".tmp"):
+            # Leftover from an interrupted write
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return
+        if not name.endswith(self.extension):
+            return
+        key = name[:-len(self.extension)]
+        try:
+            if path != self._path(key):
+                os.makedirs(os.path.dirname(self._path(key)), exist_ok=True)
+                os.replace(path, self._path(key))
+            stat = os.stat(self._path(key))
+        except OSError:
+            return
+        found.append((stat.st_mtime, key, stat.st_size))
+
+    def get(self, key):
+        """
+        Looks up a cached audio file
+
+        Args:
+            key (str): Cache key from make_cache_key
+
+        Returns:
+            str: Filename relative to the cache directory, or None on a miss
+        """
+        with self._lock:
+            path = self._path(key)
+            if key not in self._entries:
+                if not os.path.exists(path):
+                    return None
+                # Written by another worker process sharing the directory
+                self._entries[key] = os.path.getsize(path)
+                self._total_bytes += self._entries[key]
+            if not os.path.exists(path):
+                # Removed behind our back
+                self._total_bytes -= self._entries.pop(key)
+                return None
+            self._entries.move_to_end(key)
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return self._name(key)
+
+    def temp_path(self, key):
+        """Returns a unique scratch path in the cache directory for writing a new entry"""
+        os.makedirs(os.path.dirname(self._path(key)), exist_ok=True)
+        return f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+    def put(self, key, temp_path):
+        """
+        Moves a freshly written file into the cache
+
+        Args:
+            key (str): Cache key from make_cache_key
+            temp_path (str): File produced via temp_path(key)
+
+        Returns:
+            str: Filename relative to the cache directory
+        """
+        path = self._path(key)
+        os.replace(temp_path, path)
+        size = os.path.getsize(path)
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= self._entries.pop(key)
+            self._entries[key] = size
+            self._total_bytes += size
+            self._evict_locked(keep=key)
+        return self._name(key)
+
+    def _evict_locked(self, keep=None):
+        """Drop least recently used files until within budget. Caller holds the lock."""
+        while self._entries and (
+            self._total_bytes > self.max_bytes or len(self._entries) > self.max_entries
+        ):
+            key, size = next(iter(self._entries.items()))
+            if key == keep:
+                break
+            del self._entries[key]
+            self._total_bytes -= size
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+            logger.info(f"TTS cache evicted: {key[:12]}")
+
+    def stats(self):
+        """Returns current cache usage"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "max_entries": self.max_entries,
+            }
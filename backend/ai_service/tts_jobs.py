@@ -0,0 +1,164 @@
+"""
+Background speech synthesis jobs
+Endpoints hand text to a bounded queue served by a fixed pool of worker
+threads and return immediately; clients poll or subscribe for the audio URL
+"""
+
+import logging
+import queue
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class QueueFull(Exception):
+    """Raised when the synthesis backlog is at capacity"""
+
+
+class AudioJob:
+    """State of one synthesis job"""
+
+    def __init__(self, text, filename_prefix, options):
+        self.job_id = uuid.uuid4().hex
+        self.text = text
+        self.filename_prefix = filename_prefix
+        self.options = options
+        self.status = QUEUED
+        self.audio_url = None
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self.done = threading.Event()
+
+    def to_dict(self):
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "audio_url": self.audio_url,
+            "error": self.error,
+        }
+
+
+class AudioJobQueue:
+    """
+    Worker pool synthesizing speech in the background
+
+    Args:
+        synthesize (callable): (text, filename_prefix, **options) -> audio URL or None
+        workers (int): Number of synthesis threads
+        max_backlog (int): Jobs allowed to wait before submit() rejects
+        result_ttl (float): Seconds a finished job stays retrievable
+        on_depth_change (callable): Optional callback receiving the backlog size
+        start (bool): Start the workers now rather than with start()
+    """
+
+    def __init__(self, synthesize, workers=4, max_backlog=256, result_ttl=600, on_depth_change=None,
+                 start=True):
+        self.synthesize = synthesize
+        self.result_ttl = result_ttl
+        self.on_depth_change = on_depth_change
+        self._queue = queue.Queue(maxsize=max_backlog)
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._workers = [None] * workers
+        if start:
+            self.start()
+
+    def start(self):
+        """Starts worker threads, replacing any that are not running (e.g. after a fork)"""
+        for i, worker in enumerate(self._workers):
+            if worker is None or not worker.is_alive():
+                worker = threading.Thread(target=self._run, name=f"tts-worker-{i}", daemon=True)
+                worker.start()
+                self._workers[i] = worker
+
+    def _report_depth(self):
+        if self.on_depth_change is not None:
+            self.on_depth_change(self._queue.qsize())
+
+    def _purge_locked(self, now):
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at is not None and now - job.finished_at > self.result_ttl
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def submit(self, text, filename_prefix, **options):
+        """
+        Queues text for synthesis
+        
+        Extra keyword options are passed through to the synthesize callable.
+
+        Returns:
+            str: Job ID
+
+        Raises:
+            QueueFull: If the backlog is at capacity
+        """
+        job = AudioJob(text, filename_prefix, options)
+        with self._lock:
+            self._purge_locked(time.time())
+            self._jobs[job.job_id] = job
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            with self._lock:
+                del self._jobs[job.job_id]
+            raise QueueFull(f"TTS backlog full ({self._queue.maxsize} jobs)")
+        self._report_depth()
+        return job.job_id
+
+    def get(self, job_id, wait=0):
+        """
+        Returns a job's state, optionally waiting for it to finish
+
+        Args:
+            job_id (str): ID from submit()
+            wait (float): Seconds to wait for completion (long polling)
+
+        Returns:
+            dict: Job state, or None if the job is unknown or expired
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        if wait > 0:
+            job.done.wait(wait)
+        return job.to_dict()
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            self._report_depth()
+            job.status = RUNNING
+            try:
+                job.audio_url = self.synthesize(job.text, job.filename_prefix, **job.options)
+                job.status = DONE if job.audio_url else FAILED
+                if not job.audio_url:
+                    job.error = "Speech synthesis failed"
+            except Exception as e:
+                logger.error(f"TTS job {job.job_id} failed: {e}")
+                job.status = FAILED
+                job.error = str(e)
+            job.finished_at = time.time()
+            job.done.set()
+            self._queue.task_done()
+
+    def stats(self):
+        with self._lock:
+            tracked = len(self._jobs)
+        return {
+            "workers": len(self._workers),
+            "backlog": self._queue.qsize(),
+            "max_backlog": self._queue.maxsize,
+            "tracked_jobs": tracked,
+        }
@@ -0,0 +1,446 @@
+"""
+Batched persistence of interview turns
+Turns and final results are appended to a local write-ahead file and
+buffered in memory; a background thread writes them to the database in
+multi-row inserts once enough have gathered or the flush interval passes.
+Whatever was acknowledged but not yet written is replayed from the
+write-ahead files on the next start.
+
+Sinks are selected with a URL:
+    sqlite:///path/to/file.db       - Local SQLite file
+    postgresql://user:pw@host/db    - PostgreSQL (psycopg2), e.g. Supabase
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def turn_record(interview_id, seq, turn):
+    """
+    Builds a record for one turn
+
+    Args:
+        interview_id (str): Interview session ID
+        seq (int): Position of the turn in the interview
+        turn (dict): Turn from session_store.make_turn
+    """
+    return {
+        "type": "turn",
+        "interview_id": interview_id,
+        "seq": seq,
+        "role": turn["role"],
+        "text": turn["text"],
+        "ts": turn["ts"],
+    }
+
+
+def result_record(interview_id, data, score):
+    """
+    Builds a record for a finished interview
+
+    Args:
+        interview_id (str): Interview session ID
+        data (dict): interview_data sent by the client
+        score (dict): Result of scoring.score_interview
+    """
+    return {
+        "type": "result",
+        "interview_id": interview_id,
+        "data": data,
+        "score": score,
+        "ts": time.time(),
+    }
+
+
+# ==============================================================================
+# SINKS
+# ==============================================================================
+class TurnSink:
+    """
+    Interface shared by database sinks
+
+    write() must be idempotent: after a crash, records already written may
+    be replayed from the write-ahead file.
+    """
+
+    def write(self, records):
+        raise NotImplementedError
+
+
+class SQLiteTurnSink(TurnSink):
+    """SQLite sink; one transaction per batch"""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        conn = self._conn()
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS interview_turns (
+                interview_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                role TEXT NOT NULL,
+                text TEXT NOT NULL,
+                ts REAL NOT NULL,
+                PRIMARY KEY (interview_id, seq)
+            );
+            CREATE TABLE IF NOT EXISTS interview_results (
+                interview_id TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                score TEXT NOT NULL,
+                ended_at REAL NOT NULL
+            );
+        """)
+        conn.commit()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def write(self, records):
+        turns = [r for r in records if r["type"] == "turn"]
+        results = [r for r in records if r["type"] == "result"]
+        conn = self._conn()
+        with conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO interview_turns (interview_id, seq, role, text, ts) VALUES (?, ?, ?, ?, ?)",
+                [(r["interview_id"], r["seq"], r["role"], r["text"], r["ts"]) for r in turns]
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO interview_results (interview_id, data, score, ended_at) VALUES (?, ?, ?, ?)",
+                [(r["interview_id"], json.dumps(r["data"]), json.dumps(r["score"]), r["ts"]) for r in results]
+            )
+
+
+class PostgresTurnSink(TurnSink):
+    """PostgreSQL sink; each batch is one multi-row INSERT per table"""
+
+    def __init__(self, dsn):
+        import psycopg2
+        import psycopg2.extras
+        self._psycopg2 = psycopg2
+        self._execute_values = psycopg2.extras.execute_values
+        self._json = psycopg2.extras.Json
+        self.dsn = dsn
+        self._conn = None
+        self._pid = None
+        conn = self._connect()
+        with conn, conn.cursor() as cur:
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS interview_turns (
+                    interview_id TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    role VARCHAR(20) NOT NULL,
+                    text TEXT NOT NULL,
+                    spoken_at TIMESTAMPTZ NOT NULL,
+                    PRIMARY KEY (interview_id, seq)
+                );
+                CREATE TABLE IF NOT EXISTS interview_results (
+                    interview_id TEXT PRIMARY KEY,
+                    data JSONB NOT NULL,
+                    score JSONB NOT NULL,
+                    ended_at TIMESTAMPTZ NOT NULL
+                );
+            """)
+
+    def _connect(self):
+        # Only the flusher thread writes, but connections must not cross a fork
+        if self._conn is None or self._conn.closed or self._pid != os.getpid():
+            self._conn = self._psycopg2.connect(self.dsn)
+            self._pid = os.getpid()
+        return self._conn
+
+    def write(self, records):
+        turns = [r for r in records if r["type"] == "turn"]
+        results = [r for r in records if r["type"] == "result"]
+        conn = self._connect()
+        try:
+            with conn, conn.cursor() as cur:
+                if turns:
+                    self._execute_values(
+                        cur,
+                        "INSERT INTO interview_turns (interview_id, seq, role, text, spoken_at) VALUES %s "
+                        "ON CONFLICT DO NOTHING",
+                        [(r["interview_id"], r["seq"], r["role"], r["text"], r["ts"]) for r in turns],
+                        template="(%s, %s, %s, %s, to_timestamp(%s))",
+                    )
+                if results:
+                    self._execute_values(
+                        cur,
+                        "INSERT INTO interview_results (interview_id, data, score, ended_at) VALUES %s "
+                        "ON CONFLICT (interview_id) DO UPDATE SET data = EXCLUDED.data, "
+                        "score = EXCLUDED.score, ended_at = EXCLUDED.ended_at",
+                        [(r["interview_id"], self._json(r["data"]), self._json(r["score"]), r["ts"])
+                         for r in results],
+                        template="(%s, %s, %s, to_timestamp(%s))",
+                    )
+        except (self._psycopg2.InterfaceError, self._psycopg2.OperationalError):
+            self._conn = None
+            raise
+
+
+def create_turn_sink(url):
+    """
+    Builds a sink from a URL
+
+    Args:
+        url (str): sqlite:///path or postgresql://...
+
+    Returns:
+        TurnSink: Configured sink
+    """
+    if url.startswith("sqlite:///"):
+        return SQLiteTurnSink(url[len("sqlite:///"):])
+    if url.startswith(("postgres://", "postgresql://")):
+        return PostgresTurnSink(url)
+    raise ValueError(f"Unsupported turn store URL: {url}")
+
+
+# ==============================================================================
+# BATCHING WRITER
+# ==============================================================================
+class BatchingTurnWriter:
+    """
+    Buffers records and writes them to a sink in batches
+
+    A record is appended to the write-ahead file before submit() returns.
+    At each flush the current file is set aside and a new one started; a set
+    aside file is deleted once every record in it has reached the sink.
+
+    Each process writes its own files (turns-<pid>.wal), so prefork workers
+    can share a directory. On start, files of processes that are no longer
+    running are claimed and replayed.
+
+    Args:
+        sink (TurnSink): Database to write to
+        wal_dir (str): Directory for write-ahead files
+        max_batch (int): Records that trigger an immediate flush, and the
+                         largest batch written at once
+        flush_interval (float): Longest a record waits in the buffer
+        fsync (bool): fsync the write-ahead file on every submit
+        retry_interval (float): Wait after a failed write
+    """
+
+    def __init__(self, sink, wal_dir, max_batch=500, flush_interval=2.0, fsync=False, retry_interval=5.0):
+        self.sink = sink
+        self.wal_dir = wal_dir
+        self.pid = os.getpid()
+        self.wal_path = os.path.join(wal_dir, f"turns-{self.pid}.wal")
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.retry_interval = retry_interval
+        self._buffer = []
+        self._pending_files = []  # set-aside WAL files whose records are in _buffer or in flight
+        self._wal = None
+        self._segment = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self.flushed = 0
+        self.batches = 0
+        self.failures = 0
+        os.makedirs(wal_dir, exist_ok=True)
+        self._recover()
+
+    # --------------------------------------------------------------------------
+    # Write-ahead file
+    # --------------------------------------------------------------------------
+    def _read_wal(self, path):
+        records = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    # A torn final line from a crash mid-write; it was never acknowledged
+                    logger.warning(f"⚠️ Skipping unreadable line in {path}")
+        return records
+
+    @staticmethod
+    def _is_running(pid):
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+    def _aside_path(self):
+        self._segment += 1
+        return os.path.join(self.wal_dir, f"turns-{self.pid}.{self._segment}.wal")
+
+    def _recover(self):
+        """Claims and queues records left in write-ahead files by dead processes"""
+        found = []
+        for name in os.listdir(self.wal_dir):
+            parts = name.split(".")
+            if not (name.startswith("turns-") and name.endswith(".wal")):
+                continue
+            try:
+                pid = int(parts[0][len("turns-"):])
+                segment = int(parts[1]) if len(parts) == 3 else float("inf")
+            except ValueError:
+                continue
+            if pid != self.pid and self._is_running(pid):
+                continue
+            found.append((pid, segment, name))
+
+        for pid, segment, name in sorted(found):
+            aside = self._aside_path()
+            try:
+                # Atomic claim: if another worker moved it first, skip it
+                os.replace(os.path.join(self.wal_dir, name), aside)
+                records = self._read_wal(aside)
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                logger.error(f"❌ Could not read write-ahead file {name}: {e}")
+                continue
+            self._buffer.extend(records)
+            self._pending_files.append(aside)
+        if self._buffer:
+            logger.info(f"Replaying {len(self._buffer)} interview records from {len(self._pending_files)} write-ahead files")
+
+    def _open_wal_locked(self):
+        if self._wal is None:
+            self._wal = open(self.wal_path, "a", encoding="utf-8")
+        return self._wal
+
+    def _rotate_wal_locked(self):
+        """Sets the current write-ahead file aside; returns its new path or None"""
+        if self._wal is None:
+            return None
+        self._wal.close()
+        self._wal = None
+        aside = self._aside_path()
+        os.replace(self.wal_path, aside)
+        return aside
+
+    # --------------------------------------------------------------------------
+    # Public API
+    # --------------------------------------------------------------------------
+    def submit(self, records):
+        """
+        Queues records for writing
+
+        Args:
+            records (list): Dicts from turn_record() or result_record()
+        """
+        if not records:
+            return
+        lines = "".join(json.dumps(r, separators=(",", ":")) + "\n" for r in records)
+        with self._lock:
+            wal = self._open_wal_locked()
+            wal.write(lines)
+            wal.flush()
+            if self.fsync:
+                os.fsync(wal.fileno())
+            self._buffer.extend(records)
+            full = len(self._buffer) >= self.max_batch
+        if full:
+            self._wake.set()
+
+    def flush(self):
+        """
+        Writes everything buffered so far
+
+        Returns:
+            int: Number of records written
+
+        Raises:
+            Exception: Whatever the sink raised; the records stay queued
+        """
+        with self._flush_lock:
+            with self._lock:
+                aside = self._rotate_wal_locked()
+                if aside:
+                    self._pending_files.append(aside)
+                records, self._buffer = self._buffer, []
+                files = list(self._pending_files)
+            if not records:
+                self._delete(files)
+                return 0
+
+            written = 0
+            try:
+                for start in range(0, len(records), self.max_batch):
+                    batch = records[start:start + self.max_batch]
+                    self.sink.write(batch)
+                    written += len(batch)
+                    self.batches += 1
+            except Exception:
+                self.failures += 1
+                self.flushed += written
+                with self._lock:
+                    # Keep order: unwritten records go back in front of newer ones
+                    self._buffer[:0] = records[written:]
+                raise
+
+            self.flushed += len(records)
+            self._delete(files)
+            return len(records)
+
+    def _delete(self, files):
+        with self._lock:
+            for path in files:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                if path in self._pending_files:
+                    self._pending_files.remove(path)
+
+    def start(self):
+        """Flushes on a daemon thread every flush_interval or when a batch fills up"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        def run():
+            while not self._stop.is_set():
+                self._wake.wait(self.flush_interval)
+                self._wake.clear()
+                try:
+                    count = self.flush()
+                    if count:
+                        logger.debug(f"Persisted {count} interview records")
+                except Exception as e:
+                    logger.error(f"❌ Interview turn write failed, will retry: {e}")
+                    self._stop.wait(self.retry_interval)
+
+        self._thread = threading.Thread(target=run, name="turn-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=10):
+        """Stops the flusher and writes what is left; unwritten records stay in the write-ahead file"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"❌ Final interview turn flush failed, kept in write-ahead file: {e}")
+
+    def stats(self):
+        with self._lock:
+            return {
+                "buffered": len(self._buffer),
+                "flushed": self.flushed,
+                "batches": self.batches,
+                "failures": self.failures,
+                "wal_files": len(self._pending_files) + (1 if self._wal is not None else 0),
+            }
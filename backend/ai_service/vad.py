@@ -0,0 +1,156 @@
+"""
+Energy-based voice activity detection for recorded answers
+Leading and trailing silence is cut and long pauses are shortened before
+the audio reaches the speech-to-text backend, so recognizers receive less
+audio and clips without speech can be rejected without calling them.
+"""
+
+import logging
+
+# Imported by available(), so loading this module stays cheap
+np = None
+
+logger = logging.getLogger(__name__)
+
+
+class VADResult:
+    """
+    Outcome of trimming one clip
+
+    Attributes:
+        pcm (bytes): Trimmed 16-bit mono PCM, empty if no speech was found
+        input_seconds (float): Duration before trimming
+        speech_seconds (float): Duration after trimming
+    """
+
+    def __init__(self, pcm, input_seconds, speech_seconds):
+        self.pcm = pcm
+        self.input_seconds = input_seconds
+        self.speech_seconds = speech_seconds
+
+    @property
+    def has_speech(self):
+        return bool(self.pcm)
+
+
+def available():
+    """True if NumPy is installed and trimming can run; call before the functions below"""
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:  # Without NumPy audio is passed through untrimmed
+            return False
+        np = numpy
+    return True
+
+
+def _speech_frames(samples, sample_rate, frame_ms, threshold_db, noise_margin_db, noise_ceiling_db):
+    """
+    Classifies fixed-size frames as speech or silence
+
+    The noise floor is the 10th percentile of frame levels, capped at
+    noise_ceiling_db: a clip with no silence in it (speech from start to
+    end) would otherwise measure its own speech as noise.
+
+    Returns:
+        tuple: (bool array per frame, samples per frame)
+    """
+    frame_len = max(1, sample_rate * frame_ms // 1000)
+    frame_count = len(samples) // frame_len
+    if frame_count == 0:
+        return np.zeros(0, dtype=bool), frame_len
+
+    frames = samples[:frame_count * frame_len].reshape(frame_count, frame_len).astype(np.float32) / 32768.0
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    level_db = 20.0 * np.log10(np.maximum(rms, 1e-10))
+
+    noise_floor_db = min(np.percentile(level_db, 10), noise_ceiling_db)
+    return level_db > max(threshold_db, noise_floor_db + noise_margin_db), frame_len
+
+
+def find_pause(pcm, sample_rate, min_pause_ms=500, frame_ms=30, threshold_db=-45.0, noise_margin_db=10.0,
+               noise_ceiling_db=-40.0):
+    """
+    Finds a point where speech can be split without cutting a word
+
+    Args:
+        pcm (bytes): Signed 16-bit little-endian mono samples
+        sample_rate (int): Samples per second
+        min_pause_ms (int): Shortest silence that counts as a pause
+
+    Returns:
+        int: Byte offset in the middle of the last pause that follows
+             speech, or None if there is no such pause
+    """
+    samples = np.frombuffer(pcm, dtype="<i2")
+    speech, frame_len = _speech_frames(samples, sample_rate, frame_ms, threshold_db, noise_margin_db, noise_ceiling_db)
+    if not speech.any():
+        return None
+
+    # Boundaries of silent runs: +1 where silence starts, -1 where it ends
+    edges = np.diff(np.concatenate(([0], (~speech).astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    first_speech = np.argmax(speech)
+    long_enough = ((ends - starts) * frame_ms >= min_pause_ms) & (starts > first_speech)
+    if not long_enough.any():
+        return None
+
+    index = np.flatnonzero(long_enough)[-1]
+    middle = (starts[index] + ends[index]) // 2
+    return int(middle * frame_len * 2)
+
+
+def trim_silence(pcm, sample_rate, frame_ms=30, threshold_db=-45.0, noise_margin_db=10.0,
+                 noise_ceiling_db=-40.0, padding_ms=200, max_pause_ms=600, min_speech_ms=250):
+    """
+    Removes silence from 16-bit mono PCM
+
+    A frame counts as speech when its RMS level is above both an absolute
+    floor (threshold_db, relative to full scale) and the estimated noise
+    floor of the clip (at most noise_ceiling_db) plus noise_margin_db. Speech regions are padded so
+    word onsets are not clipped, and pauses longer than max_pause_ms are
+    shortened to that length.
+
+    Args:
+        pcm (bytes): Signed 16-bit little-endian mono samples
+        sample_rate (int): Samples per second
+        frame_ms (int): Analysis frame length
+        threshold_db (float): Absolute speech floor in dBFS
+        noise_margin_db (float): Required level above the noise floor
+        noise_ceiling_db (float): Highest noise floor assumed, in dBFS
+        padding_ms (int): Audio kept around each speech region
+        max_pause_ms (int): Longest pause kept inside the clip
+        min_speech_ms (int): Less detected speech than this counts as none
+
+    Returns:
+        VADResult: Trimmed audio and durations
+    """
+    samples = np.frombuffer(pcm, dtype="<i2")
+    input_seconds = len(samples) / sample_rate
+    speech, frame_len = _speech_frames(samples, sample_rate, frame_ms, threshold_db, noise_margin_db, noise_ceiling_db)
+    frame_count = len(speech)
+    if speech.sum() * frame_ms < min_speech_ms:
+        return VADResult(b"", input_seconds, 0.0)
+
+    # Pad speech regions: a frame is kept if any speech frame lies within `pad` frames
+    pad = padding_ms // frame_ms
+    if pad:
+        window = np.ones(2 * pad + 1, dtype=np.int32)
+        keep = np.convolve(speech.astype(np.int32), window, mode="same") > 0
+    else:
+        keep = speech.copy()
+
+    # Shorten long pauses between speech regions
+    first, last = np.flatnonzero(keep)[[0, -1]]
+    keep[:first] = False
+    keep[last + 1:] = False
+    max_pause = max_pause_ms // frame_ms
+    gaps = np.flatnonzero(np.diff(keep[first:last + 1].astype(np.int8))) + first + 1
+    for start, end in zip(gaps[0::2], gaps[1::2]):
+        if end - start > max_pause:
+            keep[start + max_pause:end] = False
+
+    trimmed = samples[:frame_count * frame_len].reshape(frame_count, frame_len)[keep]
+    return VADResult(trimmed.tobytes(), input_seconds, len(trimmed) * frame_len / sample_rate)
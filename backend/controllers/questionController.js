@@ -1,5 +1,16 @@
+const axios = require('axios');
 const { supabase } = require('../config/supabase');
 
+const AI_SERVICE_URL = process.env.AI_SERVICE_URL || 'http://localhost:5001';
+
+// Push question changes to the AI service's keyword index so live feedback
+// sees them before its next poll. Failures only delay the update.
+const notifyKeywordIndex = (change) => {
+  axios
+    .post(`${AI_SERVICE_URL}/api/questions/index`, change, { timeout: 5000 })
+    .catch((error) => console.log('⚠️  Keyword index update failed:', error.message));
+};
+
 // Mock questions for demo purposes
 const MOCK_QUESTIONS = [
   {
@@ -141,7 +152,7 @@ exports.getQuestionById = async (req, res) => {
 // @access  Private (Admin)
 exports.createQuestion = async (req, res) => {
   try {
-    const { title, description, category, difficulty } = req.body;
+    const { title, description, category, difficulty, expected_keywords } = req.body;
 
     if (!title || !category) {
       return res.status(400).json({
@@ -158,6 +169,7 @@ exports.createQuestion = async (req, res) => {
           description,
           category,
           difficulty: difficulty || 'Medium',
+          expected_keywords: expected_keywords || [],
           created_at: new Date().toISOString(),
         })
         .select()
@@ -165,6 +177,8 @@ exports.createQuestion = async (req, res) => {
 
       if (error) throw error;
 
+      notifyKeywordIndex({ upsert: [data] });
+
       res.status(201).json({
         success: true,
         message: 'Question created successfully',
@@ -208,7 +222,8 @@ exports.updateQuestion = async (req, res) => {
     try {
       const { data, error } = await supabase
         .from('questions')
-        .update(req.body)
+        // The AI service's keyword index polls for rows by updated_at
+        .update({ ...req.body, updated_at: new Date().toISOString() })
         .eq('id', id)
         .select()
         .single();
@@ -222,6 +237,8 @@ exports.updateQuestion = async (req, res) => {
         });
       }
 
+      notifyKeywordIndex({ upsert: [data] });
+
       res.status(200).json({
         success: true,
         message: 'Question updated successfully',
@@ -267,6 +284,8 @@ exports.deleteQuestion = async (req, res) => {
         });
       }
 
+      notifyKeywordIndex({ delete: [id] });
+
       res.status(200).json({
         success: true,
         message: 'Question deleted successfully',
@@ -6,6 +6,29 @@ const router = express.Router();
 // AI Service base URL
 const AI_SERVICE_URL = process.env.AI_SERVICE_URL || 'http://localhost:5001';
 
+// The AI service rate limits per tenant; without this header every request
+// would be charged to this server's address. The tenant comes from the
+// authenticated user or the connection, never from a client-supplied
+// X-Tenant-ID, which a caller could change to get a fresh bucket.
+const tenantHeaders = (req) => ({
+  'X-Tenant-ID': req.user && req.user.id ? `user:${req.user.id}` : `ip:${req.ip}`,
+});
+
+// Relay admission control refusals (429/503 with Retry-After) so clients back off
+const sendError = (res, error, message) => {
+  const upstream = error.response;
+  if (upstream && (upstream.status === 429 || upstream.status === 503)) {
+    if (upstream.headers['retry-after']) {
+      res.set('Retry-After', upstream.headers['retry-after']);
+    }
+    return res.status(upstream.status).json({ message, ...upstream.data });
+  }
+  res.status(upstream ? upstream.status : 500).json({
+    error: message,
+    message: error.message,
+  });
+};
+
 /**
  * POST /api/interview/start
  * Start a new interview session
@@ -27,9 +50,14 @@ router.post('/start', async (req, res) => {
       formData.append('job_description', req.body.job_description);
     }
 
+    if (req.body.interview_id) {
+      formData.append('interview_id', req.body.interview_id);
+    }
+
     const response = await axios.post(`${AI_SERVICE_URL}/api/start-interview`, formData, {
       headers: {
         ...formData.getHeaders(),
+        ...tenantHeaders(req),
       },
       timeout: 30000,
     });
@@ -37,17 +65,14 @@ router.post('/start', async (req, res) => {
     res.json(response.data);
   } catch (error) {
     console.error('Interview start error:', error.message);
-    res.status(500).json({
-      error: 'Failed to start interview',
-      message: error.message,
-    });
+    sendError(res, error, 'Failed to start interview');
   }
 });
 
 /**
  * POST /api/interview/process-response
  * Process user response
- * Body: { audio: File, conversation_history: string }
+ * Body: { audio: File, interview_id: string } (or legacy conversation_history)
  */
 router.post('/process-response', async (req, res) => {
   try {
@@ -64,9 +89,18 @@ router.post('/process-response', async (req, res) => {
       formData.append('conversation_history', req.body.conversation_history);
     }
 
+    if (req.body.interview_id) {
+      formData.append('interview_id', req.body.interview_id);
+    }
+
+    if (req.body.question_id) {
+      formData.append('question_id', req.body.question_id);
+    }
+
     const response = await axios.post(`${AI_SERVICE_URL}/api/process-response`, formData, {
       headers: {
         ...formData.getHeaders(),
+        ...tenantHeaders(req),
       },
       timeout: 30000,
     });
@@ -74,13 +108,114 @@ router.post('/process-response', async (req, res) => {
     res.json(response.data);
   } catch (error) {
     console.error('Process response error:', error.message);
-    res.status(500).json({
-      error: 'Failed to process response',
+    sendError(res, error, 'Failed to process response');
+  }
+});
+
+/**
+ * POST /api/interview/answer-stream
+ * Open a streamed answer upload
+ * Body: { interview_id: string, question_id?: string }
+ */
+router.post('/answer-stream', async (req, res) => {
+  try {
+    const response = await axios.post(`${AI_SERVICE_URL}/api/answer-stream`, {
+      interview_id: req.body.interview_id,
+      question_id: req.body.question_id,
+    }, {
+      headers: tenantHeaders(req),
+      timeout: 10000,
+    });
+
+    res.json(response.data);
+  } catch (error) {
+    console.error('Answer stream start error:', error.message);
+    sendError(res, error, 'Failed to start answer upload');
+  }
+});
+
+/**
+ * POST /api/interview/answer-stream/:uploadId/chunk
+ * Forward one recorder chunk
+ * Body: { chunk: File, seq: number }
+ */
+router.post('/answer-stream/:uploadId/chunk', async (req, res) => {
+  try {
+    const formData = new FormData();
+
+    if (req.files && req.files.chunk) {
+      formData.append('chunk', req.files.chunk.data, {
+        filename: req.files.chunk.name,
+        contentType: req.files.chunk.mimetype,
+      });
+    }
+
+    if (req.body.seq !== undefined) {
+      formData.append('seq', req.body.seq);
+    }
+
+    const response = await axios.post(
+      `${AI_SERVICE_URL}/api/answer-stream/${encodeURIComponent(req.params.uploadId)}/chunk`,
+      formData,
+      {
+        headers: {
+          ...formData.getHeaders(),
+        },
+        timeout: 10000,
+      }
+    );
+
+    res.json(response.data);
+  } catch (error) {
+    console.error('Answer chunk error:', error.message);
+    res.status(error.response ? error.response.status : 500).json({
+      error: 'Failed to upload answer chunk',
       message: error.message,
     });
   }
 });
 
+/**
+ * POST /api/interview/answer-stream/:uploadId/finish
+ * Complete a streamed answer and get the next question
+ */
+router.post('/answer-stream/:uploadId/finish', async (req, res) => {
+  try {
+    const response = await axios.post(
+      `${AI_SERVICE_URL}/api/answer-stream/${encodeURIComponent(req.params.uploadId)}/finish`,
+      req.body,
+      {
+        timeout: 30000,
+      }
+    );
+
+    res.json(response.data);
+  } catch (error) {
+    console.error('Answer finish error:', error.message);
+    sendError(res, error, 'Failed to process response');
+  }
+});
+
+/**
+ * DELETE /api/interview/answer-stream/:uploadId
+ * Abort a streamed answer the client gave up on
+ */
+router.delete('/answer-stream/:uploadId', async (req, res) => {
+  try {
+    const response = await axios.delete(
+      `${AI_SERVICE_URL}/api/answer-stream/${encodeURIComponent(req.params.uploadId)}`,
+      {
+        timeout: 10000,
+      }
+    );
+
+    res.json(response.data);
+  } catch (error) {
+    console.error('Answer abort error:', error.message);
+    sendError(res, error, 'Failed to abort answer upload');
+  }
+});
+
 /**
  * POST /api/interview/end
  * End interview session
@@ -24,6 +24,8 @@ const InterviewSession = () => {
   const mediaRecorderRef = useRef(null);
   const audioChunksRef = useRef([]);
   const streamRef = useRef(null);
+  const uploadRef = useRef(null);
+  const chunkSeqRef = useRef(0);
   
   // Video
   const videoRef = useRef(null);
@@ -65,7 +67,7 @@ const InterviewSession = () => {
         setConversation(response.data.conversation);
         setFirstQuestion(response.data.first_question);
         setAudioUrl(response.data.audio_url);
-        setInterviewId(Date.now().toString()); // Generate interview ID
+        setInterviewId(response.data.interview_id || Date.now().toString());
         setQuestionCount(1);
         setStage('interview');
         message.success('Interview started! Listen to the question.');
@@ -101,11 +103,24 @@ const InterviewSession = () => {
       mediaRecorderRef.current = mediaRecorder;
       audioChunksRef.current = [];
 
+      // Stream the answer while it is recorded so transcription runs as the candidate speaks
+      uploadRef.current = null;
+      chunkSeqRef.current = 0;
+      try {
+        const upload = await axios.post('http://localhost:5000/api/interview/answer-stream', {
+          interview_id: interviewId
+        });
+        uploadRef.current = { id: upload.data.upload_id, pending: Promise.resolve(), failed: false };
+      } catch (error) {
+        console.log('Streamed upload unavailable, sending the answer when done:', error.message);
+      }
+
       mediaRecorder.ondataavailable = (event) => {
         audioChunksRef.current.push(event.data);
+        sendChunk(event.data);
       };
 
-      mediaRecorder.start();
+      mediaRecorder.start(uploadRef.current ? 1000 : undefined);
       setRecording(true);
       setRecordingTime(0);
       message.info('Recording started. Speak your answer.');
@@ -136,6 +151,18 @@ const InterviewSession = () => {
     });
   };
 
+  const sendChunk = (blob) => {
+    const upload = uploadRef.current;
+    if (!upload || upload.failed || blob.size === 0) return;
+
+    const formData = new FormData();
+    formData.append('chunk', blob, 'chunk.webm');
+    formData.append('seq', chunkSeqRef.current++);
+    upload.pending = upload.pending
+      .then(() => axios.post(`http://localhost:5000/api/interview/answer-stream/${upload.id}/chunk`, formData))
+      .catch(() => { upload.failed = true; });
+  };
+
   const submitResponse = async () => {
     if (!recording && recordingTime === 0) {
       message.warning('Please record your answer first');
@@ -145,15 +172,33 @@ const InterviewSession = () => {
     setLoading(true);
     const audioBlob = await stopRecording();
 
-    const formData = new FormData();
-    formData.append('audio', audioBlob, 'response.webm');
-    formData.append('conversation_history', conversation);
-
     try {
-      const response = await axios.post('http://localhost:5000/api/interview/process-response', formData);
+      const upload = uploadRef.current;
+      uploadRef.current = null;
+      if (upload) {
+        await upload.pending;
+      }
+
+      let response;
+      if (upload && !upload.failed) {
+        response = await axios.post(`http://localhost:5000/api/interview/answer-stream/${upload.id}/finish`);
+      } else {
+        if (upload) {
+          // Free the server's decoder instead of leaving the upload to expire
+          axios.delete(`http://localhost:5000/api/interview/answer-stream/${upload.id}`)
+            .catch((error) => console.log('Could not abort answer upload:', error.message));
+        }
+        // Fall back to uploading the whole recording
+        const formData = new FormData();
+        formData.append('audio', audioBlob, 'response.webm');
+        formData.append('interview_id', interviewId);
+        response = await axios.post('http://localhost:5000/api/interview/process-response', formData);
+      }
 
       if (response.data.success) {
-        setConversation(response.data.conversation);
+        // Server keeps the transcript; only the new turns come back
+        const { transcription, ai_response } = response.data;
+        setConversation(prev => `${prev}\n\n**You:** ${transcription}\n\n**AI:** ${ai_response}`);
         setAudioUrl(response.data.audio_url);
         setQuestionCount(prev => prev + 1);
         setRecordingTime(0);
@@ -163,6 +208,9 @@ const InterviewSession = () => {
         if (response.data.audio_url) {
           playAudio(response.data.audio_url);
         }
+      } else if (response.data.transcription_status === 'no_speech') {
+        setRecordingTime(0);
+        message.warning(response.data.error);
       }
     } catch (error) {
       message.error('Failed to process response: ' + error.message);
@@ -180,6 +228,7 @@ const InterviewSession = () => {
     setLoading(true);
     try {
       await axios.post('http://localhost:5000/api/interview/end', {
+        interview_id: interviewId,
         interview_data: {
           id: interviewId,
           conversation,